@@ -11,7 +11,9 @@ param(
     [switch]$Install,
     [switch]$Help,
     [switch]$AutoExecute,
-    [int]$Timeout = 30
+    [int]$Timeout = 30,
+    # Session log; the dashboard gives each concurrent session its own file
+    [string]$LogFile = ""
     # Removed ChildTimeout parameter since automatic killing is removed
 )
 
@@ -24,7 +26,7 @@ $script:IDLE_TIMEOUT = $Timeout
 # Removed $script:CHILD_TIMEOUT since automatic killing is removed
 $script:AUTO_EXECUTE = $AutoExecute
 $script:TIMESTAMP_FILE = Join-Path $env:TEMP "auto_terminator_$PID.txt"
-$script:LOG_FILE = Join-Path $env:TEMP "auto_terminator.log"
+$script:LOG_FILE = if ($LogFile) { $LogFile } else { Join-Path $env:TEMP "auto_terminator.log" }
 $script:SESSION_ACTIVE = $true
 $script:LAST_COMMAND_TIME = [int][double]::Parse((Get-Date -UFormat %s))
 
@@ -764,6 +766,7 @@ if ($Help) {
     Write-Host "  .\auto-terminator.ps1 -Help              - Show this help"
     Write-Host "  .\auto-terminator.ps1 -Timeout 10        - Set custom timeout (seconds)"
     Write-Host "  .\auto-terminator.ps1 -AutoExecute       - Enable auto-execution of AI commands"
+    Write-Host "  .\auto-terminator.ps1 -LogFile C:\x.log  - Write the session log to another file"
     Write-Host ""
     Write-Host "Features:"
     Write-Host "  - Automatically terminates after specified seconds of inactivity"
@@ -0,0 +1,971 @@
+#!/usr/bin/env python3
+"""
+Auto-Terminator Service
+GUI-free core of the Auto-Terminator: launches and stops terminal sessions,
+wires the inactive process monitor, follows the session logs, samples the
+dashboard metrics and keeps the process library, PID logs, metric history and
+log index. The Tk dashboard is one client of this class; the same service can
+run headless and be driven over a local HTTP/JSON API (see service_api).
+
+Many sessions can run at once. They share one inactive process monitor, one
+metrics sampler, one dashboard sampler thread and one snapshot pump; only the
+log tailer is per session. Each session keeps its own timeouts and groups its
+processes in the library under its terminal PID.
+
+psutil, the dashboard sampler and the monitor with its governor, reclaimer and
+runaway detector are imported when a session first needs them, so creating the
+service (and starting the GUI) does not pay for them.
+
+With monitor_process=True the monitor and the dashboard sampling run in a
+separate process instead (see monitor_process.py); snapshots arrive through a
+shared memory ring and the monitor's callbacks through a pipe.
+"""
+
+import collections
+import logging
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import log_index
+import log_tailer
+import metric_history
+import pid_log_store
+import report_writer
+from process_library import DEFAULT_DB_PATH, ProcessLibrary, ProcessStatus
+
+logger = logging.getLogger(__name__)
+
+# Recent events kept for API clients polling /api/events
+EVENT_BUFFER_SIZE = 1000
+# Most terminal sessions running at once
+MAX_SESSIONS = 64
+# How often the pump reads the monitor process's snapshot ring
+SNAPSHOT_POLL_SECONDS = 0.25
+# Lines read per batch when indexing logs left by an earlier run
+STORED_LOG_INDEX_BATCH_LINES = 4096
+
+# Events passed to listeners as listener(event, data)
+EVENT_SESSION_STARTED = 'session_started'
+EVENT_SESSION_STOPPED = 'session_stopped'
+EVENT_LOG = 'log'  # data: {'pid', 'text'}; delivered to listeners only, not buffered for the API
+EVENT_SNAPSHOT = 'snapshot'  # data: the dashboard snapshot; listeners only
+EVENT_PROCESS_ADDED = 'process_added'
+EVENT_PROCESS_SUSPENDED = 'process_suspended'
+EVENT_PROCESS_RESUMED = 'process_resumed'
+EVENT_PROCESS_TERMINATED = 'process_terminated'
+_UNBUFFERED_EVENTS = (EVENT_LOG, EVENT_SNAPSHOT)
+
+
+def default_log_file_path() -> str:
+    """Session log written by auto-terminator.ps1 ($env:TEMP\\auto_terminator.log)."""
+    return os.path.join(os.environ.get('TEMP') or tempfile.gettempdir(), 'auto_terminator.log')
+
+
+def session_log_file_path(base_path: str, slot: int) -> str:
+    """Log file of the session in a slot: the base path for the first, numbered files next to it for the rest."""
+    if slot == 0:
+        return base_path
+    root, extension = os.path.splitext(base_path)
+    return f"{root}_{slot + 1}{extension}"
+
+
+def build_terminal_command(script_path: str, timeout_seconds: int, auto_execute: bool,
+                           log_file_path: Optional[str] = None) -> List[str]:
+    """Command line launching auto-terminator.ps1 (Windows PowerShell, or PowerShell 7 elsewhere)."""
+    executable = "powershell.exe" if sys.platform == 'win32' else "pwsh"
+    cmd = [
+        executable,
+        "-ExecutionPolicy", "Bypass",
+        "-NoExit",
+        "-File", script_path,
+        "-Timeout", str(timeout_seconds)
+    ]
+    if auto_execute:
+        cmd.append("-AutoExecute")
+    if log_file_path:
+        cmd.extend(["-LogFile", log_file_path])
+    return cmd
+
+
+def _process_is_running(pid: int, start_time: Optional[float]) -> bool:
+    """Whether a library entry's process still runs (and is not a later process reusing its PID)."""
+    import psutil
+
+    try:
+        created = psutil.Process(pid).create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+    # Entries are added once their process exists, so a process created later reuses the PID
+    return start_time is None or created <= start_time + 1
+
+
+class TerminalSession:
+    def __init__(self, process: subprocess.Popen, settings: Dict[str, Any], log_file_path: str, slot: int,
+                 on_log_lines: Callable[[List[str]], None]):
+        """
+        One running terminal and its per-session state.
+
+        Args:
+            process: The terminal process
+            settings: Settings the session was started with (see AutoTerminatorService.start_session)
+            log_file_path: Log file the terminal writes
+            slot: Index of the session's log file (see session_log_file_path)
+            on_log_lines: Receives batches of complete lines from the log file
+        """
+        self.process = process
+        self.pid = process.pid
+        self.settings = settings
+        self.log_file_path = log_file_path
+        self.slot = slot
+        self.start_time = datetime.now()
+        self.latest_snapshot: Optional[Dict[str, Any]] = None
+        self.log_tailer = log_tailer.LogTailer(log_file_path, on_log_lines)
+
+    def is_running(self) -> bool:
+        return self.process.poll() is None
+
+    def describe(self) -> Dict[str, Any]:
+        """Summary of the session for status() and the API."""
+        return {
+            'pid': self.pid,
+            'running': self.is_running(),
+            'started': self.start_time.isoformat(),
+            'settings': dict(self.settings),
+            'log_file': self.log_file_path,
+            'snapshot': self.latest_snapshot,
+        }
+
+
+class AutoTerminatorService:
+    def __init__(self, log_file_path: Optional[str] = None, library_db_path: str = DEFAULT_DB_PATH,
+                 script_path: Optional[str] = None, monitor_process: bool = False):
+        """
+        Create the service. Nothing is launched until start_session().
+
+        Args:
+            log_file_path: Log of the first session; concurrent sessions log to numbered files next to it
+            library_db_path: Process library database
+            script_path: auto-terminator.ps1 (defaults to the one in the working directory)
+            monitor_process: Run the monitor and the dashboard sampling in a separate process
+        """
+        self.log_file_path = log_file_path or default_log_file_path()
+        self.script_path = script_path or os.path.join(os.getcwd(), "auto-terminator.ps1")
+
+        # Process library to track all PIDs, persisted in SQLite; their logs live on disk
+        self.process_library = ProcessLibrary(library_db_path)
+        # Close out entries a previous run left open; another client's live sessions are kept
+        self.process_library.mark_interrupted(_process_is_running)
+        # Each entry's log is kept next to the database, keyed by entry id
+        self.pid_logs = pid_log_store.PidLogStore(
+            os.path.join(os.path.dirname(os.path.abspath(library_db_path)), 'logs'))
+        # Bounded in-memory metric history for charts and reports
+        self.metric_histories = metric_history.MetricHistoryStore()
+        # Inverted index over the entry logs, updated as lines are stored
+        self.log_index = log_index.LogIndex()
+        # Logs from earlier runs are indexed in the background; logs whose entry is gone are removed
+        self._closing = threading.Event()
+        entry_ids = self.process_library.entry_ids()
+        stored_logs = []
+        for entry_id in self.pid_logs.entry_ids():
+            if entry_id in entry_ids:
+                stored_logs.append(entry_id)
+            else:
+                self.pid_logs.delete(entry_id)
+        self._log_index_thread = threading.Thread(target=self._index_stored_logs, args=(stored_logs,),
+                                                  name="stored-log-index", daemon=True)
+        self._log_index_thread.start()
+
+        # Running sessions by terminal PID, oldest first
+        self.sessions: Dict[int, TerminalSession] = {}
+        # Shared by every session that monitors inactive processes
+        self.inactive_process_monitor = None
+
+        # Active/Inactive/Suspended child processes of all sessions, replaced by monitor callbacks
+        self.active_processes: Dict[int, Dict[str, Any]] = {}
+        self.inactive_processes: Dict[int, Dict[str, Any]] = {}
+        self.suspended_processes: Dict[int, Dict[str, Any]] = {}
+
+        # Parent -> children index shared by the sampler, the monitor and the library bookkeeping
+        self.process_tree = None
+        # Measures each process once per tick for both the monitor and the dashboard sampler
+        self.metrics_sampler = None
+        # Samples every session's process tree; created with the first session, drained by the pump thread
+        self.dashboard_sampler = None
+        self._pump_stop = threading.Event()
+        self._pump_thread: Optional[threading.Thread] = None
+        # Replaces the in-process monitor and dashboard sampler when enabled; spawned with the first session
+        self.use_monitor_process = monitor_process
+        self.monitor_process = None
+
+        # Serialises session start/stop and the pump thread's lifetime; events have their own lock
+        # because monitor callbacks emit them while stop_session() waits for the monitor thread
+        self._lock = threading.RLock()
+        self._events_lock = threading.Lock()
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._events = collections.deque(maxlen=EVENT_BUFFER_SIZE)
+        self._event_seq = 0
+
+    # Events
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """
+        Register a listener called as listener(event, data) from service threads.
+
+        Listeners must not block and must not touch UI toolkits directly.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def events_since(self, seq: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Buffered events after a sequence number, for polling clients.
+
+        Returns:
+            (latest sequence number, events as dicts with 'seq', 'time', 'event', 'data')
+        """
+        with self._events_lock:
+            return self._event_seq, [event for event in self._events if event['seq'] > seq]
+
+    def _emit(self, event: str, data: Dict[str, Any]):
+        if event not in _UNBUFFERED_EVENTS:
+            with self._events_lock:
+                self._event_seq += 1
+                self._events.append({'seq': self._event_seq, 'time': time.time(), 'event': event, 'data': data})
+        for listener in list(self._listeners):
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.error(f"Service listener failed on {event}: {e}")
+
+    # Sessions
+
+    @property
+    def current_session(self) -> Optional[TerminalSession]:
+        """The most recently started running session."""
+        sessions = list(self.sessions.values())
+        return sessions[-1] if sessions else None
+
+    @property
+    def session_pid(self) -> Optional[int]:
+        session = self.current_session
+        return session.pid if session else None
+
+    @property
+    def latest_snapshot(self) -> Optional[Dict[str, Any]]:
+        session = self.current_session
+        return session.latest_snapshot if session else None
+
+    def is_running(self, pid: Optional[int] = None) -> bool:
+        """Whether a session's terminal is running (any session's when pid is None)."""
+        if pid is not None:
+            session = self.sessions.get(pid)
+            return session is not None and session.is_running()
+        return any(session.is_running() for session in list(self.sessions.values()))
+
+    def start_session(self, timeout: int = 30, auto_execute: bool = False, monitor_inactive: bool = False,
+                      inactive_timeout: int = 30, suspend_idle: bool = False, reclaim_memory: bool = False,
+                      throttle_runaways: bool = False) -> int:
+        """
+        Launch auto-terminator.ps1 in a new session and start following it.
+
+        Args:
+            timeout: Idle timeout of the terminal session in seconds
+            auto_execute: Auto-execute AI commands
+            monitor_inactive: Monitor the session's children with the shared inactive process monitor
+            inactive_timeout: Inactivity timeout for the session's child processes in seconds
+            suspend_idle: Suspend the session's idle children instead of terminating them
+            reclaim_memory: Reclaim memory from idle children when RAM is low (shared by all sessions)
+            throttle_runaways: Throttle children with sustained CPU or fast memory growth
+                (shared by all sessions)
+
+        Returns:
+            PID of the terminal process
+
+        Raises:
+            ValueError: A timeout is not a positive integer
+            RuntimeError: MAX_SESSIONS sessions are already running
+            OSError: The terminal could not be launched
+            RuntimeError: The monitor process could not take the session (the terminal is stopped)
+        """
+        if int(timeout) <= 0:
+            raise ValueError("Timeout must be a positive integer.")
+        if int(inactive_timeout) <= 0:
+            raise ValueError("Inactive timeout must be a positive integer.")
+        with self._lock:
+            if len(self.sessions) >= MAX_SESSIONS:
+                raise RuntimeError(f"{MAX_SESSIONS} terminal sessions are already running.")
+
+            # Each concurrent session writes its own log; ensure it is clean or created
+            used_slots = {session.slot for session in self.sessions.values()}
+            slot = next(slot for slot in range(MAX_SESSIONS) if slot not in used_slots)
+            log_file_path = session_log_file_path(self.log_file_path, slot)
+            if os.path.exists(log_file_path):
+                os.remove(log_file_path)
+
+            cmd = build_terminal_command(self.script_path, int(timeout), auto_execute, log_file_path)
+            creationflags = subprocess.CREATE_NEW_CONSOLE if sys.platform == 'win32' else 0
+            process = subprocess.Popen(cmd, creationflags=creationflags)
+            pid = process.pid
+            settings = {
+                'timeout': int(timeout),
+                'auto_execute': bool(auto_execute),
+                'monitor_inactive': bool(monitor_inactive),
+                'inactive_timeout': int(inactive_timeout),
+                'suspend_idle': bool(suspend_idle),
+                'reclaim_memory': bool(reclaim_memory),
+                'throttle_runaways': bool(throttle_runaways),
+            }
+            session = TerminalSession(process, settings, log_file_path, slot,
+                                      lambda lines: self._on_log_lines(pid, lines))
+            self.sessions[pid] = session
+
+            self._ensure_process_tree().refresh(force=True)
+            if self.use_monitor_process:
+                # Samples the terminal, and monitors its children if the settings ask for it
+                try:
+                    self._ensure_monitor_process().add_terminal(pid, settings)
+                except Exception as e:
+                    logger.error(f"Monitor process could not take session {pid}: {e}")
+                    self._kill_tree(pid)
+                    del self.sessions[pid]
+                    raise
+            else:
+                self._ensure_metrics_sampler()
+                if monitor_inactive:
+                    self._monitor_session(session)
+
+            # Add to process library
+            self.metric_histories.reset_session(pid)
+            self.process_library.add(pid,
+                                     start_time=session.start_time.timestamp(),
+                                     status=ProcessStatus.RUNNING,
+                                     auto_execute=bool(auto_execute),
+                                     timeout=int(timeout),
+                                     session_pid=pid)
+
+            session.log_tailer.start()
+            if not self.use_monitor_process:
+                if self.dashboard_sampler is None:
+                    import dashboard_sampler
+                    self.dashboard_sampler = dashboard_sampler.DashboardSampler()
+                    self.dashboard_sampler.set_process_tree(self.process_tree)
+                    self.dashboard_sampler.set_metrics_sampler(self.metrics_sampler)
+                self.dashboard_sampler.add_terminal(pid)
+            self._start_pump()
+        logger.info(f"Launched auto-terminator.ps1 with PID: {pid} and Timeout: {timeout}s "
+                    f"({len(self.sessions)} sessions running)")
+        self._emit(EVENT_SESSION_STARTED, {'pid': pid, 'settings': dict(settings)})
+        return pid
+
+    def stop_session(self, pid: Optional[int] = None) -> Optional[int]:
+        """
+        Terminate a session's process tree and close its library entry.
+
+        Args:
+            pid: Terminal PID of the session (defaults to the most recently started one)
+
+        Returns:
+            PID of the stopped terminal, or None if there was no such session
+        """
+        with self._lock:
+            if pid is None:
+                pid = self.session_pid
+            session = self.sessions.get(pid)
+            if session is None:
+                return None
+            session.log_tailer.stop()
+            if self.dashboard_sampler:
+                self.dashboard_sampler.remove_terminal(pid)
+            if session.is_running():
+                self._kill_tree(pid)
+            if self.monitor_process:
+                try:
+                    self.monitor_process.remove_terminal(pid)
+                except RuntimeError as e:
+                    logger.error(f"Error removing session {pid} from the monitor process: {e}")
+
+            # Leave the shared monitor; it stops with the last monitored session
+            monitor = self.inactive_process_monitor
+            if monitor and monitor.is_terminal_pid(pid):
+                monitor.remove_terminal_pid(pid)
+                if not monitor.terminals:
+                    self._stop_inactive_process_monitor()
+
+            # Close the library entry; its metrics already hold the last dashboard sample
+            if self.process_library.is_tracking(pid):
+                self.process_library.update(pid, end_time=time.time(), status=ProcessStatus.TERMINATED)
+
+            del self.sessions[pid]
+            self.metric_histories.end_session(pid)
+            for processes in (self.active_processes, self.inactive_processes, self.suspended_processes):
+                for child in [child for child, info in list(processes.items()) if info.get('session_pid') == pid]:
+                    processes.pop(child, None)
+            if not self.sessions:
+                self.active_processes = {}
+                self.inactive_processes = {}
+                self.suspended_processes = {}
+        logger.info(f"Stopped terminal session (PID: {pid})")
+        self._emit(EVENT_SESSION_STOPPED, {'pid': pid})
+        return pid
+
+    def stop_all_sessions(self) -> List[int]:
+        """Stop every session; returns their terminal PIDs."""
+        return [pid for pid in list(self.sessions) if self.stop_session(pid) is not None]
+
+    def _ensure_process_tree(self):
+        if self.process_tree is None:
+            import process_tree
+            self.process_tree = process_tree.ProcessTree()
+        return self.process_tree
+
+    def _ensure_metrics_sampler(self):
+        if self.metrics_sampler is None:
+            import metrics_sampler
+            self.metrics_sampler = metrics_sampler.MetricsSampler()
+        return self.metrics_sampler
+
+    def _ensure_monitor_process(self):
+        if self.monitor_process is None:
+            import monitor_process
+            process = monitor_process.MonitorProcess()
+            process.set_process_status_callback(self._on_process_status)
+            process.set_process_termination_callback(self._on_process_terminated)
+            process.set_process_suspension_callback(self._on_process_suspension)
+            process.start()
+            self.monitor_process = process
+        return self.monitor_process
+
+    def _in_session(self, pid: Optional[int], session_pid: Optional[int]) -> bool:
+        """Whether a PID is a session's terminal or one of its descendants, per the shared tree."""
+        if pid is None or session_pid is None:
+            return False
+        return pid == session_pid or pid in self.process_tree.descendants(session_pid)
+
+    def _kill_tree(self, pid: int):
+        import psutil
+
+        if sys.platform == 'win32':
+            try:
+                # Use taskkill for graceful termination on Windows
+                subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], check=True)
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Error terminating process {pid}: {e}")
+            return
+        # A fresh snapshot, so children started since the last refresh are not left behind
+        self.process_tree.refresh(force=True)
+        processes = []
+        for target in self.process_tree.descendants(pid) + [pid]:
+            try:
+                processes.append(psutil.Process(target))
+            except psutil.NoSuchProcess:
+                pass
+        for process in processes:
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(processes, timeout=3)
+
+    def close(self):
+        """Stop every session and release the library and log storage."""
+        self.stop_all_sessions()
+        self._stop_pump()
+        if self.monitor_process:
+            self.monitor_process.stop()
+            self.monitor_process = None
+        self._closing.set()
+        self._log_index_thread.join(timeout=5)
+        self.pid_logs.close()
+        self.process_library.close()
+
+    # Inactive process monitor
+
+    def _monitor_session(self, session: TerminalSession):
+        """Register a session's terminal with the shared monitor, starting the monitor if needed."""
+        import inactive_process_monitor
+        import memory_reclaimer
+        import runaway_detector
+
+        settings = session.settings
+        monitor = self.inactive_process_monitor or self._start_inactive_process_monitor(settings)
+        if monitor is None:
+            return
+        try:
+            # Reclamation and runaway throttling are host-wide; the first session asking for them turns them on
+            if settings['reclaim_memory'] and not monitor.memory_reclaimer:
+                monitor.set_memory_reclaimer(memory_reclaimer.MemoryReclaimer())
+            if settings['throttle_runaways'] and not monitor.runaway_detector:
+                monitor.set_runaway_detector(runaway_detector.RunawayDetector())
+            idle_action = (inactive_process_monitor.IDLE_ACTION_SUSPEND if settings['suspend_idle']
+                           else inactive_process_monitor.IDLE_ACTION_TERMINATE)
+            # Exclude the terminal from termination; its descendants get the session's timeout and idle action
+            monitor.add_terminal_pid(session.pid, timeout_seconds=settings['inactive_timeout'],
+                                     idle_action=idle_action)
+            # New descendants are found through the shared tree; register the current ones in one batch
+            children = self.process_tree.descendants(session.pid)
+            if children:
+                monitor.add_processes(children)
+            logger.info(f"Monitoring session {session.pid} with inactivity timeout: {settings['inactive_timeout']}s")
+        except Exception as e:
+            logger.error(f"Error adding session {session.pid} to the inactive process monitor: {e}")
+
+    def _start_inactive_process_monitor(self, settings: Dict[str, Any]):
+        import inactive_process_monitor
+        import load_governor
+
+        try:
+            # Defaults for PIDs added by hand that belong to no session
+            monitor = inactive_process_monitor.InactiveProcessMonitor(settings['inactive_timeout'])
+            # Let the monitor shed load rather than compete with the clients when the host is busy
+            monitor.set_load_governor(load_governor.LoadGovernor(tick_budget_seconds=monitor.tick_interval))
+            monitor.set_process_status_callback(self._on_process_status)
+            monitor.set_process_termination_callback(self._on_process_terminated)
+            monitor.set_process_suspension_callback(self._on_process_suspension)
+            monitor.set_process_tree(self.process_tree)
+            monitor.set_metrics_sampler(self.metrics_sampler)
+            monitor.start_monitoring()
+            self.inactive_process_monitor = monitor
+            logger.info("Inactive process monitor started")
+            return monitor
+        except Exception as e:
+            logger.error(f"Error starting inactive process monitor: {e}")
+            return None
+
+    def _stop_inactive_process_monitor(self):
+        if self.inactive_process_monitor:
+            self.inactive_process_monitor.stop_monitoring()
+            self.inactive_process_monitor = None
+
+    def add_pids(self, pids: Iterable[int]) -> Dict[int, str]:
+        """
+        Add PIDs to the inactive process monitor.
+
+        Returns:
+            PID -> outcome (see InactiveProcessMonitor.add_processes)
+
+        Raises:
+            RuntimeError: The monitor is not running
+        """
+        self._check_monitoring()
+        if self.monitor_process:
+            return self.monitor_process.add_processes(pids)
+        return self.inactive_process_monitor.add_processes(list(pids))
+
+    def resume_pids(self, pids: Optional[Iterable[int]] = None) -> Tuple[List[int], List[int]]:
+        """
+        Resume suspended processes (all of them when pids is empty or None).
+
+        Returns:
+            (resumed PIDs, PIDs that were not suspended)
+
+        Raises:
+            RuntimeError: The monitor is not running
+        """
+        self._check_monitoring()
+        if self.monitor_process:
+            return self.monitor_process.resume_processes(pids or [])
+        pids = list(pids or []) or list(self.inactive_process_monitor.suspended_processes.keys())
+        resumed = [pid for pid in pids if self.inactive_process_monitor.resume_process(pid)]
+        return resumed, [pid for pid in pids if pid not in resumed]
+
+    def _check_monitoring(self):
+        monitoring = (self.monitor_process.monitored_terminals if self.monitor_process
+                      else self.inactive_process_monitor)
+        if not monitoring:
+            raise RuntimeError("Start a terminal with inactive process monitoring enabled first.")
+
+    def _on_process_status(self, pid: int, is_active: bool, process_info: Dict[str, Any]):
+        """Monitor callback: track a child's activity and keep its library entry current"""
+        if is_active:
+            self.active_processes[pid] = process_info
+            self.inactive_processes.pop(pid, None)
+        else:
+            self.inactive_processes[pid] = process_info
+            self.active_processes.pop(pid, None)
+
+        if pid in self.sessions:
+            return
+        if not self.process_library.is_tracking(pid):
+            self._add_child_process_to_library(pid, process_info)
+        else:
+            self._update_child_process_in_library(pid, process_info, is_active)
+
+    def _add_child_process_to_library(self, pid: int, process_info: Dict[str, Any]):
+        try:
+            # PIDs added by hand outside any session are filed under the latest one
+            session_pid = (process_info.get('session_pid') or self.process_tree.owning_terminal(pid, self.sessions)
+                           or self.session_pid)
+            session = self.sessions.get(session_pid)
+            # Record the direct parent within the session, or the terminal
+            parent_pid = self.process_tree.parent(pid)
+            if not self._in_session(parent_pid, session_pid):
+                parent_pid = session_pid
+            self.process_library.add(
+                pid,
+                start_time=time.time(),
+                status=ProcessStatus.CHILD_RUNNING,
+                auto_execute=False,  # Child processes don't have auto-execute
+                timeout=session.settings['inactive_timeout'] if session else 30,
+                cpu_percent=process_info.get('cpu'),
+                memory_mb=process_info.get('memory'),
+                process_name=process_info.get('name', 'Unknown'),
+                parent_pid=parent_pid,
+                session_pid=session_pid
+            )
+            self._emit(EVENT_PROCESS_ADDED, {'pid': pid, 'name': process_info.get('name', 'Unknown'),
+                                             'session_pid': session_pid})
+        except Exception as e:
+            logger.error(f"Error adding child process {pid} to library: {e}")
+
+    def _update_child_process_in_library(self, pid: int, process_info: Dict[str, Any], is_active: bool):
+        try:
+            # Update status based on activity; the inactive time is kept as a number
+            if is_active:
+                status = ProcessStatus.CHILD_RUNNING
+                inactive_time = None
+            else:
+                status = ProcessStatus.CHILD_INACTIVE
+                inactive_time = process_info.get('inactive_time', 0)
+
+            # Add log entry for runaway throttling actions
+            if process_info.get('runaway_action'):
+                log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} ({process_info.get('name', 'Unknown')}) is a runaway, action: {process_info['runaway_action']}\n"
+                self.append_pid_log(pid, log_entry)
+                from runaway_detector import ACTION_TERMINATE
+                if process_info['runaway_action'] == ACTION_TERMINATE:
+                    status = ProcessStatus.CHILD_RUNAWAY
+
+            metrics = {
+                'cpu_percent': process_info.get('cpu'),
+                'memory_mb': process_info.get('memory'),
+                'network_connections': process_info.get('connections')
+            }
+            self.metric_histories.record(pid, metrics)
+
+            # Update status and metrics (batched into the library's next transaction)
+            self.process_library.update(pid, status=status, inactive_seconds=inactive_time, **metrics)
+
+            # Add log entry for significant status changes
+            if not is_active and process_info.get('inactive_time', 0) > 10:
+                log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} ({process_info.get('name', 'Unknown')}) inactive for {process_info.get('inactive_time', 0)}s\n"
+                self.append_pid_log(pid, log_entry)
+        except Exception as e:
+            logger.error(f"Error updating child process {pid} in library: {e}")
+
+    def _on_process_suspension(self, pid: int, suspended: bool):
+        """Monitor callback: a child was suspended or resumed"""
+        try:
+            if suspended:
+                info = self.inactive_processes.pop(pid, None) or self.active_processes.pop(pid, None) or {}
+                info['suspended_at'] = datetime.now().strftime('%H:%M:%S')
+                self.suspended_processes[pid] = info
+                status = ProcessStatus.CHILD_SUSPENDED
+                log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} suspended due to inactivity\n"
+            else:
+                self.suspended_processes.pop(pid, None)
+                status = ProcessStatus.CHILD_RUNNING
+                log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} resumed\n"
+
+            if self.process_library.is_tracking(pid):
+                self.process_library.update(pid, status=status)
+                self.append_pid_log(pid, log_entry)
+            self._emit(EVENT_PROCESS_SUSPENDED if suspended else EVENT_PROCESS_RESUMED, {'pid': pid})
+        except Exception as e:
+            logger.error(f"Error updating suspension of child process {pid}: {e}")
+
+    def _on_process_terminated(self, pid: int):
+        """Monitor callback: a child ended; record why"""
+        try:
+            self.suspended_processes.pop(pid, None)
+            if self.process_library.is_tracking(pid):
+                # Check if it was terminated due to inactivity or naturally
+                current_status = self.process_library[pid].status
+                if current_status is ProcessStatus.CHILD_RUNAWAY:
+                    status = ProcessStatus.CHILD_TERMINATED_RUNAWAY
+                    log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} terminated as a runaway\n"
+                elif current_status in (ProcessStatus.CHILD_INACTIVE, ProcessStatus.CHILD_SUSPENDED):
+                    status = ProcessStatus.CHILD_TERMINATED_INACTIVITY
+                    log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} terminated due to inactivity\n"
+                else:
+                    status = ProcessStatus.CHILD_TERMINATED_NATURAL
+                    log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} terminated naturally\n"
+
+                self.process_library.update(pid, status=status, end_time=time.time())
+                self.append_pid_log(pid, log_entry)
+                self._emit(EVENT_PROCESS_TERMINATED, {'pid': pid, 'status': status.name.lower()})
+        except Exception as e:
+            logger.error(f"Error marking child process {pid} as terminated: {e}")
+
+    # Logs and metrics
+
+    def _on_log_lines(self, pid: int, lines: List[str]):
+        """Receive a batch of complete lines from a session's log (runs on its tailer thread)"""
+        new_content = "".join(lines)
+        # Store and index log content for the session's terminal
+        self.append_pid_log(pid, new_content, lines)
+        self._emit(EVENT_LOG, {'pid': pid, 'text': new_content})
+
+    def append_pid_log(self, pid: int, text: str, lines: Optional[List[str]] = None):
+        """Append text to the log of a PID's library entry from this run and index its lines for search."""
+        entry_id = self.process_library.entry_id(pid, current_run=True)
+        if entry_id is None:
+            logger.warning(f"No library entry for PID {pid}; dropping its log text")
+            return
+        first_line = self.pid_logs.append(entry_id, text)
+        self.log_index.add_lines(entry_id, first_line, lines if lines is not None else text.splitlines())
+
+    def _index_stored_logs(self, entry_ids: List[int]):
+        """Index the logs of entries created by earlier runs (runs on a background thread)."""
+        for entry_id in entry_ids:
+            start = 0
+            while not self._closing.is_set():
+                lines = self.pid_logs.read_lines(entry_id, start, STORED_LOG_INDEX_BATCH_LINES)
+                if not lines:
+                    break
+                self.log_index.add_lines(entry_id, start, lines)
+                start += len(lines)
+            if self._closing.is_set():
+                return
+            # Drop postings added after delete_entry() removed the entry
+            if self.process_library.get_entry(entry_id) is None:
+                self.log_index.delete(entry_id)
+
+    def _start_pump(self):
+        """Start the snapshot pump unless it is running; called with the lock held."""
+        if self._pump_thread is None:
+            self._pump_stop.clear()
+            self._pump_thread = threading.Thread(target=self._pump_snapshots, daemon=True)
+            self._pump_thread.start()
+
+    def _stop_pump(self):
+        with self._lock:
+            thread = self._pump_thread
+            self._pump_stop.set()
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=2)
+
+    def _pump_snapshots(self):
+        """Record each session's dashboard snapshots in the histories and the library, then publish them"""
+        while not self._pump_stop.is_set():
+            snapshots = self._next_snapshots()
+            if not snapshots:
+                with self._lock:
+                    # Checked under the lock so start_session() starts a new pump once this one is done
+                    if not self.sessions:
+                        self._pump_thread = None
+                        return
+                continue
+            for snapshot in snapshots:
+                self._record_snapshot(snapshot)
+        with self._lock:
+            self._pump_thread = None
+
+    def _next_snapshots(self) -> List[Dict[str, Any]]:
+        """Wait briefly for dashboard snapshots from the sampler thread or the monitor process's ring"""
+        if self.monitor_process:
+            snapshots = self.monitor_process.read_snapshots()
+            if not snapshots:
+                self._pump_stop.wait(SNAPSHOT_POLL_SECONDS)
+            return snapshots
+        try:
+            return [self.dashboard_sampler.snapshots.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+
+    def _record_snapshot(self, snapshot: Dict[str, Any]):
+        """Record a snapshot in its session's history and the library, then publish it"""
+        pid = snapshot['pid']
+        session = self.sessions.get(pid)
+        if session is None:
+            return
+        if snapshot['running'] and not session.is_running():
+            # An exited terminal we have not reaped yet still looks alive to psutil; poll() reaps it
+            snapshot = dict(snapshot, running=False, cpu=None, memory_mb=None, network=None, power_w=None)
+        if snapshot['running']:
+            metrics = {
+                'cpu_percent': snapshot['cpu'],
+                'memory_mb': snapshot['memory_mb'],
+                'network_connections': snapshot['network'],
+                'power_w': snapshot['power_w']
+            }
+            history = self.metric_histories.session_history(pid)
+            if history is not None:
+                history.record(metrics, snapshot['timestamp'])
+            self.metric_histories.record(pid, metrics, snapshot['timestamp'])
+            if self.process_library.is_tracking(pid):
+                self.process_library.update(pid, **metrics)
+        session.latest_snapshot = snapshot
+        self._emit(EVENT_SNAPSHOT, snapshot)
+        if not snapshot['running'] and not session.is_running():
+            # The terminal exited by itself; close its session and clean up what it left
+            self.stop_session(pid)
+
+    # Status, library and reports
+
+    def status(self) -> Dict[str, Any]:
+        """Summary of the service state."""
+        monitor = self.inactive_process_monitor
+        sessions = list(self.sessions.values())
+        current = sessions[-1] if sessions else None
+        if self.monitor_process:
+            remote = self.monitor_process.get_metrics()
+        else:
+            remote = {
+                'monitor': monitor.get_metrics() if monitor else None,
+                'metrics_sampler': self.metrics_sampler.get_metrics() if self.metrics_sampler else None,
+            }
+        return {
+            'running': self.is_running(),
+            'pid': current.pid if current else None,
+            'started': current.start_time.isoformat() if current else None,
+            'settings': dict(current.settings) if current else {},
+            'snapshot': current.latest_snapshot if current else None,
+            'sessions': [session.describe() for session in sessions],
+            'monitor': remote['monitor'],
+            'monitor_process': remote if self.monitor_process else None,
+            'library': {'processes': len(self.process_library), **self.process_library.get_metrics()},
+            'log_index': self.log_index.get_metrics(),
+            'process_tree': self.process_tree.get_metrics() if self.process_tree else None,
+            'metrics_sampler': remote['metrics_sampler'],
+            'log_tailer': {
+                'lines_delivered': sum(session.log_tailer.lines_delivered for session in sessions),
+                'rotations': sum(session.log_tailer.rotations for session in sessions),
+                'truncations': sum(session.log_tailer.truncations for session in sessions),
+            },
+        }
+
+    def processes(self, session_pid: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Copies of the monitored child processes, by state (of one session when session_pid is given)."""
+        def rows(processes):
+            return [dict(info, pid=pid) for pid, info in list(processes.items())
+                    if session_pid is None or info.get('session_pid') == session_pid]
+        return {
+            'active': rows(self.active_processes),
+            'inactive': rows(self.inactive_processes),
+            'suspended': rows(self.suspended_processes),
+        }
+
+    def iter_report(self, pid: int):
+        """
+        Stream a PID's report.
+
+        Raises:
+            KeyError: The PID is not in the library
+        """
+        return report_writer.iter_report(pid, self.process_library[pid], self.pid_logs,
+                                         history=self.metric_histories.get(pid))
+
+    def write_report(self, pid: int, f) -> int:
+        """Write a PID's report to a text file object; returns the characters written."""
+        return report_writer.write_report(f, pid, self.process_library[pid], self.pid_logs,
+                                          self.metric_histories.get(pid))
+
+    def export_reports(self, directory: Optional[str] = None,
+                       archive_path: Optional[str] = None) -> report_writer.ReportExport:
+        """Start a background export of every PID's report; poll the returned ReportExport."""
+        export = report_writer.ReportExport(self.process_library.items(), self.pid_logs,
+                                            directory=directory, archive_path=archive_path,
+                                            histories=self.metric_histories)
+        export.start()
+        return export
+
+    def export_library(self, path: str, include_history: bool = True) -> Dict[str, Any]:
+        """Export the library (and metric history) as JSON Lines, CSV or columnar data."""
+        import library_export
+
+        # Write buffered updates so the export's own connection sees them
+        self.process_library.flush()
+        return library_export.export_library(self.process_library.db_path, path, include_history=include_history)
+
+    def delete_entry(self, pid: int) -> bool:
+        """Remove a PID's library entries, their logs and index postings, and its history."""
+        if pid not in self.process_library:
+            return False
+        for entry_id in self.process_library.delete(pid):
+            self.pid_logs.delete(entry_id)
+            self.log_index.delete(entry_id)
+        self.metric_histories.delete(pid)
+        return True
+
+    def search_logs(self, query: str, pid: Optional[int] = None,
+                    limit: int = log_index.DEFAULT_SEARCH_LIMIT) -> List[Tuple[int, int, str]]:
+        """
+        Lines containing every word of a query.
+
+        Args:
+            query: Words to match
+            pid: Only search the log of this PID's latest entry
+            limit: Maximum number of hits
+
+        Returns:
+            (pid, line number, text) of each hit
+        """
+        entry_id = None
+        if pid is not None:
+            entry_id = self.process_library.entry_id(pid)
+            if entry_id is None:
+                return []
+        hits = log_index.read_hits(self.log_index.search(query, entry_id=entry_id, limit=limit), self.pid_logs)
+        results = []
+        for hit_entry_id, line, text in hits:
+            record = self.process_library.get_entry(hit_entry_id)
+            if record is not None:
+                results.append((record.pid, line, text))
+        return results
+
+
+def main():
+    """Run the service headless with its HTTP/JSON API."""
+    import argparse
+
+    from service_api import DEFAULT_API_HOST, DEFAULT_API_PORT, DEFAULT_EXPORT_DIR, LOOPBACK_HOSTS, ServiceAPIServer
+
+    parser = argparse.ArgumentParser(description="Run the Auto-Terminator core headless with a local JSON API")
+    parser.add_argument("--host", default=DEFAULT_API_HOST, help=f"Address to bind (default: {DEFAULT_API_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_API_PORT, help=f"Port (default: {DEFAULT_API_PORT})")
+    parser.add_argument("--token", default=os.environ.get('AUTO_TERMINATOR_API_TOKEN'),
+                        help="Bearer token required by the API (default: $AUTO_TERMINATOR_API_TOKEN)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"Library database (default: {DEFAULT_DB_PATH})")
+    parser.add_argument("--export-dir", default=DEFAULT_EXPORT_DIR,
+                        help=f"Directory API exports are written to (default: {DEFAULT_EXPORT_DIR})")
+    parser.add_argument("--start", action="store_true", help="Start a terminal session immediately")
+    parser.add_argument("--timeout", type=int, default=30, help="Session idle timeout in seconds")
+    parser.add_argument("--auto-execute", action="store_true", help="Auto-execute AI commands")
+    parser.add_argument("--monitor-inactive", action="store_true", help="Monitor child processes for inactivity")
+    parser.add_argument("--inactive-timeout", type=int, default=30, help="Child inactivity timeout in seconds")
+    parser.add_argument("--monitor-process", action="store_true",
+                        help="Run the monitor and dashboard sampling in a separate process")
+
+    args = parser.parse_args()
+
+    if args.host not in LOOPBACK_HOSTS and not args.token:
+        sys.exit("Refusing to expose the API beyond loopback without --token")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    service = AutoTerminatorService(library_db_path=args.db, monitor_process=args.monitor_process)
+    server = ServiceAPIServer(service, args.host, args.port, args.token, args.export_dir)
+    try:
+        if args.start:
+            service.start_session(timeout=args.timeout, auto_execute=args.auto_execute,
+                                  monitor_inactive=args.monitor_inactive, inactive_timeout=args.inactive_timeout)
+        print(f"Auto-Terminator service listening on {server.url}")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures how quickly the dashboard starts: the time to import main.py and the
+time from launching the interpreter to the main window's first drawn frame.
+Every run uses a fresh interpreter so cached modules cannot hide import work,
+and the run exits non-zero when a median is over its budget so the numbers can
+be tracked between changes.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+# Budgets for the median of the runs, in milliseconds
+IMPORT_BUDGET_MS = 120.0
+FIRST_FRAME_BUDGET_MS = 1000.0
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_IMPORT_SCRIPT = """
+import time
+started = time.perf_counter()
+import main
+print((time.perf_counter() - started) * 1000)
+"""
+
+# Prints "frame" once the main window is mapped and drawn, then waits for stdin to close
+_FRAME_SCRIPT = """
+import os, sys, tkinter as tk
+import auto_terminator_service, main
+root = tk.Tk()
+service = auto_terminator_service.AutoTerminatorService(
+    library_db_path=os.path.join(sys.argv[1], 'process_library.db'))
+app = main.AutoTerminatorManager(root, service=service)
+while not root.winfo_ismapped():
+    root.update()
+root.update()
+print("frame", flush=True)
+sys.stdin.read()
+app.on_closing()
+"""
+
+
+def measure_import_ms() -> float:
+    """Milliseconds to import main.py in a fresh interpreter."""
+    output = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT], cwd=PACKAGE_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_frame_ms() -> float:
+    """Milliseconds from launching a fresh interpreter to the dashboard's first frame."""
+    with tempfile.TemporaryDirectory(prefix='auto_terminator_bench_') as scratch:
+        started = time.perf_counter()
+        child = subprocess.Popen([sys.executable, "-c", _FRAME_SCRIPT, scratch], cwd=PACKAGE_DIR,
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        line = child.stdout.readline()
+        elapsed = (time.perf_counter() - started) * 1000
+        _, errors = child.communicate("")
+        if line.strip() != "frame":
+            raise RuntimeError(f"Dashboard did not start: {errors.strip()}")
+        return elapsed
+
+
+def display_available() -> bool:
+    """Whether Tk can open a window here (not on headless agents without a display)."""
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def report(name: str, samples: List[float], budget_ms: float) -> bool:
+    """Print a measurement against its budget; returns whether the median is within it."""
+    median = statistics.median(samples)
+    within = median <= budget_ms
+    print(f"{name}: median {median:.1f} ms, min {min(samples):.1f} ms, max {max(samples):.1f} ms "
+          f"over {len(samples)} runs (budget {budget_ms:.0f} ms) {'OK' if within else 'OVER BUDGET'}")
+    return within
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the startup benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure dashboard import time and time to first frame")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (default: 5)")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"Budget for the median import time (default: {IMPORT_BUDGET_MS:.0f})")
+    parser.add_argument("--frame-budget-ms", type=float, default=FIRST_FRAME_BUDGET_MS,
+                        help=f"Budget for the median time to first frame (default: {FIRST_FRAME_BUDGET_MS:.0f})")
+
+    args = parser.parse_args(argv)
+
+    within = report("Import main.py", [measure_import_ms() for _ in range(args.runs)], args.import_budget_ms)
+    if display_available():
+        frame_samples = [measure_first_frame_ms() for _ in range(args.runs)]
+        within = report("First frame", frame_samples, args.frame_budget_ms) and within
+    else:
+        print("First frame: skipped (no display)")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
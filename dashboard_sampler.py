@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Dashboard Sampler
+Samples terminal process trees on a background thread and publishes
+dashboard snapshots through a queue, so the Tk main thread never blocks on psutil.
+One thread serves every running session: each pass reads all terminals and
+their descendants from the metrics sampler (see metrics_sampler.py) in one
+call, which is shared with the inactive process monitor.
+"""
+
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+import psutil
+
+from metrics_sampler import MetricsSampler
+
+# Rough power model used by the dashboard's power card
+BASE_POWER_WATTS = 0.5  # Base power consumption in watts
+CPU_POWER_WATTS = 2.0  # Per CPU percent of the terminal process
+MEMORY_POWER_WATTS_PER_GB = 0.1  # Memory factor
+CHILD_POWER_WATTS = 0.5  # Child processes at 100% CPU consume this much
+
+
+class DashboardSampler:
+    def __init__(self, interval_seconds: float = 1.0):
+        """
+        Initialize the dashboard sampler.
+
+        Args:
+            interval_seconds: Time between snapshots
+        """
+        self.interval_seconds = interval_seconds
+        # Snapshots for the consumer; sized so a pass over many sessions fits
+        self.snapshots: queue.Queue = queue.Queue(maxsize=256)
+        # Terminal PIDs being sampled
+        self._pids: List[int] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Guards the terminal list and the thread's lifetime
+        self._lock = threading.Lock()
+        # Optional shared process tree (see process_tree.py); otherwise sessions are walked with psutil
+        self.process_tree = None
+        # Measures the processes; replaced by the one shared with the monitor (see set_metrics_sampler)
+        self.metrics_sampler = MetricsSampler()
+
+    def set_process_tree(self, tree):
+        """
+        Find the terminals' children through a shared process tree.
+
+        Args:
+            tree: process_tree.ProcessTree, or None to walk each session with children(recursive=True)
+        """
+        self.process_tree = tree
+
+    def set_metrics_sampler(self, sampler):
+        """
+        Read process metrics from a sampler shared with the inactive process monitor.
+
+        Args:
+            sampler: metrics_sampler.MetricsSampler
+        """
+        self.metrics_sampler = sampler
+
+    def start(self, pid: int):
+        """
+        Sample only this terminal process and its children.
+
+        Args:
+            pid: PID of the terminal process
+        """
+        self.stop()
+        self.add_terminal(pid)
+
+    def add_terminal(self, pid: int):
+        """
+        Start sampling a terminal process and its children alongside any others.
+
+        Args:
+            pid: PID of the terminal process
+        """
+        with self._lock:
+            if pid not in self._pids:
+                self._pids.append(pid)
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def remove_terminal(self, pid: int):
+        """Stop sampling a terminal; the thread ends with the last one."""
+        with self._lock:
+            if pid in self._pids:
+                self._pids.remove(pid)
+
+    def stop(self):
+        """Stop sampling every terminal."""
+        with self._lock:
+            self._pids = []
+            thread = self._thread
+            self._stop.set()
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=2)
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """
+        Drain the queue and return the newest snapshot, without blocking.
+
+        Returns:
+            The most recent snapshot, or None if none arrived since the last call
+        """
+        snapshot = None
+        while True:
+            try:
+                snapshot = self.snapshots.get_nowait()
+            except queue.Empty:
+                return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                pids = list(self._pids)
+            for snapshot in self.sample_all(pids):
+                self._publish(snapshot)
+                if not snapshot['running']:
+                    self.remove_terminal(snapshot['pid'])
+            with self._lock:
+                if not self._pids or self._stop.is_set():
+                    # Checked under the lock so add_terminal() starts a new thread once this one is done
+                    self._thread = None
+                    return
+            self._stop.wait(self.interval_seconds)
+
+    def _publish(self, snapshot: Dict[str, Any]):
+        # Drop the oldest snapshot rather than block if the consumer falls behind
+        while True:
+            try:
+                self.snapshots.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.snapshots.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _descendants(self, pid: int) -> Optional[List[int]]:
+        if self.process_tree:
+            return self.process_tree.descendants(pid)
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+    def sample(self, pid: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Take one dashboard snapshot of a terminal.
+
+        Args:
+            pid: Terminal PID (defaults to the first one being sampled)
+
+        Returns:
+            Dict with numeric 'cpu' (percent), 'memory_mb', 'network' (connection count),
+            'power_w', plus 'pid', 'running' and 'timestamp'
+        """
+        if pid is None:
+            pid = self._pids[0] if self._pids else None
+        return self.sample_all([pid])[0]
+
+    def sample_all(self, pids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Take one dashboard snapshot of each terminal, measuring all their processes in one pass.
+
+        Args:
+            pids: Terminal PIDs
+
+        Returns:
+            One snapshot per terminal, in the same order (see sample())
+        """
+        trees = {pid: self._descendants(pid) for pid in pids}
+        wanted = []
+        for pid, child_pids in trees.items():
+            if child_pids is not None:
+                wanted.append(pid)
+                wanted.extend(child_pids)
+        samples = self.metrics_sampler.sample(wanted) if wanted else {}
+        timestamp = time.time()
+        return [self._snapshot(pid, trees[pid] or [], samples, timestamp) for pid in pids]
+
+    @staticmethod
+    def _snapshot(pid: int, child_pids: List[int], samples: Dict[int, Any], timestamp: float) -> Dict[str, Any]:
+        snapshot = {
+            'pid': pid,
+            'timestamp': timestamp,
+            'running': False,
+            'cpu': None,
+            'memory_mb': None,
+            'network': None,
+            'power_w': None,
+        }
+        terminal = samples.get(pid)
+        if terminal is None:
+            return snapshot
+        children = [samples[child] for child in child_pids if child in samples]
+        cpu_percent = terminal.cpu_percent
+        memory_mb = terminal.rss / (1024 * 1024)
+        child_power = sum((child.cpu_percent / 100) * CHILD_POWER_WATTS for child in children)
+        snapshot.update({
+            'running': True,
+            'cpu': cpu_percent,
+            'memory_mb': memory_mb,
+            'network': (terminal.connections or 0) + sum(child.connections or 0 for child in children),
+            'power_w': (BASE_POWER_WATTS + cpu_percent * CPU_POWER_WATTS +
+                        memory_mb / 1000 * MEMORY_POWER_WATTS_PER_GB + child_power),
+        })
+        return snapshot
@@ -9,31 +9,159 @@ import time
 import threading
 import logging
 from datetime import datetime
-from typing import Dict, Any, Tuple, Callable
+from typing import Dict, Any, Tuple, Callable, Iterable, Optional
 import sys
 import os
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.environ.get('TEMP', '.'), 'inactive_process_monitor.log')),
-        logging.StreamHandler()
-    ]
-)
+from monitor_sources import SystemClock, PsutilProcessSource
+from metrics_sampler import MetricsSampler
+import runaway_detector
+
 logger = logging.getLogger(__name__)
 
+# Activity thresholds used by _is_process_active
+DEFAULT_CPU_THRESHOLD = 1.0  # CPU usage above this percentage counts as activity
+DEFAULT_MEMORY_THRESHOLD_BYTES = 512 * 1024  # RSS change above this counts as activity
+# Number of initial checks during which a new process is always considered active
+INITIAL_ACTIVE_CHECKS = 3
+# Interval between monitoring passes
+TICK_INTERVAL_SECONDS = 0.5
+
+# What happens to a process once its inactivity timeout expires
+IDLE_ACTION_TERMINATE = 'terminate'
+IDLE_ACTION_SUSPEND = 'suspend'
+# Default time a suspended process is kept before it is terminated
+DEFAULT_SUSPEND_TIMEOUT_SECONDS = 600
+
+# Per-PID outcomes reported by InactiveProcessMonitor.add_processes
+ADD_ADDED = 'added'
+ADD_ALREADY_MONITORED = 'already_monitored'
+ADD_TERMINAL = 'terminal'
+ADD_PROTECTED = 'protected'
+ADD_NOT_FOUND = 'not_found'
+ADD_ERROR = 'error'
+
+
+def configure_logging():
+    """
+    Send log records to the console and %TEMP%\\inactive_process_monitor.log.
+
+    Called when monitoring starts rather than on import, so importing this module
+    opens no file. Does nothing if the root logger is already configured.
+    """
+    # Checked before building the handlers: basicConfig() would ignore them, leaving the file open
+    if logging.getLogger().handlers:
+        return
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(os.environ.get('TEMP', '.'), 'inactive_process_monitor.log')),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def evaluate_activity(process_info: Dict[str, Any], cpu_percent: float, rss: int, connections: int,
+                      now: datetime, cpu_threshold: float = DEFAULT_CPU_THRESHOLD,
+                      memory_threshold_bytes: int = DEFAULT_MEMORY_THRESHOLD_BYTES) -> Tuple[bool, bool, bool, bool]:
+    """
+    Apply the activity rules to one metric sample and update the process state.
+    
+    This is free of psutil calls so the same rules can be driven by live sampling
+    and by trace replay.
+    
+    Args:
+        process_info: Monitored process state (as stored in monitored_processes)
+        cpu_percent: Current CPU usage percentage
+        rss: Current resident set size in bytes
+        connections: Current number of inet connections
+        now: Time of the sample
+        cpu_threshold: CPU percentage above which the process is active
+        memory_threshold_bytes: RSS change above which the process is active
+        
+    Returns:
+        Tuple of (is_active, cpu_active, memory_active, network_active)
+    """
+    cpu_active = cpu_percent > cpu_threshold
+    memory_active = abs(rss - process_info['last_rss']) > memory_threshold_bytes
+    network_active = connections != process_info['last_connections']
+    
+    # Update last known values
+    process_info['last_rss'] = rss
+    process_info['last_connections'] = connections
+    
+    is_active = cpu_active or memory_active or network_active
+    
+    # The first few checks always count as active to give the process time to settle
+    checks_count = process_info.get('checks_count', 0)
+    process_info['checks_count'] = checks_count + 1
+    if checks_count < INITIAL_ACTIVE_CHECKS:
+        is_active = True
+    
+    if is_active:
+        process_info['last_activity_time'] = now
+    
+    return is_active, cpu_active, memory_active, network_active
+
+
+def check_inactivity(process_info: Dict[str, Any], now: datetime, timeout_seconds: float) -> Tuple[bool, float, float]:
+    """
+    Check whether an inactive process has reached its termination deadline.
+    
+    Args:
+        process_info: Monitored process state
+        now: Current time
+        timeout_seconds: Inactivity timeout
+        
+    Returns:
+        Tuple of (timed_out, inactive_seconds, time_since_start). A process still
+        inside its grace period never times out.
+    """
+    last_activity = process_info['last_activity_time']
+    start_time = process_info.get('start_time', last_activity)
+    grace_period = process_info.get('grace_period_seconds', 0)
+    time_since_start = (now - start_time).total_seconds()
+    inactive_seconds = (now - last_activity).total_seconds()
+    timed_out = time_since_start > grace_period and inactive_seconds >= timeout_seconds
+    return timed_out, inactive_seconds, time_since_start
+
+
 class InactiveProcessMonitor:
-    def __init__(self, timeout_seconds: int = 30):
+    def __init__(self, timeout_seconds: int = 30, cpu_threshold: float = DEFAULT_CPU_THRESHOLD,
+                 memory_threshold_bytes: int = DEFAULT_MEMORY_THRESHOLD_BYTES,
+                 clock=None, process_source=None, idle_action: str = IDLE_ACTION_TERMINATE,
+                 suspend_timeout_seconds: float = DEFAULT_SUSPEND_TIMEOUT_SECONDS):
         """
         Initialize the inactive process monitor.
         
         Args:
             timeout_seconds: Time in seconds after which an inactive process should be terminated
+            cpu_threshold: CPU percentage above which a process is considered active
+            memory_threshold_bytes: RSS change in bytes above which a process is considered active
+            clock: Time source (defaults to monitor_sources.SystemClock)
+            process_source: Process provider (defaults to monitor_sources.PsutilProcessSource)
+            idle_action: IDLE_ACTION_TERMINATE to end idle processes, or IDLE_ACTION_SUSPEND to
+                suspend them and terminate only after suspend_timeout_seconds
+            suspend_timeout_seconds: Time a suspended process is kept before it is terminated
         """
+        if idle_action not in (IDLE_ACTION_TERMINATE, IDLE_ACTION_SUSPEND):
+            raise ValueError(f"Unknown idle action: {idle_action}")
+        self.clock = clock or SystemClock()
+        self.process_source = process_source or PsutilProcessSource()
+        # Measures monitored processes once per tick; may be shared with the dashboard (see set_metrics_sampler)
+        self.metrics_sampler = MetricsSampler(self.process_source, self.clock)
+        self.tick_interval = TICK_INTERVAL_SECONDS
+        self._last_children_check = self.clock.time()
         self.timeout_seconds = timeout_seconds
+        self.cpu_threshold = cpu_threshold
+        self.memory_threshold_bytes = memory_threshold_bytes
+        self.idle_action = idle_action
+        self.suspend_timeout_seconds = suspend_timeout_seconds
         self.monitored_processes: Dict[int, Dict[str, Any]] = {}
+        # Guards moves between monitored_processes and suspended_processes, which the monitor
+        # thread and resume_process() callers (the GUI, API handlers) both make
+        self._lock = threading.RLock()
         self.monitoring = False
         self.monitor_thread = None
         # File where PowerShell will write PIDs of child processes to monitor
@@ -42,21 +170,92 @@ class InactiveProcessMonitor:
         self.process_status_callback: Callable = None
         # Callback for process termination
         self.process_termination_callback: Callable = None
-        # Terminal PID to exclude from termination
-        self.terminal_pid = None
+        # Callback for process suspension and resumption
+        self.process_suspension_callback: Callable = None
+        # Terminal PIDs to exclude from termination, each with its session's settings overrides
+        # (replaced rather than mutated, so the monitor thread can iterate without a lock)
+        self.terminals: Dict[int, Dict[str, Any]] = {}
         # Hardcoded processes to never terminate
         self.protected_processes = ['conhost.exe']
+        # Optional metric trace recorder (see metric_trace.py)
+        self.trace_recorder = None
+        # Optional load governor for self-governing load shedding (see load_governor.py)
+        self.load_governor = None
+        # Optional memory-pressure reclaimer (see memory_reclaimer.py)
+        self.memory_reclaimer = None
+        # Optional runaway detector for processes that do too much (see runaway_detector.py)
+        self.runaway_detector = None
+        # Optional shared process tree for discovering the terminal's descendants (see process_tree.py)
+        self.process_tree = None
+        # Descendants already offered to add_processes, so skipped PIDs are not retried every poll
+        self._tree_offered: set = set()
+        # Processes suspended instead of terminated
+        self.suspended_processes: Dict[int, Dict[str, Any]] = {}
+        self._tick_count = 0
+        # Counters reported by get_metrics
+        self.samples_taken = 0
+        self.samples_skipped = 0
         logger.info(f"Inactive Process Monitor initialized with timeout: {timeout_seconds}s")
     
     def set_terminal_pid(self, pid: int):
         """
-        Set the terminal PID to exclude from termination.
+        Set the terminal PID to exclude from termination, replacing any registered terminals.
         
         Args:
             pid: PID of the terminal process to exclude
         """
-        self.terminal_pid = pid
-        logger.info(f"Terminal PID set to {pid}, will be excluded from termination")
+        self.terminals = {}
+        self.add_terminal_pid(pid)
+    
+    def add_terminal_pid(self, pid: int, timeout_seconds: Optional[float] = None,
+                         idle_action: Optional[str] = None):
+        """
+        Register the terminal of one of several concurrent sessions.
+        
+        The terminal is excluded from termination. Processes added later that
+        descend from it (per the process tree) use its session's settings.
+        
+        Args:
+            pid: PID of the terminal process
+            timeout_seconds: Inactivity timeout for the session's processes (None for the monitor's)
+            idle_action: IDLE_ACTION_TERMINATE or IDLE_ACTION_SUSPEND for the session's processes
+                (None for the monitor's)
+        """
+        if idle_action not in (None, IDLE_ACTION_TERMINATE, IDLE_ACTION_SUSPEND):
+            raise ValueError(f"Unknown idle action: {idle_action}")
+        self.terminals = dict(self.terminals)
+        self.terminals[pid] = {'timeout_seconds': timeout_seconds, 'idle_action': idle_action}
+        logger.info(f"Terminal PID {pid} registered, will be excluded from termination")
+    
+    def remove_terminal_pid(self, pid: int):
+        """
+        Unregister a session's terminal. Its processes that are still monitored keep their settings.
+        
+        Args:
+            pid: PID of the terminal process
+        """
+        if pid in self.terminals:
+            self.terminals = {terminal: settings for terminal, settings in self.terminals.items()
+                              if terminal != pid}
+            logger.info(f"Terminal PID {pid} unregistered")
+    
+    def is_terminal_pid(self, pid: int) -> bool:
+        """Whether a PID is a registered terminal."""
+        return pid in self.terminals
+    
+    def _owning_terminal(self, pid: int) -> Optional[int]:
+        """
+        Find the registered terminal a process descends from.
+        
+        Without a process tree, a single registered terminal owns every process.
+        
+        Returns:
+            The terminal PID, or None if the process belongs to no registered session
+        """
+        terminals = self.terminals
+        if not self.process_tree:
+            return next(iter(terminals)) if len(terminals) == 1 else None
+        return self.process_tree.owning_terminal(pid, terminals)
     
     def set_process_status_callback(self, callback: Callable):
         """
@@ -76,9 +275,101 @@ class InactiveProcessMonitor:
         """
         self.process_termination_callback = callback
     
+    def set_process_suspension_callback(self, callback: Callable):
+        """
+        Set a callback function to receive suspend and resume notifications.
+        
+        Args:
+            callback: Function called as callback(pid, suspended) when a process is
+                suspended (suspended=True) or resumed (suspended=False)
+        """
+        self.process_suspension_callback = callback
+    
+    def set_trace_recorder(self, recorder):
+        """
+        Set a recorder that receives every sampled metric.
+        
+        Args:
+            recorder: metric_trace.MetricTraceRecorder, or None to stop recording
+        """
+        self.trace_recorder = recorder
+    
+    def set_load_governor(self, governor):
+        """
+        Enable load shedding with the given governor.
+        
+        Args:
+            governor: load_governor.LoadGovernor, or None to always run at full fidelity
+        """
+        self.load_governor = governor
+    
+    def set_memory_reclaimer(self, reclaimer):
+        """
+        Enable memory-pressure reclamation.
+        
+        Args:
+            reclaimer: memory_reclaimer.MemoryReclaimer, or None to disable
+        """
+        self.memory_reclaimer = reclaimer
+    
+    def set_runaway_detector(self, detector):
+        """
+        Enable runaway detection and throttling over the monitor's samples.
+        
+        Args:
+            detector: runaway_detector.RunawayDetector, or None to disable
+        """
+        self.runaway_detector = detector
+    
+    def set_process_tree(self, tree):
+        """
+        Discover new descendants of the terminal PID from a shared process tree.
+        
+        Checked on the same cadence as the monitored children file, which is
+        still read for PIDs written by the PowerShell side.
+        
+        Args:
+            tree: process_tree.ProcessTree, or None to rely on the children file only
+        """
+        self.process_tree = tree
+        self._tree_offered = set()
+    
+    def set_metrics_sampler(self, sampler):
+        """
+        Read process metrics from a sampler shared with other consumers.
+        
+        Args:
+            sampler: metrics_sampler.MetricsSampler; it should use this monitor's clock
+                and process source
+        """
+        self.metrics_sampler = sampler
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get monitor metrics, including load-shedding state when enabled.
+        
+        Returns:
+            Dict of metric names to values
+        """
+        metrics = {
+            'monitored_processes': len(self.monitored_processes),
+            'ticks': self._tick_count,
+            'samples_taken': self.samples_taken,
+            'samples_skipped': self.samples_skipped,
+            'suspended_processes': len(self.suspended_processes),
+        }
+        if self.load_governor:
+            metrics['load_shedding'] = self.load_governor.get_metrics()
+        if self.memory_reclaimer:
+            metrics['memory_reclaim'] = self.memory_reclaimer.get_metrics()
+        if self.runaway_detector:
+            metrics['runaway'] = self.runaway_detector.get_metrics()
+        return metrics
+    
     def start_monitoring(self):
         """Start the monitoring thread."""
         if not self.monitoring:
+            configure_logging()
             self.monitoring = True
             self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
             self.monitor_thread.start()
@@ -89,6 +380,11 @@ class InactiveProcessMonitor:
         self.monitoring = False
         if self.monitor_thread:
             self.monitor_thread.join(timeout=2)
+        # Never leave processes stopped once nothing will resume or terminate them
+        with self._lock:
+            suspended = list(self.suspended_processes.keys())
+        for pid in suspended:
+            self.resume_process(pid)
         logger.info("Process monitoring stopped")
     
     def is_protected_process(self, process_name: str) -> bool:
@@ -110,38 +406,98 @@ class InactiveProcessMonitor:
         Args:
             pid: Process ID to monitor
         """
-        # Don't monitor the terminal PID itself
-        if self.terminal_pid and pid == self.terminal_pid:
-            logger.info(f"Skipping terminal PID {pid} from monitoring")
-            return
+        self.add_processes([pid])
+    
+    def add_processes(self, pids: Iterable[int]) -> Dict[int, str]:
+        """
+        Add several processes to be monitored for inactivity in one batch.
+        
+        PIDs are deduplicated, the terminal PID and protected processes are
+        filtered in a single pass, and initial metrics come from one batched
+        snapshot instead of per-process calls.
+        
+        Args:
+            pids: Process IDs to monitor
             
+        Returns:
+            Dict mapping each requested PID to one of the ADD_* outcome strings
+        """
+        outcomes: Dict[int, str] = {}
+        candidates = []
+        for pid in pids:
+            if pid in outcomes:
+                continue
+            if self.is_terminal_pid(pid):
+                # Don't monitor the terminal PID itself
+                logger.info(f"Skipping terminal PID {pid} from monitoring")
+                outcomes[pid] = ADD_TERMINAL
+            elif pid in self.monitored_processes or pid in self.suspended_processes:
+                # Checked again under the lock when the process is added
+                outcomes[pid] = ADD_ALREADY_MONITORED
+            else:
+                outcomes[pid] = ADD_ADDED
+                candidates.append(pid)
+        
+        if not candidates:
+            return outcomes
+        
         try:
-            process = psutil.Process(pid)
-            process_name = process.name()
+            snapshots = self.process_source.snapshot(candidates)
+        except Exception as e:
+            logger.error(f"Error taking process snapshot for {len(candidates)} PIDs: {e}")
+            for pid in candidates:
+                outcomes[pid] = ADD_ERROR
+            return outcomes
+        
+        protected = {p.lower() for p in self.protected_processes}
+        now = self.clock.now()
+        added = 0
+        for pid in candidates:
+            snapshot = snapshots.get(pid)
+            if snapshot is None:
+                logger.warning(f"Process {pid} does not exist or cannot be accessed")
+                outcomes[pid] = ADD_NOT_FOUND
+                continue
             
             # Don't monitor protected processes
-            if self.is_protected_process(process_name):
-                logger.info(f"Skipping protected process {process_name} (PID: {pid}) from monitoring")
-                return
-                
-            # Give new processes a grace period by setting their last activity time to now + grace period
+            if snapshot.name.lower() in protected:
+                logger.info(f"Skipping protected process {snapshot.name} (PID: {pid}) from monitoring")
+                outcomes[pid] = ADD_PROTECTED
+                continue
+            
+            # Processes of a registered session use that session's settings
+            terminal = self._owning_terminal(pid) if self.terminals else None
+            session_settings = self.terminals.get(terminal, {})
+            
+            # Give new processes a grace period before inactivity checks
             grace_period_seconds = 10  # 10 second grace period for new processes (reduced)
-            self.monitored_processes[pid] = {
-                'process': process,
-                'last_activity_time': datetime.now(),
-                'start_time': datetime.now(),
-                'last_memory_info': process.memory_info(),
-                'last_network_io': self._get_network_io(process),
-                'window_focus_check_enabled': self._can_check_window_focus(process),
-                'name': process_name,
+            process_info = {
+                'process': snapshot.process,
+                'last_activity_time': now,
+                'start_time': now,
+                'last_rss': snapshot.rss,
+                'last_connections': snapshot.connections,
+                'window_focus_check_enabled': self._can_check_window_focus(snapshot.process),
+                'name': snapshot.name,
                 'grace_period_seconds': grace_period_seconds,
-                'checks_count': 0
+                'checks_count': 0,
+                'terminal_pid': terminal,
+                'timeout_seconds': session_settings.get('timeout_seconds'),
+                'idle_action': session_settings.get('idle_action')
             }
-            logger.info(f"Added process {pid} ({process_name}) to monitoring. Total monitored: {len(self.monitored_processes)}")
-        except psutil.NoSuchProcess:
-            logger.warning(f"Process {pid} does not exist")
-        except Exception as e:
-            logger.error(f"Error adding process {pid} to monitoring: {e}")
+            with self._lock:
+                if pid in self.monitored_processes or pid in self.suspended_processes:
+                    outcomes[pid] = ADD_ALREADY_MONITORED
+                    continue
+                self.monitored_processes[pid] = process_info
+            if self.trace_recorder:
+                self.trace_recorder.record_add(now.timestamp(), pid, snapshot.name, snapshot.rss, snapshot.connections)
+            added += 1
+            logger.info(f"Added process {pid} ({snapshot.name}) to monitoring")
+        
+        if added:
+            logger.info(f"Added {added} processes to monitoring. Total monitored: {len(self.monitored_processes)}")
+        return outcomes
     
     def remove_process(self, pid: int):
         """
@@ -151,48 +507,47 @@ class InactiveProcessMonitor:
             pid: Process ID to remove from monitoring
         """
         # Don't remove the terminal PID
-        if self.terminal_pid and pid == self.terminal_pid:
+        if self.is_terminal_pid(pid):
             return
             
-        if pid in self.monitored_processes:
-            process_name = self.monitored_processes[pid]['process'].name()
+        with self._lock:
+            process_info = self.monitored_processes.get(pid)
+            if process_info is None:
+                return
+            # Use the recorded name; the process may already have exited
+            process_name = process_info['name']
             # Don't remove protected processes
             if self.is_protected_process(process_name):
                 return
             del self.monitored_processes[pid]
-            logger.info(f"Removed process {pid} ({process_name}) from monitoring")
-    
-    def _get_network_io(self, process: psutil.Process) -> Tuple[int, int]:
-        """Get network connection count for a process."""
-        try:
-            connections = process.connections(kind='inet')
-            return (len(connections), len(connections))
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return (0, 0)
+        if self.runaway_detector:
+            self.runaway_detector.forget(pid)
+        logger.info(f"Removed process {pid} ({process_name}) from monitoring")
     
     def _can_check_window_focus(self, process: psutil.Process) -> bool:
         """Check if we can determine window focus for this process."""
         return sys.platform == "win32"
     
-    def _is_process_active(self, pid: int) -> bool:
+    def _is_process_active(self, pid: int, sample) -> bool:
         """
         Check if a process is active based on various criteria.
         
         Args:
             pid: Process ID to check
+            sample: The process's metrics_sampler.ProcessSample for this tick, or None if
+                it could not be measured because it has exited
             
         Returns:
             Boolean indicating if process is active
         """
         # Terminal PID is always considered active
-        if self.terminal_pid and pid == self.terminal_pid:
+        if self.is_terminal_pid(pid):
             return True
             
         if pid not in self.monitored_processes:
             return False
             
         process_info = self.monitored_processes[pid]
-        process = process_info['process']
         process_name = process_info['name']
         
         # Protected processes are always considered active
@@ -200,64 +555,168 @@ class InactiveProcessMonitor:
             return True
             
         try:
-            # Check if process is still running
-            if not process.is_running():
+            # The sampler omits processes that are no longer running
+            if sample is None:
+                # The PID stays monitored until its timeout; record the exit once
+                if self.trace_recorder and not process_info.get('exit_recorded'):
+                    self.trace_recorder.record_exit(self.clock.now().timestamp(), pid)
+                    process_info['exit_recorded'] = True
                 return False
             
-            # Get current CPU usage percentage (this is more reliable than CPU times)
-            current_cpu_percent = process.cpu_percent(interval=0.1)
-            
-            # Check CPU activity - if CPU usage is above 1%, consider it active
-            cpu_active = current_cpu_percent > 1.0
-            
-            # Check memory activity (significant change indicates activity)
-            current_memory_info = process.memory_info()
-            memory_active = (
-                abs(current_memory_info.rss - process_info['last_memory_info'].rss) > 512 * 1024  # 512KB threshold (lowered)
-            )
-            
-            # Check network activity
-            current_network_io = self._get_network_io(process)
-            network_active = (
-                current_network_io[0] != process_info['last_network_io'][0] or
-                current_network_io[1] != process_info['last_network_io'][1]
-            )
+            current_cpu_percent = sample.cpu_percent
+            current_rss = sample.rss
+            if sample.connections is None:
+                # Shedding load: treat connections as unchanged
+                current_connections = process_info['last_connections']
+            else:
+                current_connections = sample.connections
+            now = self.clock.now()
+            self.samples_taken += 1
             
-            # Update last known values
-            process_info['last_memory_info'] = current_memory_info
-            process_info['last_network_io'] = current_network_io
+            if self.trace_recorder:
+                self.trace_recorder.record_sample(now.timestamp(), pid, current_cpu_percent,
+                                                  current_rss, current_connections)
             
-            # Process is active if any of these conditions are met
-            is_active = cpu_active or memory_active or network_active
+            # Inactive time as of the previous check, for the debug output below
+            inactive_time = (now - process_info['last_activity_time']).total_seconds()
             
-            # Special handling: if this is the first few checks, consider the process active
-            # to give it time to settle
-            checks_count = process_info.get('checks_count', 0)
-            process_info['checks_count'] = checks_count + 1
+            is_active, cpu_active, memory_active, network_active = evaluate_activity(
+                process_info, current_cpu_percent, current_rss, current_connections, now,
+                self.cpu_threshold, self.memory_threshold_bytes)
             
-            if checks_count < 3:  # First 3 checks, consider active
-                is_active = True
-                logger.debug(f"Process {pid} in initial checks ({checks_count}/3), considering active")
+            # Runaway detection runs over the same sample
+            if self.runaway_detector:
+                process_info['runaway_action'] = self.runaway_detector.observe(
+                    pid, process_info, current_cpu_percent, current_rss, now)
             
             # Debug output for activity detection
-            if pid in self.monitored_processes:
-                inactive_time = (datetime.now() - process_info['last_activity_time']).total_seconds()
-                logger.info(f"Process {pid} ({process_name}): CPU={current_cpu_percent:.1f}%, Mem_change={memory_active}, Net={network_active}, Active={is_active}, Inactive={inactive_time:.1f}s")
-            
-            # Update last activity time if process is active
-            if is_active:
-                process_info['last_activity_time'] = datetime.now()
-                logger.debug(f"Process {pid} is active - resetting activity timer")
+            logger.info(f"Process {pid} ({process_name}): CPU={current_cpu_percent:.1f}%, Mem_change={memory_active}, Net={network_active}, Active={is_active}, Inactive={inactive_time:.1f}s")
             
             return is_active
             
-        except psutil.NoSuchProcess:
-            # Process no longer exists
-            return False
         except Exception as e:
             logger.error(f"Error checking activity for process {pid}: {e}")
             return False
     
+    def _suspend_process(self, pid: int):
+        """
+        Suspend a monitored process instead of terminating it.
+        
+        Args:
+            pid: Process ID to suspend
+        """
+        # Never suspend the terminal PID
+        if self.is_terminal_pid(pid):
+            logger.info(f"Skipping suspension of terminal PID {pid}")
+            return
+        
+        with self._lock:
+            process_info = self.monitored_processes.get(pid)
+            if process_info is None:
+                logger.warning(f"Process {pid} is not monitored, not suspending")
+                return
+            
+            # Never suspend protected processes
+            if self.is_protected_process(process_info['name']):
+                logger.info(f"Skipping suspension of protected process {process_info['name']} (PID: {pid})")
+                return
+            
+            try:
+                process_info['process'].suspend()
+                process_info['suspended_time'] = self.clock.now()
+                self.suspended_processes[pid] = process_info
+                del self.monitored_processes[pid]
+                logger.info(f"Suspended process {pid} ({process_info['name']}), will be terminated after {self.suspend_timeout_seconds}s unless resumed")
+            except psutil.NoSuchProcess:
+                logger.info(f"Process {pid} already terminated")
+                del self.monitored_processes[pid]
+                return
+            except Exception as e:
+                logger.error(f"Error suspending process {pid}: {e}")
+                return
+        
+        # Notify main application about the suspension
+        if self.process_suspension_callback:
+            try:
+                self.process_suspension_callback(pid, True)
+            except Exception as e:
+                logger.error(f"Error in process suspension callback: {e}")
+    
+    def resume_process(self, pid: int) -> bool:
+        """
+        Resume a suspended process and return it to inactivity monitoring.
+        
+        The process restarts its inactivity timer, so it gets a full timeout
+        before it can be suspended again.
+        
+        Args:
+            pid: Process ID to resume
+            
+        Returns:
+            Boolean indicating if the process was resumed
+        """
+        with self._lock:
+            process_info = self.suspended_processes.pop(pid, None)
+            if process_info is None:
+                logger.warning(f"Process {pid} is not suspended")
+                return False
+            
+            try:
+                process_info['process'].resume()
+                exited = False
+            except psutil.NoSuchProcess:
+                exited = True
+            except Exception as e:
+                logger.error(f"Error resuming process {pid}: {e}")
+                self.suspended_processes[pid] = process_info
+                return False
+            
+            if not exited:
+                now = self.clock.now()
+                suspended_seconds = (now - process_info.pop('suspended_time')).total_seconds()
+                process_info['last_activity_time'] = now
+                process_info['idle'] = False
+                self.monitored_processes[pid] = process_info
+        
+        # Callbacks run outside the lock
+        if exited:
+            logger.info(f"Suspended process {pid} no longer exists")
+            if self.process_termination_callback:
+                try:
+                    self.process_termination_callback(pid)
+                except Exception as e:
+                    logger.error(f"Error in process termination callback: {e}")
+            return False
+        logger.info(f"Resumed process {pid} ({process_info['name']}) after {suspended_seconds:.1f}s suspended")
+        
+        if self.process_suspension_callback:
+            try:
+                self.process_suspension_callback(pid, False)
+            except Exception as e:
+                logger.error(f"Error in process suspension callback: {e}")
+        return True
+    
+    def _check_suspended_processes(self, now: datetime):
+        """Terminate suspended processes whose suspend timeout has expired."""
+        with self._lock:
+            expired = []
+            for pid, process_info in list(self.suspended_processes.items()):
+                suspended_seconds = (now - process_info['suspended_time']).total_seconds()
+                if suspended_seconds >= self.suspend_timeout_seconds:
+                    # Taken out under the lock, so a concurrent resume_process() finds it gone
+                    del self.suspended_processes[pid]
+                    expired.append((pid, process_info, suspended_seconds))
+        for pid, process_info, suspended_seconds in expired:
+            logger.info(f"Process {pid} ({process_info['name']}) suspended for {suspended_seconds:.1f}s, terminating")
+            try:
+                # Continue the process first so it can handle the termination request
+                process_info['process'].resume()
+            except psutil.NoSuchProcess:
+                pass
+            except Exception as e:
+                logger.error(f"Error resuming process {pid} before termination: {e}")
+            self._terminate_process(pid)
+    
     def _terminate_process(self, pid: int):
         """
         Terminate a process forcefully.
@@ -266,12 +725,12 @@ class InactiveProcessMonitor:
             pid: Process ID to terminate
         """
         # Never terminate the terminal PID
-        if self.terminal_pid and pid == self.terminal_pid:
+        if self.is_terminal_pid(pid):
             logger.info(f"Skipping termination of terminal PID {pid}")
             return
             
         try:
-            process = psutil.Process(pid)
+            process = self.process_source.process(pid)
             process_name = process.name()
             
             # Never terminate protected processes
@@ -282,10 +741,10 @@ class InactiveProcessMonitor:
             # Debug: Check if process should really be terminated
             if pid in self.monitored_processes:
                 process_info = self.monitored_processes[pid]
-                start_time = process_info.get('start_time', datetime.now())
+                start_time = process_info.get('start_time', self.clock.now())
                 last_activity = process_info['last_activity_time']
-                time_since_start = (datetime.now() - start_time).total_seconds()
-                inactive_time = (datetime.now() - last_activity).total_seconds()
+                time_since_start = (self.clock.now() - start_time).total_seconds()
+                inactive_time = (self.clock.now() - last_activity).total_seconds()
                 logger.info(f"Terminating process {pid} ({process_name}): Started {time_since_start:.1f}s ago, inactive for {inactive_time:.1f}s")
             else:
                 logger.info(f"Terminating process {pid} ({process_name}) - not in monitored processes")
@@ -322,151 +781,228 @@ class InactiveProcessMonitor:
                 if lines:
                     logger.info(f"Found {len(lines)} PIDs in monitored children file")
                 
-                # Process each line (each should be a PID)
-                for line in lines:
-                    line = line.strip()
-                    if line and line.isdigit():
-                        pid = int(line)
-                        # Add process to monitoring if not already monitored
-                        # and it's not the terminal PID and not a protected process
-                        if pid not in self.monitored_processes and (not self.terminal_pid or pid != self.terminal_pid):
-                            process_name = None
-                            try:
-                                test_process = psutil.Process(pid)
-                                process_name = test_process.name()
-                                # Verify process is actually running
-                                if not test_process.is_running():
-                                    logger.debug(f"Process {pid} is not running, skipping")
-                                    continue
-                            except psutil.NoSuchProcess:
-                                logger.debug(f"Process {pid} does not exist, skipping")
-                                continue
-                            except Exception as e:
-                                logger.debug(f"Error checking process {pid}: {e}, skipping")
-                                continue
-                            
-                            # Check if it's a protected process
-                            if process_name and self.is_protected_process(process_name):
-                                logger.info(f"Skipping protected process {process_name} (PID: {pid}) from monitoring")
-                                continue
-                                
-                            self.add_process(pid)
+                # Each line should be a PID; add_processes filters the rest
+                pids = [int(line) for line in (l.strip() for l in lines) if line.isdigit()]
+                if self.process_tree and self.terminals:
+                    # Every session's script writes to this file; keep the PIDs of registered sessions
+                    pids = [pid for pid in pids if self._owning_terminal(pid) is not None]
+                if pids:
+                    self.add_processes(pids)
                 
                 # Clear the file after processing
                 with open(self.monitored_children_file, 'w') as f:
                     f.write('')
             else:
                 # File doesn't exist, log this occasionally
-                if hasattr(self, '_last_file_check') and time.time() - self._last_file_check > 10:
+                if hasattr(self, '_last_file_check') and self.clock.time() - self._last_file_check > 10:
                     logger.debug(f"Monitored children file does not exist: {self.monitored_children_file}")
-                    self._last_file_check = time.time()
+                    self._last_file_check = self.clock.time()
                 elif not hasattr(self, '_last_file_check'):
-                    self._last_file_check = time.time()
+                    self._last_file_check = self.clock.time()
                     
         except Exception as e:
             logger.error(f"Error checking for new processes: {e}")
     
+    def _check_process_tree(self):
+        """
+        Add descendants of the terminal PIDs that appeared since the last check.
+        """
+        if not self.process_tree or not self.terminals:
+            return
+        try:
+            descendants = set()
+            for terminal in list(self.terminals):
+                descendants.update(self.process_tree.descendants(terminal))
+            new_pids = descendants - self._tree_offered
+            # Forget exited PIDs so a reused PID is offered again
+            self._tree_offered = descendants
+            if new_pids:
+                self.add_processes(sorted(new_pids))
+        except Exception as e:
+            logger.error(f"Error checking the process tree for new processes: {e}")
+    
+    def _timeout_for(self, process_info: Dict[str, Any]) -> float:
+        """Inactivity timeout of a process: its session's, or the monitor's."""
+        return process_info.get('timeout_seconds') or self.timeout_seconds
+    
     def _monitor_loop(self):
         """Main monitoring loop."""
-        # Check for new processes every second
-        last_check_time = time.time()
-        
         while self.monitoring:
             try:
-                current_time = datetime.now()
-                
-                # Check for new processes from PowerShell every second
-                if time.time() - last_check_time >= 1:
-                    self._check_for_new_processes()
-                    last_check_time = time.time()
-                
-                # Check each monitored process
-                pids_to_remove = []
-                for pid in list(self.monitored_processes.keys()):
-                    # Terminal PID is never checked for inactivity
-                    if self.terminal_pid and pid == self.terminal_pid:
-                        continue
-                        
-                    process_name = self.monitored_processes[pid]['name']
-                    # Protected processes are never checked for inactivity
-                    if self.is_protected_process(process_name):
-                        continue
-                        
-                    is_active = self._is_process_active(pid)
-                    
-                    # Prepare process info for callback
-                    process_info = self.monitored_processes[pid]
-                    cpu_percent = 0
-                    try:
-                        cpu_percent = process_info['process'].cpu_percent()
-                    except:
-                        pass
-                    
-                    memory_mb = 0
-                    try:
-                        memory_mb = process_info['process'].memory_info().rss / (1024 * 1024)
-                    except:
-                        pass
-                    
-                    process_data = {
-                        'name': process_info['name'],
-                        'cpu': round(cpu_percent, 2),
-                        'memory': round(memory_mb, 2),
-                        'last_active': process_info['last_activity_time'].strftime('%H:%M:%S'),
-                        'inactive_time': round((current_time - process_info['last_activity_time']).total_seconds(), 2)
-                    }
-                    
-                    # Call status callback if set
-                    if self.process_status_callback:
-                        try:
-                            self.process_status_callback(pid, is_active, process_data)
-                        except Exception as e:
-                            logger.error(f"Error in process status callback: {e}")
-                    
-                    if not is_active:
-                        # Check if timeout has been reached, but respect grace period for new processes
-                        last_activity = process_info['last_activity_time']
-                        start_time = process_info.get('start_time', last_activity)
-                        grace_period = process_info.get('grace_period_seconds', 0)
-                        
-                        # Calculate time since process started
-                        time_since_start = (current_time - start_time).total_seconds()
-                        
-                        # Only check for inactivity after grace period has passed
-                        if time_since_start > grace_period:
-                            inactive_duration = current_time - last_activity
-                            
-                            if inactive_duration.total_seconds() >= self.timeout_seconds:
-                                logger.info(f"Process {pid} ({process_info['name']}) has been inactive for {inactive_duration.total_seconds():.1f}s (started {time_since_start:.1f}s ago), terminating")
-                                self._terminate_process(pid)
-                                pids_to_remove.append(pid)
-                            else:
-                                # Show countdown for processes approaching termination
-                                remaining_time = self.timeout_seconds - inactive_duration.total_seconds()
-                                if remaining_time <= 5:
-                                    logger.info(f"Process {pid} ({process_info['name']}) will be terminated in {remaining_time:.1f}s")
-                        else:
-                            # Still in grace period
-                            remaining_grace = grace_period - time_since_start
-                            if remaining_grace <= 2:  # Only log when grace period is almost over
-                                logger.info(f"Process {pid} ({process_info['name']}) still in grace period ({remaining_grace:.1f}s remaining)")
-                
-                # Remove terminated processes
-                for pid in pids_to_remove:
-                    # Notify main application about process termination if it wasn't already notified
-                    if self.process_termination_callback and pid in self.monitored_processes:
-                        try:
-                            self.process_termination_callback(pid)
-                        except Exception as e:
-                            logger.error(f"Error in process termination callback for PID {pid}: {e}")
-                    self.remove_process(pid)
+                self._monitor_tick()
                 
                 # Sleep for a short interval before next check
-                time.sleep(0.5)
+                self.clock.sleep(self._current_tick_interval())
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(1)
+                self.clock.sleep(1)
+    
+    def run_for(self, duration_seconds: float):
+        """
+        Run monitoring ticks synchronously on the calling thread.
+        
+        With a FakeClock this advances virtual time only, so long monitoring
+        runs finish as fast as the detection code allows.
+        
+        Args:
+            duration_seconds: How long to monitor, measured on the monitor's clock
+        """
+        deadline = self.clock.time() + duration_seconds
+        while self.clock.time() < deadline:
+            try:
+                self._monitor_tick()
+            except Exception as e:
+                logger.error(f"Error in monitoring loop: {e}")
+            self.clock.sleep(self._current_tick_interval())
+    
+    def _current_tick_interval(self) -> float:
+        """Interval between ticks, lengthened while the load governor is shedding."""
+        if self.load_governor:
+            return self.tick_interval * self.load_governor.interval_multiplier
+        return self.tick_interval
+    
+    def _monitor_tick(self):
+        """Run one monitoring pass over all monitored processes."""
+        tick_started = time.perf_counter()
+        tick_cpu_started = time.thread_time()
+        try:
+            self._run_tick()
+        finally:
+            self._tick_count += 1
+            if self.load_governor:
+                self.load_governor.record_tick(tick_started, time.perf_counter(),
+                                               time.thread_time() - tick_cpu_started)
+    
+    def _run_tick(self):
+        """Check for new processes and evaluate every monitored process once."""
+        current_time = self.clock.now()
+        governor = self.load_governor
+        
+        # Check for new processes from PowerShell every second
+        children_poll_interval = governor.interval_multiplier if governor else 1
+        if self.clock.time() - self._last_children_check >= children_poll_interval:
+            self._check_for_new_processes()
+            self._check_process_tree()
+            self._last_children_check = self.clock.time()
+        
+        # Pick the processes to check this tick
+        pids_to_check = []
+        with self._lock:
+            monitored = list(self.monitored_processes.items())
+        for pid, process_info in monitored:
+            # Terminal PID is never checked for inactivity
+            if self.is_terminal_pid(pid):
+                continue
+                
+            process_name = process_info['name']
+            # Protected processes are never checked for inactivity
+            if self.is_protected_process(process_name):
+                continue
+            
+            # Under load, sample processes far from their deadline less often
+            if governor:
+                timeout_seconds = self._timeout_for(process_info)
+                inactive_seconds = (current_time - process_info['last_activity_time']).total_seconds()
+                if not governor.should_sample(self._tick_count, pid, timeout_seconds - inactive_seconds,
+                                              timeout_seconds):
+                    self.samples_skipped += 1
+                    continue
+            pids_to_check.append(pid)
+        
+        # Measure them all in one pass; the activity rules and the status callback share the samples
+        samples = self.metrics_sampler.sample(
+            pids_to_check, with_connections=not governor or governor.sample_connections)
+        
+        # Check each monitored process
+        pids_to_remove = []
+        for pid in pids_to_check:
+            process_info = self.monitored_processes.get(pid)
+            if process_info is None:
+                continue  # Removed from another thread since it was picked
+            sample = samples.get(pid)
+            is_active = self._is_process_active(pid, sample)
+            
+            # Prepare process info for callback
+            cpu_percent = sample.cpu_percent if sample else 0
+            memory_mb = sample.rss / (1024 * 1024) if sample else 0
+            
+            process_data = {
+                'name': process_info['name'],
+                'cpu': round(cpu_percent, 2),
+                'memory': round(memory_mb, 2),
+                'connections': process_info['last_connections'],
+                'last_active': process_info['last_activity_time'].strftime('%H:%M:%S'),
+                'inactive_time': round((current_time - process_info['last_activity_time']).total_seconds(), 2),
+                'session_pid': process_info.get('terminal_pid')
+            }
+            runaway_action = process_info.pop('runaway_action', None)
+            if self.runaway_detector:
+                process_data['runaway'] = self.runaway_detector.throttle_level(pid) or runaway_action
+                process_data['runaway_action'] = runaway_action
+            
+            # Call status callback if set
+            if self.process_status_callback:
+                try:
+                    self.process_status_callback(pid, is_active, process_data)
+                except Exception as e:
+                    logger.error(f"Error in process status callback: {e}")
+            
+            # Runaway processes that exhausted their throttling are terminated
+            if runaway_action == runaway_detector.ACTION_TERMINATE:
+                logger.info(f"Process {pid} ({process_info['name']}) is a runaway, terminating")
+                self._terminate_process(pid)
+                pids_to_remove.append(pid)
+                continue
+            
+            # Idle processes are candidates for memory reclamation
+            process_info['idle'] = False
+            
+            if not is_active:
+                # Check if timeout has been reached, but respect grace period for new processes
+                timeout_seconds = self._timeout_for(process_info)
+                timed_out, inactive_seconds, time_since_start = check_inactivity(
+                    process_info, current_time, timeout_seconds)
+                grace_period = process_info.get('grace_period_seconds', 0)
+                
+                # Only check for inactivity after grace period has passed
+                if time_since_start > grace_period:
+                    process_info['idle'] = True
+                    if timed_out and (process_info.get('idle_action') or self.idle_action) == IDLE_ACTION_SUSPEND:
+                        logger.info(f"Process {pid} ({process_info['name']}) has been inactive for {inactive_seconds:.1f}s (started {time_since_start:.1f}s ago), suspending")
+                        self._suspend_process(pid)
+                    elif timed_out:
+                        logger.info(f"Process {pid} ({process_info['name']}) has been inactive for {inactive_seconds:.1f}s (started {time_since_start:.1f}s ago), terminating")
+                        self._terminate_process(pid)
+                        pids_to_remove.append(pid)
+                    else:
+                        # Show countdown for processes approaching termination
+                        remaining_time = timeout_seconds - inactive_seconds
+                        if remaining_time <= 5:
+                            logger.info(f"Process {pid} ({process_info['name']}) will be terminated in {remaining_time:.1f}s")
+                else:
+                    # Still in grace period
+                    remaining_grace = grace_period - time_since_start
+                    if remaining_grace <= 2:  # Only log when grace period is almost over
+                        logger.info(f"Process {pid} ({process_info['name']}) still in grace period ({remaining_grace:.1f}s remaining)")
+        
+        # Remove terminated processes
+        for pid in pids_to_remove:
+            # Notify main application about process termination if it wasn't already notified
+            if self.process_termination_callback and pid in self.monitored_processes:
+                try:
+                    self.process_termination_callback(pid)
+                except Exception as e:
+                    logger.error(f"Error in process termination callback for PID {pid}: {e}")
+            self.remove_process(pid)
+        
+        # Terminate processes that stayed suspended past the second timeout
+        if self.suspended_processes:
+            self._check_suspended_processes(current_time)
+        
+        # Reclaim memory from the largest idle processes if the host is short on RAM
+        if self.memory_reclaimer:
+            self.memory_reclaimer.check(self)
 
 def main():
     """Main function for standalone execution."""
@@ -475,10 +1011,41 @@ def main():
     parser = argparse.ArgumentParser(description="Monitor and terminate inactive processes")
     parser.add_argument("--timeout", type=int, default=30, help="Inactivity timeout in seconds (default: 30)")
     parser.add_argument("--pid", type=int, help="PID of process to monitor")
+    parser.add_argument("--record-trace", metavar="PATH", help="Record sampled metrics to a binary trace file")
+    parser.add_argument("--load-shedding", action="store_true", help="Step down to cheaper sampling when ticks exceed their budget")
+    parser.add_argument("--suspend", action="store_true", help="Suspend idle processes instead of terminating them")
+    parser.add_argument("--suspend-timeout", type=float, default=DEFAULT_SUSPEND_TIMEOUT_SECONDS,
+                        help=f"Seconds a suspended process is kept before termination (default: {DEFAULT_SUSPEND_TIMEOUT_SECONDS})")
+    parser.add_argument("--runaway-cpu", type=float, metavar="PERCENT",
+                        help="Throttle processes whose CPU stays above PERCENT (renice, restrict affinity, then terminate)")
+    parser.add_argument("--runaway-seconds", type=float, default=120,
+                        help="How long CPU must stay above --runaway-cpu (default: 120)")
+    parser.add_argument("--reclaim-below", type=float, metavar="PERCENT",
+                        help="Reclaim idle processes, largest first, when available memory drops below PERCENT")
+    parser.add_argument("--reclaim-until", type=float, metavar="PERCENT",
+                        help="Stop reclaiming once available memory is back above PERCENT (default: reclaim-below + 5)")
     
     args = parser.parse_args()
+    configure_logging()
     
-    monitor = InactiveProcessMonitor(timeout_seconds=args.timeout)
+    monitor = InactiveProcessMonitor(timeout_seconds=args.timeout,
+                                     idle_action=IDLE_ACTION_SUSPEND if args.suspend else IDLE_ACTION_TERMINATE,
+                                     suspend_timeout_seconds=args.suspend_timeout)
+    recorder = None
+    if args.record_trace:
+        from metric_trace import MetricTraceRecorder
+        recorder = MetricTraceRecorder(args.record_trace)
+        monitor.set_trace_recorder(recorder)
+    if args.load_shedding:
+        from load_governor import LoadGovernor
+        monitor.set_load_governor(LoadGovernor(tick_budget_seconds=monitor.tick_interval))
+    if args.runaway_cpu is not None:
+        monitor.set_runaway_detector(runaway_detector.RunawayDetector(cpu_threshold=args.runaway_cpu,
+                                                                      sustained_seconds=args.runaway_seconds))
+    if args.reclaim_below is not None:
+        from memory_reclaimer import MemoryReclaimer
+        reclaim_until = args.reclaim_until if args.reclaim_until is not None else args.reclaim_below + 5
+        monitor.set_memory_reclaimer(MemoryReclaimer(args.reclaim_below, reclaim_until))
     monitor.start_monitoring()
     
     if args.pid:
@@ -491,6 +1058,8 @@ def main():
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
         monitor.stop_monitoring()
+        if recorder:
+            recorder.close()
         sys.exit(0)
 
 if __name__ == "__main__":
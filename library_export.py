@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Library Export
+Bulk, machine-readable export of the process library and its metric history as
+JSON Lines, CSV or a compact columnar file. Rows are streamed from the library
+database through a separate read connection (the database is in WAL mode, so
+the GUI keeps writing while an export runs), and numbers are exported as
+numbers rather than the dashboard's display strings.
+
+The columnar format (.ipmcol) is a zip archive holding schema.json and one
+little-endian binary array per column:
+    int, bool, float, time -> <name>.bin (int64, int8, float64, float64 Unix time)
+    text                   -> <name>.offsets (int64, rows + 1) and <name>.data (UTF-8)
+    nullable columns       -> <name>.valid (one byte per row, 0 = null), only if a null occurs
+"""
+
+import array
+import csv
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from process_library import DEFAULT_DB_PATH, METRIC_FIELDS
+
+FORMAT_JSONL = 'jsonl'
+FORMAT_CSV = 'csv'
+FORMAT_COLUMNAR = 'ipmcol'
+FORMATS = (FORMAT_JSONL, FORMAT_CSV, FORMAT_COLUMNAR)
+
+COLUMNAR_VERSION = 1
+FETCH_BATCH_ROWS = 5000
+
+# (column, type) for each exported table
+ENTRY_COLUMNS = [
+    ('id', 'int'), ('pid', 'int'), ('parent_pid', 'int'), ('process_name', 'text'), ('status', 'text'),
+    ('start_time', 'time'), ('end_time', 'time'), ('auto_execute', 'bool'), ('timeout', 'int'),
+    ('inactive_seconds', 'float'),
+    ('cpu_percent', 'float'), ('memory_mb', 'float'), ('network_connections', 'int'), ('power_w', 'float'),
+    ('session_pid', 'int'),
+]
+SAMPLE_COLUMNS = [
+    ('entry_id', 'int'), ('pid', 'int'), ('time', 'time'),
+    ('cpu_percent', 'float'), ('memory_mb', 'float'), ('network_connections', 'int'), ('power_w', 'float'),
+]
+
+_ENTRY_SQL = "SELECT " + ", ".join(name for name, _ in ENTRY_COLUMNS) + " FROM processes ORDER BY id"
+_SAMPLE_SQL = ("SELECT s.entry_id, p.pid, s.time, " + ", ".join(f"s.{name}" for name in METRIC_FIELDS) +
+               " FROM metric_samples s JOIN processes p ON p.id = s.entry_id ORDER BY s.entry_id, s.time")
+
+_ARRAY_TYPECODES = {'int': 'q', 'bool': 'b', 'float': 'd', 'time': 'd'}
+
+
+def format_for_path(path: str) -> str:
+    """Pick the export format from a file extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return FORMAT_JSONL
+    if extension in FORMATS:
+        return extension
+    raise ValueError(f"Cannot tell the export format from '{path}'; use .jsonl, .csv or .ipmcol")
+
+
+def history_path_for(path: str) -> str:
+    """Path of the metric history file exported next to a library file."""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_history{extension}"
+
+
+def open_library(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Open a read-only connection to a library database."""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"No process library at {db_path}")
+    return sqlite3.connect(pathlib.Path(os.path.abspath(db_path)).as_uri() + "?mode=ro", uri=True)
+
+
+def iter_rows(conn: sqlite3.Connection, sql: str) -> Iterator[Tuple]:
+    """Stream query rows in batches."""
+    cursor = conn.execute(sql)
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH_ROWS)
+        if not rows:
+            return
+        yield from rows
+
+
+def _iso(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat(timespec='milliseconds') if value is not None else None
+
+
+def _converters(columns: Sequence[Tuple[str, str]]) -> List:
+    """Per-column converters to JSON/CSV values (times become ISO 8601 strings)."""
+    converters = []
+    for _, column_type in columns:
+        if column_type == 'time':
+            converters.append(_iso)
+        elif column_type == 'bool':
+            converters.append(lambda value: bool(value) if value is not None else None)
+        else:
+            converters.append(None)
+    return converters
+
+
+def write_jsonl(rows: Iterator[Tuple], columns: Sequence[Tuple[str, str]], f: TextIO) -> int:
+    """Write rows as JSON Lines, one object per row. Returns the number of rows."""
+    names = [name for name, _ in columns]
+    converters = _converters(columns)
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    count = 0
+    for row in rows:
+        values = [convert(value) if convert else value for convert, value in zip(converters, row)]
+        f.write(dumps(dict(zip(names, values))))
+        f.write('\n')
+        count += 1
+    return count
+
+
+def write_csv(rows: Iterator[Tuple], columns: Sequence[Tuple[str, str]], f: TextIO) -> int:
+    """Write rows as CSV with a header row; nulls are empty fields. Returns the number of rows."""
+    writer = csv.writer(f)
+    writer.writerow([name for name, _ in columns])
+    converters = _converters(columns)
+    count = 0
+    for row in rows:
+        writer.writerow([convert(value) if convert else value for convert, value in zip(converters, row)])
+        count += 1
+    return count
+
+
+def write_columnar(rows: Iterator[Tuple], columns: Sequence[Tuple[str, str]], path: str) -> int:
+    """Write rows in the columnar format described in the module docstring. Returns the number of rows."""
+    data = []
+    for _, column_type in columns:
+        if column_type == 'text':
+            data.append({'offsets': array.array('q', [0]), 'data': bytearray()})
+        else:
+            data.append({'values': array.array(_ARRAY_TYPECODES[column_type])})
+    validity = [bytearray() for _ in columns]
+    has_null = [False] * len(columns)
+
+    count = 0
+    for row in rows:
+        for index, ((_, column_type), value) in enumerate(zip(columns, row)):
+            validity[index].append(value is not None)
+            if value is None:
+                has_null[index] = True
+            column = data[index]
+            if column_type == 'text':
+                if value is not None:
+                    column['data'] += value.encode('utf-8')
+                column['offsets'].append(len(column['data']))
+            elif column_type == 'float' or column_type == 'time':
+                column['values'].append(float('nan') if value is None else value)
+            else:
+                column['values'].append(0 if value is None else int(value))
+        count += 1
+
+    schema = {'format': FORMAT_COLUMNAR, 'version': COLUMNAR_VERSION, 'rows': count, 'columns': []}
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for index, (name, column_type) in enumerate(columns):
+            column = data[index]
+            if column_type == 'text':
+                archive.writestr(f"{name}.offsets", _little_endian(column['offsets']))
+                archive.writestr(f"{name}.data", bytes(column['data']))
+            else:
+                archive.writestr(f"{name}.bin", _little_endian(column['values']))
+            if has_null[index]:
+                archive.writestr(f"{name}.valid", bytes(validity[index]))
+            schema['columns'].append({'name': name, 'type': column_type, 'nullable': has_null[index]})
+        archive.writestr('schema.json', json.dumps(schema, indent=2))
+    return count
+
+
+def read_columnar(path: str) -> Dict[str, List[Any]]:
+    """
+    Read a columnar export back into Python lists.
+
+    Returns:
+        Column name -> values (None for nulls; times as Unix timestamps)
+    """
+    with zipfile.ZipFile(path) as archive:
+        schema = json.loads(archive.read('schema.json'))
+        if schema.get('format') != FORMAT_COLUMNAR or schema.get('version') != COLUMNAR_VERSION:
+            raise ValueError(f"Unsupported columnar file: {path}")
+        result = {}
+        for column in schema['columns']:
+            name, column_type = column['name'], column['type']
+            if column_type == 'text':
+                offsets = _from_little_endian('q', archive.read(f"{name}.offsets"))
+                text = archive.read(f"{name}.data")
+                values = [text[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(schema['rows'])]
+            else:
+                values = list(_from_little_endian(_ARRAY_TYPECODES[column_type], archive.read(f"{name}.bin")))
+                if column_type == 'bool':
+                    values = [bool(value) for value in values]
+            if column['nullable']:
+                valid = archive.read(f"{name}.valid")
+                values = [value if valid[i] else None for i, value in enumerate(values)]
+            result[name] = values
+    return result
+
+
+def _little_endian(values: array.array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array.array:
+    values = array.array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def export_table(conn: sqlite3.Connection, path: str, history: bool = False, fmt: Optional[str] = None) -> int:
+    """
+    Export the library entries (or, with history, the metric samples) to a file.
+
+    Args:
+        conn: Connection to the library database
+        path: Output file
+        history: Export metric history samples instead of entries
+        fmt: FORMAT_JSONL, FORMAT_CSV or FORMAT_COLUMNAR (from the extension if omitted)
+
+    Returns:
+        Number of rows written
+    """
+    fmt = fmt or format_for_path(path)
+    columns = SAMPLE_COLUMNS if history else ENTRY_COLUMNS
+    rows = iter_rows(conn, _SAMPLE_SQL if history else _ENTRY_SQL)
+    if fmt == FORMAT_COLUMNAR:
+        return write_columnar(rows, columns, path)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == FORMAT_CSV:
+            return write_csv(rows, columns, f)
+        return write_jsonl(rows, columns, f)
+
+
+def export_library(db_path: str, path: str, include_history: bool = True,
+                   fmt: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Export the library, and optionally its metric history, from a database file.
+
+    The history goes next to the library file (see history_path_for).
+
+    Returns:
+        Dict with 'entries', 'samples', 'paths' and 'elapsed_seconds'
+    """
+    started = time.perf_counter()
+    result = {'entries': 0, 'samples': 0, 'paths': [path]}
+    conn = open_library(db_path)
+    try:
+        result['entries'] = export_table(conn, path, fmt=fmt)
+        if include_history:
+            history_path = history_path_for(path)
+            result['samples'] = export_table(conn, history_path, history=True, fmt=fmt)
+            result['paths'].append(history_path)
+    finally:
+        conn.close()
+    result['elapsed_seconds'] = time.perf_counter() - started
+    return result
+
+
+def main():
+    """Export the process library from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export the process library as JSON Lines, CSV or columnar data")
+    parser.add_argument("output", help="Output file (.jsonl, .csv or .ipmcol)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"Library database (default: {DEFAULT_DB_PATH})")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from the file extension)")
+    parser.add_argument("--no-history", action="store_true", help="Skip the metric history file")
+
+    args = parser.parse_args()
+
+    try:
+        result = export_library(args.db, args.output, include_history=not args.no_history, fmt=args.format)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        sys.exit(f"Error exporting library: {e}")
+
+    print(f"Exported {result['entries']} entries and {result['samples']} metric samples "
+          f"in {result['elapsed_seconds']:.2f}s to {', '.join(result['paths'])}")
+
+
+if __name__ == "__main__":
+    main()
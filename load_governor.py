@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Load Governor
+Tracks the cost of InactiveProcessMonitor ticks and steps the monitor down to
+cheaper behaviour while it is over budget, recovering once pressure is gone.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shedding levels, each including the ones below it
+LEVEL_NORMAL = 0
+LEVEL_NO_CONNECTIONS = 1  # Skip per-process connection sampling
+LEVEL_SPARSE_SAMPLING = 2  # Sample processes far from their deadline less often
+LEVEL_LARGE_BATCHES = 3  # Run ticks and children-file polls less often so each handles more work
+
+LEVEL_NAMES = {
+    LEVEL_NORMAL: 'normal',
+    LEVEL_NO_CONNECTIONS: 'no_connections',
+    LEVEL_SPARSE_SAMPLING: 'sparse_sampling',
+    LEVEL_LARGE_BATCHES: 'large_batches',
+}
+
+# Processes with more than this fraction of their timeout left are "far" from their deadline
+FAR_FROM_DEADLINE_FRACTION = 0.5
+# At LEVEL_SPARSE_SAMPLING far processes are sampled once every this many ticks
+SPARSE_SAMPLING_STRIDE = 4
+# At LEVEL_LARGE_BATCHES tick and children-file poll intervals are multiplied by this
+LARGE_BATCH_MULTIPLIER = 2
+
+
+class LoadGovernor:
+    def __init__(self, tick_budget_seconds: float = 0.5, cpu_budget_percent: float = 25.0,
+                 escalate_after: int = 3, recover_after: int = 20):
+        """
+        Initialize the load governor.
+
+        Args:
+            tick_budget_seconds: Wall time a single tick may take before it counts as an overrun
+            cpu_budget_percent: Share of one core the monitor thread may use
+            escalate_after: Consecutive pressured ticks before stepping down one level
+            recover_after: Consecutive calm ticks before stepping back up one level
+        """
+        self.tick_budget_seconds = tick_budget_seconds
+        self.cpu_budget_percent = cpu_budget_percent
+        self.escalate_after = escalate_after
+        self.recover_after = recover_after
+        self.level = LEVEL_NORMAL
+        self._pressured_ticks = 0
+        self._calm_ticks = 0
+        self._last_tick_start: Optional[float] = None
+        # Metrics
+        self.ticks = 0
+        self.overruns = 0
+        self.escalations = 0
+        self.recoveries = 0
+        self.last_tick_seconds = 0.0
+        self.max_tick_seconds = 0.0
+        self.monitor_cpu_percent = 0.0
+        self.ticks_per_level = {level: 0 for level in LEVEL_NAMES}
+        self.transitions = deque(maxlen=50)
+
+    def record_tick(self, started: float, finished: float, cpu_seconds: float):
+        """
+        Record the cost of one tick and adjust the shedding level.
+
+        Args:
+            started: perf_counter() value when the tick started
+            finished: perf_counter() value when the tick finished
+            cpu_seconds: CPU time the monitor thread spent in the tick
+        """
+        duration = finished - started
+        # CPU share is measured over the whole period, including the sleep between ticks
+        period = started - self._last_tick_start if self._last_tick_start is not None else duration
+        self._last_tick_start = started
+
+        self.ticks += 1
+        self.ticks_per_level[self.level] += 1
+        self.last_tick_seconds = duration
+        self.max_tick_seconds = max(self.max_tick_seconds, duration)
+        if period > 0:
+            self.monitor_cpu_percent = 100.0 * cpu_seconds / period
+
+        overrun = duration > self.tick_budget_seconds
+        if overrun:
+            self.overruns += 1
+        pressured = overrun or self.monitor_cpu_percent > self.cpu_budget_percent
+        # Only count as calm well under budget, so the level does not flap at the boundary
+        calm = (duration < self.tick_budget_seconds / 2 and
+                self.monitor_cpu_percent < self.cpu_budget_percent / 2)
+
+        if pressured:
+            self._pressured_ticks += 1
+            self._calm_ticks = 0
+            if self._pressured_ticks >= self.escalate_after and self.level < LEVEL_LARGE_BATCHES:
+                self._set_level(self.level + 1, f"tick {duration:.3f}s, monitor CPU {self.monitor_cpu_percent:.1f}%")
+                self.escalations += 1
+                self._pressured_ticks = 0
+        elif calm:
+            self._calm_ticks += 1
+            self._pressured_ticks = 0
+            if self._calm_ticks >= self.recover_after and self.level > LEVEL_NORMAL:
+                self._set_level(self.level - 1, f"{self._calm_ticks} calm ticks")
+                self.recoveries += 1
+                self._calm_ticks = 0
+        else:
+            self._pressured_ticks = 0
+            self._calm_ticks = 0
+
+    def _set_level(self, level: int, reason: str):
+        previous = self.level
+        self.level = level
+        self.transitions.append({
+            'time': time.time(),
+            'from': LEVEL_NAMES[previous],
+            'to': LEVEL_NAMES[level],
+            'reason': reason,
+        })
+        if level > previous:
+            logger.warning(f"Monitor under load, shedding to level {level} ({LEVEL_NAMES[level]}): {reason}")
+        else:
+            logger.info(f"Monitor load recovered, back to level {level} ({LEVEL_NAMES[level]}): {reason}")
+
+    @property
+    def sample_connections(self) -> bool:
+        """Whether per-process connection counts should be sampled."""
+        return self.level < LEVEL_NO_CONNECTIONS
+
+    @property
+    def interval_multiplier(self) -> int:
+        """Factor applied to the tick and children-file poll intervals."""
+        return LARGE_BATCH_MULTIPLIER if self.level >= LEVEL_LARGE_BATCHES else 1
+
+    def should_sample(self, tick: int, pid: int, remaining_seconds: float, timeout_seconds: float) -> bool:
+        """
+        Decide whether a process should be sampled on this tick.
+
+        Args:
+            tick: Monitor tick counter
+            pid: Process ID, used to spread skipped samples across ticks
+            remaining_seconds: Time left before the process would be terminated
+            timeout_seconds: The process's inactivity timeout
+
+        Returns:
+            Boolean indicating if the process should be sampled now
+        """
+        if self.level < LEVEL_SPARSE_SAMPLING:
+            return True
+        if remaining_seconds <= timeout_seconds * FAR_FROM_DEADLINE_FRACTION:
+            return True
+        return (tick + pid) % SPARSE_SAMPLING_STRIDE == 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return a snapshot of the governor's metrics."""
+        return {
+            'level': self.level,
+            'level_name': LEVEL_NAMES[self.level],
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'escalations': self.escalations,
+            'recoveries': self.recoveries,
+            'last_tick_seconds': round(self.last_tick_seconds, 4),
+            'max_tick_seconds': round(self.max_tick_seconds, 4),
+            'monitor_cpu_percent': round(self.monitor_cpu_percent, 1),
+            'ticks_per_level': {LEVEL_NAMES[level]: count for level, count in self.ticks_per_level.items()},
+            'transitions': list(self.transitions),
+        }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Log Index
+Incremental inverted index over the library's logs. Lines are tokenized as
+they are stored, and each token's postings are grouped by library entry id as
+ascending arrays of line numbers (the line numbers used by PidLogStore), so a
+search intersects a few small arrays instead of rescanning any log. Matching
+lines are read back from the log store only for the hits that are shown.
+"""
+
+import array
+import bisect
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_SEARCH_LIMIT = 200
+# Tokens longer than this are not indexed (base64 blobs, long paths)
+MAX_TOKEN_LENGTH = 64
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+Hit = Tuple[int, int]  # (entry id, line number)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of a line or query."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if len(token) <= MAX_TOKEN_LENGTH]
+
+
+class LogIndex:
+    def __init__(self):
+        """Create an empty index."""
+        # Token -> entry id -> ascending line numbers containing the token
+        self._postings: Dict[str, Dict[int, array.array]] = {}
+        # Entry id -> tokens it has postings under, so an entry can be dropped without a full scan
+        self._entry_tokens: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        # Metrics
+        self.lines_indexed = 0
+
+    def add_lines(self, entry_id: int, first_line: int, lines: Iterable[str]):
+        """
+        Index lines appended to an entry's log. Safe to call from any thread.
+
+        Args:
+            entry_id: Library entry id
+            first_line: Line number of the first line
+            lines: The lines, in order
+        """
+        # Group the batch's line numbers by token first, so each posting list is extended once
+        batch: Dict[str, List[int]] = {}
+        line_number = first_line
+        count = 0
+        for line in lines:
+            for token in set(_TOKEN_PATTERN.findall(line.lower())):
+                if len(token) <= MAX_TOKEN_LENGTH:
+                    numbers = batch.get(token)
+                    if numbers is None:
+                        batch[token] = [line_number]
+                    else:
+                        numbers.append(line_number)
+            line_number += 1
+            count += 1
+
+        with self._lock:
+            entry_tokens = self._entry_tokens.setdefault(entry_id, set())
+            for token, numbers in batch.items():
+                by_entry = self._postings.get(token)
+                if by_entry is None:
+                    by_entry = self._postings[token] = {}
+                postings = by_entry.get(entry_id)
+                if postings is None:
+                    by_entry[entry_id] = array.array('I', numbers)
+                    entry_tokens.add(token)
+                else:
+                    # A line continued after a partial write is already present
+                    if postings and postings[-1] >= numbers[0]:
+                        numbers = [number for number in numbers if number > postings[-1]]
+                    postings.extend(numbers)
+            self.lines_indexed += count
+
+    def delete(self, entry_id: int):
+        """Drop an entry's postings."""
+        with self._lock:
+            for token in self._entry_tokens.pop(entry_id, ()):
+                by_entry = self._postings.get(token)
+                if by_entry is not None:
+                    by_entry.pop(entry_id, None)
+                    if not by_entry:
+                        del self._postings[token]
+
+    def search(self, query: str, entry_id: Optional[int] = None, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Hit]:
+        """
+        Find lines containing every word of a query.
+
+        Args:
+            query: Words to match (case-insensitive, whole words)
+            entry_id: Only search this entry's log
+            limit: Maximum number of hits
+
+        Returns:
+            (entry id, line number) hits, most recently indexed entry first, lines in order
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        with self._lock:
+            lists = [self._postings.get(token) for token in tokens]
+            if any(by_entry is None for by_entry in lists):
+                return []
+            # Drive the intersection from the token with the fewest entries
+            lists.sort(key=len)
+            smallest, others = lists[0], lists[1:]
+            entry_ids = [entry_id] if entry_id is not None else list(reversed(list(smallest)))
+            hits: List[Hit] = []
+            for candidate in entry_ids:
+                postings = smallest.get(candidate)
+                if postings is None:
+                    continue
+                other_postings = [by_entry.get(candidate) for by_entry in others]
+                if any(other is None for other in other_postings):
+                    continue
+                # Walk the shortest list and binary-search the rest
+                other_postings.append(postings)
+                other_postings.sort(key=len)
+                shortest, rest = other_postings[0], other_postings[1:]
+                for line in shortest:
+                    if all(_contains(other, line) for other in rest):
+                        hits.append((candidate, line))
+                        if len(hits) >= limit:
+                            return hits
+            return hits
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return the index size."""
+        with self._lock:
+            return {
+                'tokens': len(self._postings),
+                'entries': len(self._entry_tokens),
+                'lines_indexed': self.lines_indexed,
+            }
+
+
+def _contains(postings: array.array, line: int) -> bool:
+    index = bisect.bisect_left(postings, line)
+    return index < len(postings) and postings[index] == line
+
+
+def read_hits(hits: Iterable[Hit], log_store) -> List[Tuple[int, int, str]]:
+    """
+    Read the text of search hits from a PidLogStore.
+
+    Returns:
+        (entry id, line number, line text without its newline) for each hit still in the store
+    """
+    results = []
+    for entry_id, line in hits:
+        lines = log_store.read_lines(entry_id, line, 1)
+        if lines:
+            results.append((entry_id, line, lines[0].rstrip('\r\n')))
+    return results
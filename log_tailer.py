@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Log Tailer
+Follows a growing log file through a persistent handle and delivers complete
+lines in batches. On Linux it sleeps on inotify events; elsewhere it falls back
+to polling the file's size. Truncation and rotation are detected from the
+file's size and inode, and the file may not exist yet when tailing starts.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class _Inotify:
+    """Minimal ctypes binding watching one directory for changes to one file name."""
+
+    def __init__(self, directory: str, file_name: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch the directory rather than the file so creation and rotation are seen too
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.file_name = os.fsencode(file_name)
+
+    def read_events(self) -> bool:
+        """Drain pending events; return True if any concerned the watched file."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return relevant
+            if not data:
+                return relevant
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, _, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b'\0')
+                offset += name_length
+                if name == self.file_name:
+                    relevant = True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LogTailer:
+    def __init__(self, path: str, on_lines: Callable[[List[str]], None], poll_interval_seconds: float = 0.5,
+                 use_inotify: bool = True, encoding: str = 'utf-8'):
+        """
+        Initialize the tailer.
+
+        Args:
+            path: Log file to follow
+            on_lines: Called from the tailer thread with each batch of complete lines (newlines kept)
+            poll_interval_seconds: Polling interval when inotify is unavailable
+            use_inotify: Use inotify on Linux when available
+            encoding: Encoding of the log file
+        """
+        self.path = path
+        self.on_lines = on_lines
+        self.poll_interval_seconds = poll_interval_seconds
+        self.use_inotify = use_inotify and sys.platform.startswith('linux')
+        self.encoding = encoding
+
+        self._file = None
+        self._inode = None
+        self._position = 0
+        self._partial = b''
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._wake_read = self._wake_write = None
+        # Metrics
+        self.lines_delivered = 0
+        self.rotations = 0
+        self.truncations = 0
+
+    def start(self):
+        """Start following the file on a background thread."""
+        self.stop()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop following, delivering a trailing line that has no newline yet."""
+        self._stop.set()
+        if self._wake_write is not None:
+            try:
+                os.write(self._wake_write, b'x')
+            except OSError:
+                pass  # The thread already closed the pipe on its way out
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _run(self):
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(os.path.dirname(os.path.abspath(self.path)), os.path.basename(self.path))
+                self._wake_read, self._wake_write = os.pipe()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable, polling {self.path}: {e}")
+                inotify = None
+        try:
+            while not self._stop.is_set():
+                self.poll()
+                if inotify:
+                    # Wake on file events or stop(); the timeout only guards against missed events
+                    readable, _, _ = select.select([inotify.fd, self._wake_read], [], [], 5.0)
+                    if inotify.fd in readable:
+                        inotify.read_events()
+                else:
+                    self._stop.wait(self.poll_interval_seconds)
+            self.poll()
+            self._flush_partial()
+        except Exception as e:
+            logger.error(f"Error tailing {self.path}: {e}")
+        finally:
+            if inotify:
+                inotify.close()
+                os.close(self._wake_read)
+                os.close(self._wake_write)
+                self._wake_read = self._wake_write = None
+            self._close()
+
+    def poll(self):
+        """Read whatever was appended since the last call and deliver complete lines."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Deleted; finish the old handle but wait for the file to reappear
+            if self._file:
+                self._read_available()
+            return
+
+        if self._file is None or stat.st_ino != self._inode:
+            if self._file is not None:
+                # Rotated: drain the old file before switching to the new one
+                self._read_available()
+                self._flush_partial()
+                self._close()
+                self.rotations += 1
+                logger.info(f"{self.path} was rotated, reopening")
+            self._open()
+        elif stat.st_size < self._position:
+            self._file.seek(0)
+            self._position = 0
+            self._partial = b''
+            self.truncations += 1
+            logger.info(f"{self.path} was truncated, reading from the start")
+        elif stat.st_size == self._position:
+            return
+
+        self._read_available()
+
+    def _open(self):
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._position = 0
+        self._partial = b''
+
+    def _close(self):
+        if self._file:
+            self._file.close()
+        self._file = None
+        self._inode = None
+
+    def _read_available(self):
+        if not self._file:
+            return
+        chunks = []
+        while True:
+            chunk = self._file.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        if not chunks:
+            return
+        data = self._partial + b''.join(chunks)
+        self._position = self._file.tell()
+        end = data.rfind(b'\n') + 1
+        self._partial = data[end:]
+        if end:
+            self._deliver(data[:end])
+
+    def _flush_partial(self):
+        if self._partial:
+            data, self._partial = self._partial, b''
+            self._deliver(data)
+
+    def _deliver(self, data: bytes):
+        text = data.decode(self.encoding, errors='replace').replace('\r\n', '\n')
+        lines = text.splitlines(keepends=True)
+        self.lines_delivered += len(lines)
+        try:
+            self.on_lines(lines)
+        except Exception as e:
+            logger.error(f"Log line consumer failed: {e}")
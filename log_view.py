@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Log View
+Bounded terminal log pane. Background threads append text; the Tk thread
+flushes it in at most one insert per frame, trims old lines in bulk once the
+line cap is exceeded, and only auto-scrolls while the view is at the bottom.
+A flush is only scheduled while text is waiting, so an idle pane never wakes
+the Tk loop.
+"""
+
+import threading
+import tkinter as tk
+from tkinter import scrolledtext
+from typing import List
+
+# Lines kept in the widget, and how far past the cap it may grow before a bulk trim
+DEFAULT_MAX_LINES = 5000
+DEFAULT_TRIM_SLACK = 500
+# Flush interval, roughly one frame
+FLUSH_INTERVAL_MS = 33
+
+
+class LogView:
+    def __init__(self, parent, max_lines: int = DEFAULT_MAX_LINES, trim_slack: int = DEFAULT_TRIM_SLACK,
+                 **text_options):
+        """
+        Create the log pane.
+
+        Args:
+            parent: Parent widget
+            max_lines: Maximum number of lines retained
+            trim_slack: Extra lines allowed before old lines are trimmed in one go
+            **text_options: Options passed to the ScrolledText widget
+        """
+        self.max_lines = max_lines
+        self.trim_slack = trim_slack
+        self.text = scrolledtext.ScrolledText(parent, state=tk.DISABLED, **text_options)
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._line_count = 0
+        self._flush_id = None
+        # Set while a flush is scheduled, and once the widget is gone; guarded by _lock
+        self._flush_pending = False
+        self._destroyed = False
+        self.follow = True  # Whether the view sticks to the newest line
+        self.text.bind('<Destroy>', self._on_destroy)
+
+    def pack(self, **kwargs):
+        self.text.pack(**kwargs)
+
+    def append(self, content: str):
+        """
+        Queue text for display. Safe to call from any thread.
+
+        Args:
+            content: Text to append
+        """
+        if not content:
+            return
+        with self._lock:
+            self._pending.append(content)
+            schedule = not self._flush_pending and not self._destroyed
+            self._flush_pending = True
+        # Scheduled outside the lock: from another thread, after() waits for the Tk thread
+        if schedule:
+            self._flush_id = self.text.after(FLUSH_INTERVAL_MS, self._flush)
+
+    def clear(self):
+        """Remove all text, including text not yet displayed."""
+        with self._lock:
+            self._pending = []
+        self.text.config(state=tk.NORMAL)
+        self.text.delete('1.0', tk.END)
+        self.text.config(state=tk.DISABLED)
+        self._line_count = 0
+
+    def get_text(self) -> str:
+        """Return the retained text (at most max_lines lines)."""
+        return self.text.get('1.0', 'end-1c')
+
+    def _flush(self):
+        """Insert everything queued since the last frame in one go (runs on the Tk thread)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._flush_pending = False
+        self._flush_id = None
+        if pending:
+            self._insert(''.join(pending))
+
+    def _insert(self, content: str):
+        # Follow new output only if the user has not scrolled up
+        self.follow = self.text.yview()[1] >= 0.999
+        new_lines = content.count('\n')
+        if new_lines > self.max_lines:
+            # The batch alone overflows the cap; drop its head before touching the widget
+            content = content[self._nth_newline_from_end(content, self.max_lines) + 1:]
+            new_lines = self.max_lines
+            self.text.config(state=tk.NORMAL)
+            self.text.delete('1.0', tk.END)
+            self._line_count = 0
+        else:
+            self.text.config(state=tk.NORMAL)
+
+        self.text.insert(tk.END, content)
+        self._line_count += new_lines
+        if self._line_count > self.max_lines + self.trim_slack:
+            excess = self._line_count - self.max_lines
+            self.text.delete('1.0', f'{excess + 1}.0')
+            self._line_count -= excess
+        self.text.config(state=tk.DISABLED)
+        if self.follow:
+            self.text.see(tk.END)
+
+    @staticmethod
+    def _nth_newline_from_end(content: str, n: int) -> int:
+        """Index of the newline that starts the last n complete lines of content."""
+        index = len(content)
+        if content.endswith('\n'):
+            index -= 1
+        for _ in range(n):
+            index = content.rfind('\n', 0, index)
+        return index
+
+    def _on_destroy(self, event):
+        if event.widget is not self.text:
+            return
+        with self._lock:
+            self._destroyed = True
+        if self._flush_id:
+            self.text.after_cancel(self._flush_id)
+            self._flush_id = None
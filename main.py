@@ -1,17 +1,26 @@
 import tkinter as tk
-from tkinter import scrolledtext, messagebox, ttk, filedialog
+from tkinter import messagebox, ttk, filedialog
 import subprocess
 import os
+import shutil
 import threading
-import time
-import psutil
 from datetime import datetime
 import sys
+import time
 
-import inactive_process_monitor
+import auto_terminator_service
+import process_table
+import virtual_list
+import log_view
+import report_writer
+import log_index
+import sparkline_view
+
+# Log lines loaded per page in the PID report viewer
+REPORT_PAGE_LINES = 1000
 
 class AutoTerminatorManager:
-    def __init__(self, master):
+    def __init__(self, master, service=None):
         self.master = master
         master.title("🚀 Auto-Terminator Dashboard")
         master.geometry("1000x800")
@@ -20,9 +29,8 @@ class AutoTerminatorManager:
         # Configure style
         self.setup_styles()
 
-        self.ps_process = None
-        self.psutil_process = None
-        self.log_file_path = os.path.join(os.environ["TEMP"], "auto_terminator.log")
+        # Sessions, the library, monitoring and reports live in the service; this window is one client of it
+        self.service = service or auto_terminator_service.AutoTerminatorService()
         
         # Auto-execution flag
         self.auto_execute_ai = tk.BooleanVar(value=False)
@@ -30,25 +38,30 @@ class AutoTerminatorManager:
 
         
         # Inactive process monitoring
-        self.inactive_process_monitor = None
         self.inactive_monitor_enabled = tk.BooleanVar(value=False)
         self.inactive_timeout_var = tk.IntVar(value=30)
+        self.memory_reclaim_enabled = tk.BooleanVar(value=False)
+        self.suspend_idle_enabled = tk.BooleanVar(value=False)
+        self.runaway_throttle_enabled = tk.BooleanVar(value=False)
         
         # Process monitoring process
         self.process_monitor_process = None
         
-        # Process library to track all PIDs
-        self.process_library = {}
-        self.current_session_start_time = None
-        
-        # Active/Inactive processes tracking
-        self.active_processes = {}
-        self.inactive_processes = {}
+        # The service's stores, read by the library and report windows
+        self.process_library = self.service.process_library
+        self.pid_logs = self.service.pid_logs
+        self.metric_histories = self.service.metric_histories
+        self.log_index = self.service.log_index
 
         self.create_widgets()
-        self.update_log_thread = None
-        self.stop_update_log = threading.Event()
+        # Session log lines reach the log pane through a service listener (queued, inserted per frame)
+        self.service.add_listener(self._on_service_event)
         self.update_resources_id = None # To store after method ID for cancellation
+        self.last_snapshot_time = None
+        # Session whose dashboard, log and Stop button the window shows (several may run at once)
+        self.selected_session_pid = None
+        # Optional local API server sharing this window's service (see --api-port)
+        self.api_server = None
 
     def setup_styles(self):
         """Configure modern styling"""
@@ -82,6 +95,18 @@ class AutoTerminatorManager:
                            foreground='white',
                            font=('Segoe UI', 10, 'bold'))
         
+        self.style.configure('Process.Treeview',
+                           background='#1e1e1e',
+                           fieldbackground='#1e1e1e',
+                           foreground='#00ff00',
+                           font=('Consolas', 9),
+                           borderwidth=0)
+        
+        self.style.configure('Process.Treeview.Heading',
+                           background=self.colors['card_bg'],
+                           foreground=self.colors['fg'],
+                           font=('Segoe UI', 9, 'bold'))
+        
         self.style.configure('Danger.TButton',
                            background=self.colors['danger'],
                            foreground='white',
@@ -164,6 +189,26 @@ class AutoTerminatorManager:
         tk.Label(inactive_frame, text="seconds", bg=self.colors['card_bg'], 
                 fg=self.colors['fg'], font=('Segoe UI', 10)).pack(side=tk.LEFT)
         
+        # Resume suspended processes (the PIDs typed, or all when empty)
+        self.resume_pids_button = tk.Button(inactive_frame, text="▶ Resume", command=self.resume_suspended_processes,
+                                          bg=self.colors['accent'], fg='white', font=('Segoe UI', 8),
+                                          relief='flat', bd=0, padx=10, pady=4, cursor='hand2')
+        self.resume_pids_button.pack(side=tk.RIGHT, padx=(5, 0))
+        
+        # Manual PID addition
+        self.add_pids_button = tk.Button(inactive_frame, text="➕ Add", command=self.add_pids_to_monitor,
+                                       bg=self.colors['info'], fg='white', font=('Segoe UI', 8),
+                                       relief='flat', bd=0, padx=10, pady=4, cursor='hand2')
+        self.add_pids_button.pack(side=tk.RIGHT)
+        
+        self.add_pids_entry = tk.Entry(inactive_frame, font=('Segoe UI', 10), width=18,
+                                     bg='#4a4a4a', fg='white', insertbackground='white',
+                                     relief='flat', bd=5)
+        self.add_pids_entry.pack(side=tk.RIGHT, padx=(5, 5))
+        
+        tk.Label(inactive_frame, text="PIDs:", bg=self.colors['card_bg'], 
+                fg=self.colors['fg'], font=('Segoe UI', 10)).pack(side=tk.RIGHT)
+        
         # Auto-execution checkbox
         self.auto_exec_checkbox = tk.Checkbutton(
             control_frame,
@@ -179,6 +224,51 @@ class AutoTerminatorManager:
         )
         self.auto_exec_checkbox.pack(anchor=tk.W, pady=(10, 0))
         
+        # Memory-pressure reclamation checkbox
+        self.memory_reclaim_checkbox = tk.Checkbutton(
+            control_frame,
+            text="Reclaim memory from idle processes when RAM is low",
+            variable=self.memory_reclaim_enabled,
+            bg=self.colors['card_bg'],
+            fg=self.colors['fg'],
+            selectcolor=self.colors['card_bg'],
+            activebackground=self.colors['card_bg'],
+            activeforeground=self.colors['fg'],
+            font=('Segoe UI', 10),
+            highlightthickness=0
+        )
+        self.memory_reclaim_checkbox.pack(anchor=tk.W)
+        
+        # Suspend-instead-of-terminate checkbox
+        self.suspend_idle_checkbox = tk.Checkbutton(
+            control_frame,
+            text="Suspend idle processes instead of terminating (terminate after 10 min suspended)",
+            variable=self.suspend_idle_enabled,
+            bg=self.colors['card_bg'],
+            fg=self.colors['fg'],
+            selectcolor=self.colors['card_bg'],
+            activebackground=self.colors['card_bg'],
+            activeforeground=self.colors['fg'],
+            font=('Segoe UI', 10),
+            highlightthickness=0
+        )
+        self.suspend_idle_checkbox.pack(anchor=tk.W)
+        
+        # Runaway throttling checkbox
+        self.runaway_throttle_checkbox = tk.Checkbutton(
+            control_frame,
+            text="Throttle runaway processes (sustained CPU or fast memory growth)",
+            variable=self.runaway_throttle_enabled,
+            bg=self.colors['card_bg'],
+            fg=self.colors['fg'],
+            selectcolor=self.colors['card_bg'],
+            activebackground=self.colors['card_bg'],
+            activeforeground=self.colors['fg'],
+            font=('Segoe UI', 10),
+            highlightthickness=0
+        )
+        self.runaway_throttle_checkbox.pack(anchor=tk.W)
+        
         # Buttons with modern styling
         button_frame = tk.Frame(control_frame, bg=self.colors['card_bg'])
         button_frame.pack(fill=tk.X, pady=(10, 0))
@@ -199,6 +289,15 @@ class AutoTerminatorManager:
                                    cursor='hand2')
         self.stop_button.pack(side=tk.LEFT)
 
+        # Session selector: the dashboard, log pane and Stop button follow the selected session
+        tk.Label(button_frame, text="Session:", bg=self.colors['card_bg'], fg=self.colors['fg'],
+                 font=('Segoe UI', 10)).pack(side=tk.LEFT, padx=(20, 5))
+        self.session_var = tk.StringVar(value="")
+        self.session_selector = ttk.Combobox(button_frame, textvariable=self.session_var, state='readonly',
+                                             width=14, font=('Segoe UI', 10))
+        self.session_selector.pack(side=tk.LEFT)
+        self.session_selector.bind('<<ComboboxSelected>>', self.on_session_selected)
+
         # Status indicator
         self.status_label = tk.Label(button_frame, text="● Stopped", 
                                    bg=self.colors['card_bg'], fg=self.colors['danger'],
@@ -226,7 +325,9 @@ class AutoTerminatorManager:
                 font=('Segoe UI', 9, 'bold')).pack(pady=(8, 2))
         self.cpu_label = tk.Label(cpu_card, text="--%", bg='#4a4a4a', fg='white',
                                 font=('Segoe UI', 14, 'bold'))
-        self.cpu_label.pack(pady=(0, 8))
+        self.cpu_label.pack(pady=(0, 2))
+        self.cpu_chart = sparkline_view.SparklineView(cpu_card, color=self.colors['warning'])
+        self.cpu_chart.pack(fill=tk.X, padx=8, pady=(0, 8))
         
         # Memory Card
         mem_card = tk.Frame(resources_grid, bg='#4a4a4a', relief='flat', bd=1)
@@ -236,7 +337,9 @@ class AutoTerminatorManager:
                 font=('Segoe UI', 9, 'bold')).pack(pady=(8, 2))
         self.memory_label = tk.Label(mem_card, text="-- MB", bg='#4a4a4a', fg='white',
                                    font=('Segoe UI', 14, 'bold'))
-        self.memory_label.pack(pady=(0, 8))
+        self.memory_label.pack(pady=(0, 2))
+        self.memory_chart = sparkline_view.SparklineView(mem_card, color=self.colors['info'])
+        self.memory_chart.pack(fill=tk.X, padx=8, pady=(0, 8))
         
         # Network Card
         net_card = tk.Frame(resources_grid, bg='#4a4a4a', relief='flat', bd=1)
@@ -246,7 +349,9 @@ class AutoTerminatorManager:
                 font=('Segoe UI', 9, 'bold')).pack(pady=(8, 2))
         self.network_label = tk.Label(net_card, text="--", bg='#4a4a4a', fg='white',
                                     font=('Segoe UI', 14, 'bold'))
-        self.network_label.pack(pady=(0, 8))
+        self.network_label.pack(pady=(0, 2))
+        self.network_chart = sparkline_view.SparklineView(net_card, color=self.colors['accent'])
+        self.network_chart.pack(fill=tk.X, padx=8, pady=(0, 8))
         
         # Power Card
         power_card = tk.Frame(resources_grid, bg='#4a4a4a', relief='flat', bd=1)
@@ -256,7 +361,17 @@ class AutoTerminatorManager:
                 font=('Segoe UI', 9, 'bold')).pack(pady=(8, 2))
         self.battery_label = tk.Label(power_card, text="--", bg='#4a4a4a', fg='white',
                                     font=('Segoe UI', 14, 'bold'))
-        self.battery_label.pack(pady=(0, 8))
+        self.battery_label.pack(pady=(0, 2))
+        self.battery_chart = sparkline_view.SparklineView(power_card, color='#9C27B0')
+        self.battery_chart.pack(fill=tk.X, padx=8, pady=(0, 8))
+
+        # Session history charts under the cards, keyed by metric
+        self.session_charts = {
+            'cpu_percent': self.cpu_chart,
+            'memory_mb': self.memory_chart,
+            'network_connections': self.network_chart,
+            'power_w': self.battery_chart,
+        }
 
         # Active/Inactive Processes Section
         processes_frame = ttk.Frame(main_frame, style='Card.TFrame', padding=15)
@@ -278,13 +393,13 @@ class AutoTerminatorManager:
         tk.Label(active_frame, text="🟢 Active Processes", bg=self.colors['card_bg'], 
                 fg=self.colors['accent'], font=('Segoe UI', 10, 'bold')).pack(anchor=tk.W)
         
-        self.active_processes_text = scrolledtext.ScrolledText(active_frame, width=40, height=8,
-                                                              state=tk.DISABLED,
-                                                              bg='#1e1e1e', fg='#00ff00',
-                                                              font=('Consolas', 9),
-                                                              relief='flat', bd=0,
-                                                              insertbackground='#00ff00')
-        self.active_processes_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.active_processes_table = process_table.ProcessTable(
+            active_frame,
+            columns=[('pid', 'PID', 60), ('name', 'Name', 140), ('cpu', 'CPU %', 60),
+                     ('memory', 'Mem MB', 70), ('last_active', 'Last Active', 80)],
+            sort_keys={'cpu': lambda values: values[2], 'memory': lambda values: values[3]},
+            default_sort='cpu')
+        self.active_processes_table.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
         
         # Inactive processes
         inactive_frame = tk.Frame(process_lists_frame, bg=self.colors['card_bg'])
@@ -293,13 +408,15 @@ class AutoTerminatorManager:
         tk.Label(inactive_frame, text="🔴 Inactive Processes", bg=self.colors['card_bg'], 
                 fg=self.colors['danger'], font=('Segoe UI', 10, 'bold')).pack(anchor=tk.W)
         
-        self.inactive_processes_text = scrolledtext.ScrolledText(inactive_frame, width=40, height=8,
-                                                                state=tk.DISABLED,
-                                                                bg='#1e1e1e', fg='#ff9999',
-                                                                font=('Consolas', 9),
-                                                                relief='flat', bd=0,
-                                                                insertbackground='#ff9999')
-        self.inactive_processes_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.inactive_processes_table = process_table.ProcessTable(
+            inactive_frame,
+            columns=[('pid', 'PID', 60), ('name', 'Name', 140), ('cpu', 'CPU %', 60),
+                     ('memory', 'Mem MB', 70), ('idle', 'Idle s', 80)],
+            sort_keys={'cpu': lambda values: values[2], 'memory': lambda values: values[3],
+                       # Suspended rows show their suspend time and sort as the most idle
+                       'idle': lambda values: values[4] if isinstance(values[4], (int, float)) else float('inf')},
+            default_sort='idle')
+        self.inactive_processes_table.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
 
         # Log Display with modern styling
         log_frame = ttk.Frame(main_frame, style='Card.TFrame', padding=15)
@@ -334,84 +451,109 @@ class AutoTerminatorManager:
                             relief='flat', bd=0, padx=10, pady=4, cursor='hand2')
         clear_btn.pack(side=tk.RIGHT)
 
-        self.log_text = scrolledtext.ScrolledText(log_frame, width=80, height=10, 
-                                                state=tk.DISABLED,
-                                                bg='#1e1e1e', fg='#00ff00',
-                                                font=('Consolas', 9),
-                                                relief='flat', bd=0,
-                                                insertbackground='#00ff00')
-        self.log_text.pack(fill=tk.BOTH, expand=True)
-        
-        # Start the process update thread
-        self.start_process_update_thread()
-
-    def start_process_update_thread(self):
-        """Start a thread to periodically update process information"""
-        self.process_update_thread = threading.Thread(target=self._update_process_display, daemon=True)
-        self.process_update_thread.start()
+        # Bounded log pane; the log thread only queues text, the Tk thread inserts it
+        self.log_view = log_view.LogView(log_frame, width=80, height=10,
+                                         bg='#1e1e1e', fg='#00ff00',
+                                         font=('Consolas', 9),
+                                         relief='flat', bd=0,
+                                         insertbackground='#00ff00')
+        self.log_view.pack(fill=tk.BOTH, expand=True)
+        
+        # The process tables are refreshed only while a session runs (see start_terminal)
+        self.process_tables_id = None
 
-    def _update_process_display(self):
-        """Update the active/inactive process displays"""
-        while True:
-            try:
-                # Update active processes display
-                self.active_processes_text.config(state=tk.NORMAL)
-                self.active_processes_text.delete(1.0, tk.END)
-                
-                active_text = ""
-                for pid, info in self.active_processes.items():
-                    active_text += f"PID: {pid} - {info.get('name', 'Unknown')}\n"
-                    active_text += f"  CPU: {info.get('cpu', '--')}%, Mem: {info.get('memory', '--')} MB\n"
-                    active_text += f"  Last Active: {info.get('last_active', '--')}\n\n"
-                
-                self.active_processes_text.insert(tk.END, active_text if active_text else "No active processes\n")
-                self.active_processes_text.config(state=tk.DISABLED)
-                
-                # Update inactive processes display
-                self.inactive_processes_text.config(state=tk.NORMAL)
-                self.inactive_processes_text.delete(1.0, tk.END)
-                
-                inactive_text = ""
-                for pid, info in self.inactive_processes.items():
-                    inactive_text += f"PID: {pid} - {info.get('name', 'Unknown')}\n"
-                    inactive_text += f"  CPU: {info.get('cpu', '--')}%, Mem: {info.get('memory', '--')} MB\n"
-                    inactive_text += f"  Inactive for: {info.get('inactive_time', '--')}s\n\n"
-                
-                self.inactive_processes_text.insert(tk.END, inactive_text if inactive_text else "No inactive processes\n")
-                self.inactive_processes_text.config(state=tk.DISABLED)
-                
-            except Exception as e:
-                print(f"Error updating process display: {e}")
+    def refresh_process_tables(self):
+        """Apply per-row diffs to the active/inactive process tables (runs on the Tk thread)"""
+        # Sessions whose terminal exited are closed by the service; stop refreshing after the last one
+        if not self.sync_sessions():
+            return
+        try:
+            # The monitor thread replaces these entries; copy before iterating
+            active_rows = {}
+            for pid, info in list(self.service.active_processes.items()):
+                name = info.get('name', 'Unknown')
+                if info.get('runaway'):
+                    name = f"{name} [RUNAWAY: {info['runaway']}]"
+                active_rows[pid] = (pid, name, info.get('cpu', 0), info.get('memory', 0), info.get('last_active', '--'))
             
-            time.sleep(2)  # Update every 2 seconds
+            inactive_rows = {}
+            for pid, info in list(self.service.inactive_processes.items()):
+                inactive_rows[pid] = (pid, info.get('name', 'Unknown'), info.get('cpu', 0),
+                                      info.get('memory', 0), info.get('inactive_time', 0))
+            for pid, info in list(self.service.suspended_processes.items()):
+                inactive_rows[pid] = (pid, f"{info.get('name', 'Unknown')} [SUSPENDED]", 0,
+                                      info.get('memory', 0), f"since {info.get('suspended_at', '--')}")
+            
+            self.active_processes_table.update_rows(active_rows)
+            self.inactive_processes_table.update_rows(inactive_rows)
+        except Exception as e:
+            print(f"Error updating process display: {e}")
+        
+        self.process_tables_id = self.master.after(1000, self.refresh_process_tables)  # Update every second
 
-    def update_process_status(self, pid, is_active, process_info):
-        """Update the status of a process"""
-        if is_active:
-            self.active_processes[pid] = process_info
-            if pid in self.inactive_processes:
-                del self.inactive_processes[pid]
-        else:
-            self.inactive_processes[pid] = process_info
-            if pid in self.active_processes:
-                del self.active_processes[pid]
-        
-        # Add new child processes to the process library for separate reporting
-        if pid not in self.process_library and pid != (self.ps_process.pid if self.ps_process else None):
-            self.add_child_process_to_library(pid, process_info)
-        elif pid in self.process_library and pid != (self.ps_process.pid if self.ps_process else None):
-            # Update existing child process in library
-            self.update_child_process_in_library(pid, process_info, is_active)
+    def cancel_process_table_updates(self):
+        if self.process_tables_id:
+            self.master.after_cancel(self.process_tables_id)
+            self.process_tables_id = None
 
-    def start_terminal(self):
-        if self.ps_process and self.ps_process.poll() is None:
-            # Process is already running
-            return
+    def sync_sessions(self, select=None):
+        """
+        Match the session selector to the service's running sessions (runs on the Tk thread).
+
+        Args:
+            select: Terminal PID to show; otherwise the selection is kept while its session runs
+
+        Returns:
+            Whether any session is running
+        """
+        pids = list(self.service.sessions)
+        self.session_selector.config(values=[f"PID {pid}" for pid in pids])
+        if not pids:
+            if self.selected_session_pid is not None or self.process_tables_id:
+                self.show_stopped()
+            return False
+
+        if select is None:
+            select = self.selected_session_pid if self.selected_session_pid in pids else pids[-1]
+        if select != self.selected_session_pid:
+            self.show_session(select)
+        self.session_var.set(f"PID {select}")
+        count = f" ({len(pids)} sessions)" if len(pids) > 1 else ""
+        self.status_label.config(text=f"● Running{count}", fg=self.colors['accent'])
+        self.stop_button.config(state=tk.NORMAL)
+        return True
+
+    def on_session_selected(self, _event=None):
+        pid = int(self.session_var.get().split()[-1])
+        self.sync_sessions(select=pid)
+
+    def show_session(self, pid):
+        """Point the dashboard and log pane at another session"""
+        self.selected_session_pid = None
+        self.reset_resource_dashboard()
+        self.last_snapshot_time = None
+        # Replay the end of the session's stored log, then follow it
+        self.clear_log_display()
+        entry_id = self.process_library.entry_id(pid)
+        count = self.pid_logs.line_count(entry_id)
+        self.log_view.append("".join(self.pid_logs.read_lines(entry_id, max(0, count - self.log_view.max_lines),
+                                                              self.log_view.max_lines)))
+        self.selected_session_pid = pid
 
-        # Ensure log file is clean or created
-        if os.path.exists(self.log_file_path):
-            os.remove(self.log_file_path)
+    def show_stopped(self):
+        """Return the window to its stopped state once no session is running"""
+        self.cancel_resource_updates()
+        self.cancel_process_table_updates()
+        self.selected_session_pid = None
+        self.session_var.set("")
+        self.stop_button.config(state=tk.DISABLED)
+        self.status_label.config(text="● Stopped", fg=self.colors['danger'])
+        self.clear_log_display()
+        self.reset_resource_dashboard()
+        self.active_processes_table.update_rows({})
+        self.inactive_processes_table.update_rows({})
 
+    def start_terminal(self):
         # Get timeout value from entry
         try:
             timeout_value = int(self.timeout_entry.get())
@@ -430,72 +572,30 @@ class AutoTerminatorManager:
             messagebox.showerror("Invalid Inactive Timeout", str(e))
             return
 
-        # Use subprocess.Popen to launch the PowerShell script in a new window
+        # The service launches the PowerShell script in a new window and wires up monitoring
         try:
-            script_path = os.path.join(os.getcwd(), "auto-terminator.ps1")
-            
-            # Build command with auto-execute flag if enabled
-            cmd = [
-                "powershell.exe",
-                "-ExecutionPolicy", "Bypass",
-                "-NoExit",
-                "-File", script_path,
-                "-Timeout", str(timeout_value)
-            ]
-            
-            # Add auto-execute flag if enabled
-            if self.auto_execute_ai.get():
-                cmd.append("-AutoExecute")
-            
-            self.ps_process = subprocess.Popen(
-                cmd,
-                creationflags=subprocess.CREATE_NEW_CONSOLE  # Opens in a new console window
-            )
-            
-            # Process monitoring is handled by auto-terminator.ps1 and inactive_process_monitor.py
-            # self.start_process_monitor(timeout_value)  # Disabled - process_monitor.ps1 doesn't exist
-            
-            # Start inactive process monitoring if enabled
-            if self.inactive_monitor_enabled.get():
-                self.start_inactive_process_monitor(inactive_timeout_value)
-            
-            # Get the psutil process object
-            try:
-                self.psutil_process = psutil.Process(self.ps_process.pid)
-            except psutil.NoSuchProcess:
-                self.psutil_process = None
-                print("Could not get psutil process object. Resource monitoring will be limited.")
-
-            # Add to process library
-            self.current_session_start_time = datetime.now()
-            self.process_library[self.ps_process.pid] = {
-                'start_time': self.current_session_start_time,
-                'end_time': None,
-                'status': 'Running',
-                'auto_execute': self.auto_execute_ai.get(),
-                'timeout': timeout_value,
-                'logs': [],  # Will store log entries for this process
-                'dashboard_data': {
-                    'cpu': '--%',
-                    'memory': '-- MB',
-                    'network': '--',
-                    'power': '--'
-                }
-            }
-            print(f"Added PID {self.ps_process.pid} to process library. Total processes: {len(self.process_library)}")
+            pid = self.service.start_session(timeout=timeout_value,
+                                             auto_execute=self.auto_execute_ai.get(),
+                                             monitor_inactive=self.inactive_monitor_enabled.get(),
+                                             inactive_timeout=inactive_timeout_value,
+                                             suspend_idle=self.suspend_idle_enabled.get(),
+                                             reclaim_memory=self.memory_reclaim_enabled.get(),
+                                             throttle_runaways=self.runaway_throttle_enabled.get())
+            print(f"Added PID {pid} to process library. Total processes: {len(self.process_library)}")
 
-            self.start_button.config(state=tk.DISABLED)
-            self.stop_button.config(state=tk.NORMAL)
-            self.status_label.config(text="● Running", fg=self.colors['accent'])
-            self.start_log_updater()
-            self.update_resource_dashboard()
-            print(f"Launched auto-terminator.ps1 with PID: {self.ps_process.pid} and Timeout: {timeout_value}s")
+            # Other sessions keep running; the window switches to the new one
+            self.sync_sessions(select=pid)
+            if not self.process_tables_id:
+                self.refresh_process_tables()
+            if not self.update_resources_id:
+                self.update_resource_dashboard()
+            print(f"Launched auto-terminator.ps1 with PID: {pid} and Timeout: {timeout_value}s")
             if self.auto_execute_ai.get():
                 print("Auto-execution of AI commands is ENABLED")
+        except RuntimeError as e:
+            messagebox.showinfo("Too Many Sessions", str(e))
         except Exception as e:
             print(f"Error launching PowerShell: {e}")
-            self.stop_button.config(state=tk.DISABLED)
-            self.start_button.config(state=tk.NORMAL)
 
     def start_process_monitor(self, termination_delay):
         """Start the separate process monitor"""
@@ -520,135 +620,61 @@ class AutoTerminatorManager:
         except Exception as e:
             print(f"Error launching process monitor: {e}")
 
-    def start_inactive_process_monitor(self, timeout_seconds):
-        """Start the inactive process monitor"""
+    def resume_suspended_processes(self):
+        """Resume the suspended PIDs typed in the PID entry, or all suspended processes when it is empty"""
+        text = self.add_pids_entry.get().replace(',', ' ')
         try:
-            self.inactive_process_monitor = inactive_process_monitor.InactiveProcessMonitor(timeout_seconds)
-            # Set the callback for process status updates
-            self.inactive_process_monitor.set_process_status_callback(self.update_process_status)
-            # Set the callback for process termination
-            self.inactive_process_monitor.set_process_termination_callback(self.mark_child_process_terminated)
-            # Set the terminal PID to exclude from termination
-            if self.ps_process:
-                self.inactive_process_monitor.set_terminal_pid(self.ps_process.pid)
-            self.inactive_process_monitor.start_monitoring()
-            print(f"Inactive process monitor started with timeout: {timeout_seconds}s")
-        except Exception as e:
-            print(f"Error starting inactive process monitor: {e}")
-
-    def stop_terminal(self):
-        if self.ps_process and self.ps_process.poll() is None:
-            print(f"Terminating auto-terminator process (PID: {self.ps_process.pid})...")
-            self.stop_log_updater()
-            self.cancel_resource_updates()
-            try:
-                # Use taskkill for graceful termination on Windows
-                subprocess.run(["taskkill", "/PID", str(self.ps_process.pid), "/T", "/F"], check=True)
-                print("Process terminated.")
-            except subprocess.CalledProcessError as e:
-                print(f"Error terminating process: {e}")
-            
-            # Process monitor stopping is handled by auto-terminator.ps1 and inactive_process_monitor.py
-            # self.stop_process_monitor()  # Disabled - process_monitor.ps1 doesn't exist
-            
-            # Stop inactive process monitor
-            self.stop_inactive_process_monitor()
-            
-            # Update process library with final dashboard data
-            if self.ps_process.pid in self.process_library:
-                self.process_library[self.ps_process.pid]['end_time'] = datetime.now()
-                self.process_library[self.ps_process.pid]['status'] = 'Terminated'
-                # Capture final dashboard data
-                self.process_library[self.ps_process.pid]['dashboard_data'] = {
-                    'cpu': self.cpu_label.cget("text"),
-                    'memory': self.memory_label.cget("text"),
-                    'network': self.network_label.cget("text"),
-                    'power': self.battery_label.cget("text")
-                }
-                print(f"Updated PID {self.ps_process.pid} in process library as Terminated")
-
-            self.ps_process = None
-            self.psutil_process = None
-
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
-        self.status_label.config(text="● Stopped", fg=self.colors['danger'])
-        self.clear_log_display()
-        self.reset_resource_dashboard()
+            pids = [int(token) for token in text.split()]
+        except ValueError:
+            messagebox.showerror("Invalid PIDs", "Enter process IDs separated by spaces or commas.")
+            return
         
-        # Clear process displays
-        self.active_processes = {}
-        self.inactive_processes = {}
-
-    def add_child_process_to_library(self, pid, process_info):
-        """Add a child process to the process library for separate reporting"""
         try:
-            if pid not in self.process_library:
-                self.process_library[pid] = {
-                    'start_time': datetime.now(),
-                    'end_time': None,
-                    'status': 'Running (Child Process)',
-                    'auto_execute': False,  # Child processes don't have auto-execute
-                    'timeout': self.inactive_timeout_var.get() if hasattr(self, 'inactive_timeout_var') else 30,
-                    'logs': [],  # Will store log entries for this child process
-                    'dashboard_data': {
-                        'cpu': f"{process_info.get('cpu', 0)}%",
-                        'memory': f"{process_info.get('memory', 0)} MB",
-                        'network': '--',
-                        'power': '--'
-                    },
-                    'process_name': process_info.get('name', 'Unknown'),
-                    'parent_pid': self.ps_process.pid if self.ps_process else None
-                }
-                print(f"Added child process PID {pid} ({process_info.get('name', 'Unknown')}) to process library. Total processes: {len(self.process_library)}")
-        except Exception as e:
-            print(f"Error adding child process {pid} to library: {e}")
+            resumed, failed = self.service.resume_pids(pids)
+        except RuntimeError as e:
+            messagebox.showinfo("Monitor Not Running", str(e))
+            return
+        if not resumed and not failed:
+            messagebox.showinfo("Resume", "No suspended processes.")
+            return
+        lines = []
+        if resumed:
+            lines.append(f"Resumed: {', '.join(str(pid) for pid in resumed)}")
+        if failed:
+            lines.append(f"Not suspended: {', '.join(str(pid) for pid in failed)}")
+        messagebox.showinfo("Resume", "\n".join(lines))
+        self.add_pids_entry.delete(0, tk.END)
 
-    def update_child_process_in_library(self, pid, process_info, is_active):
-        """Update child process information in the library"""
+    def add_pids_to_monitor(self):
+        """Add the PIDs typed in the PID entry to the inactive process monitor"""
+        text = self.add_pids_entry.get().replace(',', ' ')
         try:
-            if pid in self.process_library:
-                # Update dashboard data
-                self.process_library[pid]['dashboard_data'] = {
-                    'cpu': f"{process_info.get('cpu', 0)}%",
-                    'memory': f"{process_info.get('memory', 0)} MB",
-                    'network': '--',
-                    'power': '--'
-                }
-                
-                # Update status based on activity
-                if is_active:
-                    self.process_library[pid]['status'] = 'Running (Child Process)'
-                else:
-                    inactive_time = process_info.get('inactive_time', 0)
-                    self.process_library[pid]['status'] = f'Inactive (Child Process) - {inactive_time}s'
-                
-                # Add log entry for significant status changes
-                if not is_active and process_info.get('inactive_time', 0) > 10:
-                    log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} ({process_info.get('name', 'Unknown')}) inactive for {process_info.get('inactive_time', 0)}s\n"
-                    self.process_library[pid]['logs'].append(log_entry)
-        except Exception as e:
-            print(f"Error updating child process {pid} in library: {e}")
-
-    def mark_child_process_terminated(self, pid):
-        """Mark a child process as terminated in the library"""
+            pids = [int(token) for token in text.split()]
+        except ValueError:
+            messagebox.showerror("Invalid PIDs", "Enter process IDs separated by spaces or commas.")
+            return
+        if not pids:
+            return
+        
         try:
-            if pid in self.process_library:
-                self.process_library[pid]['end_time'] = datetime.now()
-                
-                # Check if it was terminated due to inactivity or naturally
-                current_status = self.process_library[pid].get('status', '')
-                if 'Inactive' in current_status:
-                    self.process_library[pid]['status'] = 'Terminated (Child Process - Inactivity)'
-                    log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} terminated due to inactivity\n"
-                else:
-                    self.process_library[pid]['status'] = 'Terminated (Child Process - Natural)'
-                    log_entry = f"[{datetime.now().strftime('%H:%M:%S')}] Child process {pid} terminated naturally\n"
-                
-                self.process_library[pid]['logs'].append(log_entry)
-                print(f"Marked child process PID {pid} as terminated in process library")
-        except Exception as e:
-            print(f"Error marking child process {pid} as terminated: {e}")
+            outcomes = self.service.add_pids(pids)
+        except RuntimeError as e:
+            messagebox.showinfo("Monitor Not Running", str(e))
+            return
+        summary = {}
+        for pid, outcome in outcomes.items():
+            summary.setdefault(outcome, []).append(str(pid))
+        lines = [f"{outcome.replace('_', ' ').capitalize()}: {', '.join(outcome_pids)}" for outcome, outcome_pids in summary.items()]
+        messagebox.showinfo("Add PIDs", "\n".join(lines))
+        self.add_pids_entry.delete(0, tk.END)
+
+    def stop_terminal(self):
+        # The service kills the selected session's process tree, leaves the shared monitor and closes its library entry
+        pid = self.service.stop_session(self.selected_session_pid)
+        if pid is not None:
+            print(f"Terminated auto-terminator process (PID: {pid}) and updated it in process library")
+        # Show the next running session, or the stopped state after the last one
+        self.sync_sessions()
 
     def stop_process_monitor(self):
         """Stop the process monitor"""
@@ -663,121 +689,33 @@ class AutoTerminatorManager:
             
             self.process_monitor_process = None
 
-    def stop_inactive_process_monitor(self):
-        """Stop the inactive process monitor"""
-        if self.inactive_process_monitor:
-            self.inactive_process_monitor.stop_monitoring()
-            self.inactive_process_monitor = None
-            print("Inactive process monitor stopped.")
-
-    def start_log_updater(self):
-        self.stop_update_log.clear()
-        self.update_log_thread = threading.Thread(target=self._update_log_display)
-        self.update_log_thread.daemon = True  # Allows the thread to exit with the main program
-        self.update_log_thread.start()
-
-    def stop_log_updater(self):
-        self.stop_update_log.set()
-        if self.update_log_thread and self.update_log_thread.is_alive():
-            self.update_log_thread.join(timeout=1) # Wait for thread to finish
-
-    def _update_log_display(self):
-        last_read_position = 0
-        while not self.stop_update_log.is_set():
-            try:
-                if os.path.exists(self.log_file_path):
-                    with open(self.log_file_path, "r", encoding="utf-8") as f:
-                        f.seek(last_read_position)
-                        new_content = f.read()
-                        if new_content:
-                            self.log_text.config(state=tk.NORMAL)
-                            self.log_text.insert(tk.END, new_content)
-                            self.log_text.see(tk.END) # Scroll to the end
-                            self.log_text.config(state=tk.DISABLED)
-                            last_read_position = f.tell()
-                            
-                            # Store log content for the current process
-                            if self.ps_process and self.ps_process.pid in self.process_library:
-                                self.process_library[self.ps_process.pid]['logs'].append(new_content)
-                                
-                                # Update dashboard data for running process
-                                self.process_library[self.ps_process.pid]['dashboard_data'] = {
-                                    'cpu': self.cpu_label.cget("text"),
-                                    'memory': self.memory_label.cget("text"),
-                                    'network': self.network_label.cget("text"),
-                                    'power': self.battery_label.cget("text")
-                                }
-            except FileNotFoundError:
-                pass # Log file might not be created yet
-            except Exception as e:
-                print(f"Error reading log file: {e}")
-            
-            time.sleep(0.5) # Check every 500ms
-
-    # Child process monitoring is now handled by the PowerShell script
+    def _on_service_event(self, event, data):
+        """Service listener (runs on service threads, so only queues work for the Tk thread)"""
+        if event == auto_terminator_service.EVENT_LOG and data['pid'] == self.selected_session_pid:
+            self.log_view.append(data['text'])
 
     def update_resource_dashboard(self):
-        cpu_percent = "--"
-        memory_mb = "--"
-        network_connections = "--"
-        battery_status = "--"
-
-        if self.psutil_process and self.psutil_process.is_running():
-            try:
-                cpu_percent = self.psutil_process.cpu_percent(interval=0.1) # Non-blocking
-                mem_info = self.psutil_process.memory_info()
-                memory_mb = f"{(mem_info.rss / (1024 * 1024)):.2f}"
-
-                # Get all child processes
-                children = self.psutil_process.children(recursive=True)
-                all_procs = [self.psutil_process] + children
-                total_connections = 0
-                for proc in all_procs:
-                    try:
-                        total_connections += len(proc.connections(kind="inet"))
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-                network_connections = str(total_connections)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                self.psutil_process = None # Process might have just ended or access denied
+        """Apply the selected session's latest dashboard snapshot (runs on the Tk thread)"""
+        session = self.service.sessions.get(self.selected_session_pid)
+        snapshot = session.latest_snapshot if session else None
+        if snapshot is not None and snapshot['timestamp'] != self.last_snapshot_time:
+            self.last_snapshot_time = snapshot['timestamp']
+            if snapshot['running']:
+                self.cpu_label.config(text=f"{snapshot['cpu']:.1f}%")
+                self.memory_label.config(text=f"{snapshot['memory_mb']:.2f} MB")
+                self.network_label.config(text=f"{snapshot['network']}")
+                self.battery_label.config(text=f"{snapshot['power_w']:.2f}W")
 
-        # Terminal Power Consumption
-        power_consumption = "--"
-        if self.psutil_process and self.psutil_process.is_running():
-            try:
-                # Get CPU usage and estimate power consumption
-                # Rough estimation: Base consumption + CPU factor + Memory factor
-                base_power = 0.5  # Base power consumption in watts
-                cpu_power = (float(cpu_percent) if cpu_percent != "--" else 0) * 2.0  # CPU can consume up to 2W
-                memory_power = (float(memory_mb) if memory_mb != "--" else 0) / 1000 * 0.1  # Memory factor
-                
-                total_power = base_power + cpu_power + memory_power
-                power_consumption = f"{total_power:.2f}W"
-                
-                # Get all child processes for total consumption
-                children = self.psutil_process.children(recursive=True)
-                if children:
-                    child_power = 0
-                    for child in children:
-                        try:
-                            child_cpu = child.cpu_percent(interval=0.1)
-                            child_power += (child_cpu / 100) * 0.5  # Child processes consume less
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            continue
-                    total_power += child_power
-                    power_consumption = f"{total_power:.2f}W"
-                    
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                power_consumption = "N/A"
-        
-        battery_status = power_consumption
-
-        self.cpu_label.config(text=f"{cpu_percent}%")
-        self.memory_label.config(text=f"{memory_mb} MB")
-        self.network_label.config(text=f"{network_connections}")
-        self.battery_label.config(text=f"{battery_status}")
+                # The service has recorded the sample; redraw the charts (downsampled, so constant cost)
+                history = self.metric_histories.session_history(snapshot['pid'])
+                if history is not None:
+                    for field, chart in self.session_charts.items():
+                        chart.set_series(*history.series(field))
+            else:
+                # Process might have just ended or access denied
+                self.reset_resource_dashboard()
 
-        self.update_resources_id = self.master.after(1000, self.update_resource_dashboard) # Update every 1 second
+        self.update_resources_id = self.master.after(200, self.update_resource_dashboard) # Poll for new snapshots
 
     def cancel_resource_updates(self):
         if self.update_resources_id:
@@ -789,19 +727,19 @@ class AutoTerminatorManager:
         self.memory_label.config(text="-- MB")
         self.network_label.config(text="--")
         self.battery_label.config(text="--")
+        for chart in self.session_charts.values():
+            chart.clear()
 
     def clear_log_display(self):
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        self.log_view.clear()
 
     def download_all_logs(self):
-        """Download all logs from the current session"""
+        """Download all logs from the selected session"""
         try:
-            # Get current log content
-            log_content = self.log_text.get(1.0, tk.END)
-            
-            if not log_content.strip():
+            # Stream the whole session log from the log file rather than the (bounded) log pane
+            session = self.service.sessions.get(self.selected_session_pid)
+            log_file_path = session.log_file_path if session else self.service.log_file_path
+            if not os.path.exists(log_file_path) or os.path.getsize(log_file_path) == 0:
                 messagebox.showinfo("No Logs", "No logs available to download.")
                 return
             
@@ -814,8 +752,8 @@ class AutoTerminatorManager:
             )
             
             if file_path:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(log_content)
+                with open(log_file_path, "rb") as source, open(file_path, "wb") as f:
+                    shutil.copyfileobj(source, f)
                 messagebox.showinfo("Logs Downloaded", f"All logs saved successfully to:\n{file_path}")
             else:
                 print("Logs download cancelled by user")
@@ -829,8 +767,6 @@ class AutoTerminatorManager:
         """Open a new window to view the library of PID reports"""
         try:
             print(f"Opening library with {len(self.process_library)} processes")
-            for pid, info in self.process_library.items():
-                print(f"  PID {pid}: {info['status']} - Started: {info['start_time']}")
             # Create library viewer window
             library_window = tk.Toplevel(self.master)
             library_window.title("📚 Process Library")
@@ -858,146 +794,177 @@ class AutoTerminatorManager:
                                        relief='flat', bd=0, padx=20, pady=8, cursor='hand2')
             download_all_btn.pack(pady=10)
             
-            # Create a frame for the process list
-            list_frame = tk.Frame(library_window, bg='#3c3c3c')
-            list_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+            # Export library data for analysis
+            export_data_btn = tk.Button(header_frame, text="📤 Export Data (JSONL/CSV/Columnar)", 
+                                      command=lambda: self.export_library_data(library_window),
+                                      bg='#2196F3', fg='white', font=('Segoe UI', 9),
+                                      relief='flat', bd=0, padx=15, pady=4, cursor='hand2')
+            export_data_btn.pack(pady=(0, 10))
             
-            # Create a canvas and scrollbar for the process list
-            canvas = tk.Canvas(list_frame, bg='#3c3c3c', highlightthickness=0)
-            scrollbar = tk.Scrollbar(list_frame, orient="vertical", command=canvas.yview)
-            scrollable_frame = tk.Frame(canvas, bg='#3c3c3c')
+            # Filter by PID, name or status
+            filter_frame = tk.Frame(header_frame, bg='#2b2b2b')
+            filter_frame.pack(fill=tk.X)
+            tk.Label(filter_frame, text="🔍 Filter:", bg='#2b2b2b', fg='white',
+                    font=('Segoe UI', 10)).pack(side=tk.LEFT)
+            filter_var = tk.StringVar()
+            filter_entry = tk.Entry(filter_frame, textvariable=filter_var, font=('Segoe UI', 10),
+                                  bg='#4a4a4a', fg='white', insertbackground='white',
+                                  relief='flat', bd=5)
+            filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0))
             
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(
-                    scrollregion=canvas.bbox("all")
-                )
-            )
+            # Search the logs of every PID through the index
+            log_search_frame = tk.Frame(header_frame, bg='#2b2b2b')
+            log_search_frame.pack(fill=tk.X, pady=(8, 0))
+            tk.Label(log_search_frame, text="🔎 Search logs:", bg='#2b2b2b', fg='white',
+                    font=('Segoe UI', 10)).pack(side=tk.LEFT)
+            log_search_var = tk.StringVar()
+            log_search_entry = tk.Entry(log_search_frame, textvariable=log_search_var, font=('Segoe UI', 10),
+                                      bg='#4a4a4a', fg='white', insertbackground='white',
+                                      relief='flat', bd=5)
+            log_search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0))
+            log_search_status = tk.Label(header_frame, text="", bg='#2b2b2b', fg='#2196F3',
+                                       font=('Segoe UI', 9))
+            log_results = tk.Listbox(header_frame, height=6, bg='#1e1e1e', fg='#00ff00',
+                                   font=('Consolas', 9), relief='flat', bd=0,
+                                   selectbackground='#2196F3', activestyle='none')
+            log_result_hits = []
+            log_search_id = [None]
             
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
+            def run_log_search():
+                log_search_id[0] = None
+                query = log_search_var.get()
+                log_results.delete(0, tk.END)
+                log_result_hits.clear()
+                if not query.strip():
+                    log_search_status.pack_forget()
+                    log_results.pack_forget()
+                    return
+                started = time.perf_counter()
+                hits = log_index.read_hits(self.log_index.search(query), self.pid_logs)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                for entry_id, line, text in hits:
+                    entry = self.process_library.get_entry(entry_id)
+                    if entry is None:
+                        continue
+                    log_result_hits.append((entry.pid, line, entry_id))
+                    log_results.insert(tk.END, f"PID {entry.pid}  line {line + 1}: {text}")
+                more = "+" if len(hits) >= log_index.DEFAULT_SEARCH_LIMIT else ""
+                log_search_status.config(text=f"{len(hits)}{more} matching lines in {elapsed_ms:.1f} ms"
+                                              " (double-click to open)")
+                log_search_status.pack(anchor=tk.W, pady=(5, 0))
+                log_results.pack(fill=tk.X, pady=(2, 0))
             
-            # Add process cards
-            if not self.process_library:
-                no_processes_label = tk.Label(scrollable_frame, text="No processes in library", 
-                                            bg='#3c3c3c', fg='white', font=('Segoe UI', 12))
-                no_processes_label.pack(pady=50)
-            else:
-                for pid, info in self.process_library.items():
-                    # Create a card for each process
-                    card_frame = tk.Frame(scrollable_frame, bg='#4a4a4a', relief='flat', bd=1)
-                    card_frame.pack(fill=tk.X, padx=10, pady=5)
-                    
-                    # Process info
-                    pid_label = tk.Label(card_frame, text=f"PID: {pid}", 
-                                       bg='#4a4a4a', fg='white', font=('Segoe UI', 12, 'bold'))
-                    pid_label.pack(anchor=tk.W, padx=10, pady=(10, 5))
-                    
-                    status_label = tk.Label(card_frame, text=f"Status: {info['status']}", 
-                                          bg='#4a4a4a', fg='white', font=('Segoe UI', 10))
-                    status_label.pack(anchor=tk.W, padx=10)
-                    
-                    start_label = tk.Label(card_frame, text=f"Started: {info['start_time'].strftime('%Y-%m-%d %H:%M:%S') if info['start_time'] else 'Unknown'}", 
-                                         bg='#4a4a4a', fg='white', font=('Segoe UI', 10))
-                    start_label.pack(anchor=tk.W, padx=10)
-                    
-                    if info['end_time']:
-                        end_label = tk.Label(card_frame, text=f"Ended: {info['end_time'].strftime('%Y-%m-%d %H:%M:%S')}", 
-                                           bg='#4a4a4a', fg='white', font=('Segoe UI', 10))
-                        end_label.pack(anchor=tk.W, padx=10)
-                    
-                    auto_exec_label = tk.Label(card_frame, text=f"Auto-execute AI: {'Yes' if info['auto_execute'] else 'No'}", 
-                                             bg='#4a4a4a', fg='white', font=('Segoe UI', 10))
-                    auto_exec_label.pack(anchor=tk.W, padx=10)
-                    
-                    # Buttons frame
-                    buttons_frame = tk.Frame(card_frame, bg='#4a4a4a')
-                    buttons_frame.pack(fill=tk.X, padx=10, pady=10)
-                    
-                    # View report button
-                    view_btn = tk.Button(buttons_frame, text="👁️ View Report", 
-                                       command=lambda p=pid: self.view_pid_report(p),
-                                       bg='#2196F3', fg='white', font=('Segoe UI', 9),
-                                       relief='flat', bd=0, padx=15, pady=5, cursor='hand2')
-                    view_btn.pack(side=tk.LEFT, padx=(0, 10))
-                    
-                    # Download report button
-                    download_btn = tk.Button(buttons_frame, text="📥 Download Report", 
-                                           command=lambda p=pid: self.download_pid_report(p),
-                                           bg='#4CAF50', fg='white', font=('Segoe UI', 9),
-                                           relief='flat', bd=0, padx=15, pady=5, cursor='hand2')
-                    download_btn.pack(side=tk.LEFT, padx=(0, 10))
-                    
-                    # Delete report button
-                    delete_btn = tk.Button(buttons_frame, text="🗑️ Delete Report", 
-                                         command=lambda p=pid: self.delete_pid_report(p, card_frame, library_window),
-                                         bg='#f44336', fg='white', font=('Segoe UI', 9),
-                                         relief='flat', bd=0, padx=15, pady=5, cursor='hand2')
-                    delete_btn.pack(side=tk.LEFT)
+            def on_log_search_changed(*_):
+                # Search once typing pauses
+                if log_search_id[0]:
+                    library_window.after_cancel(log_search_id[0])
+                log_search_id[0] = library_window.after(150, run_log_search)
+            
+            def open_log_result(_event):
+                selection = log_results.curselection()
+                if selection:
+                    hit_pid, line, entry_id = log_result_hits[selection[0]]
+                    self.view_pid_report(hit_pid, focus_line=line, entry_id=entry_id)
             
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
+            log_search_var.trace_add('write', on_log_search_changed)
+            log_results.bind('<Double-Button-1>', open_log_result)
+            
+            def update_subtitle():
+                total = len(self.process_library)
+                if filter_var.get().strip():
+                    subtitle_label.config(text=f"Showing {process_list.match_count} of {total} processes")
+                else:
+                    subtitle_label.config(text=f"Total processes: {total}")
+            
+            def on_deleted(pid):
+                process_list.remove_item(pid)
+                update_subtitle()
+            
+            def create_row(row_frame):
+                # Widgets are created once per visible row and rebound while scrolling
+                card_frame = tk.Frame(row_frame, bg='#4a4a4a', relief='flat', bd=1)
+                card_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+                row = {'pid': None}
+                row['pid_label'] = tk.Label(card_frame, bg='#4a4a4a', fg='white', font=('Segoe UI', 12, 'bold'))
+                row['pid_label'].pack(anchor=tk.W, padx=10, pady=(8, 2))
+                row['status_label'] = tk.Label(card_frame, bg='#4a4a4a', fg='white', font=('Segoe UI', 10))
+                row['status_label'].pack(anchor=tk.W, padx=10)
+                row['time_label'] = tk.Label(card_frame, bg='#4a4a4a', fg='white', font=('Segoe UI', 10))
+                row['time_label'].pack(anchor=tk.W, padx=10)
+                
+                # Buttons frame
+                buttons_frame = tk.Frame(card_frame, bg='#4a4a4a')
+                buttons_frame.pack(fill=tk.X, padx=10, pady=(6, 8))
+                
+                # View report button
+                tk.Button(buttons_frame, text="👁️ View Report", 
+                         command=lambda: self.view_pid_report(row['pid']),
+                         bg='#2196F3', fg='white', font=('Segoe UI', 9),
+                         relief='flat', bd=0, padx=15, pady=3, cursor='hand2').pack(side=tk.LEFT, padx=(0, 10))
+                
+                # Download report button
+                tk.Button(buttons_frame, text="📥 Download Report", 
+                         command=lambda: self.download_pid_report(row['pid']),
+                         bg='#4CAF50', fg='white', font=('Segoe UI', 9),
+                         relief='flat', bd=0, padx=15, pady=3, cursor='hand2').pack(side=tk.LEFT, padx=(0, 10))
+                
+                # Delete report button
+                tk.Button(buttons_frame, text="🗑️ Delete Report", 
+                         command=lambda: self.delete_pid_report(row['pid'], library_window, on_deleted),
+                         bg='#f44336', fg='white', font=('Segoe UI', 9),
+                         relief='flat', bd=0, padx=15, pady=3, cursor='hand2').pack(side=tk.LEFT)
+                return row
+            
+            def bind_row(row, pid):
+                info = self.process_library.get(pid)
+                if info is None:
+                    return
+                row['pid'] = pid
+                # Display text is formatted here, when the row is shown
+                name = info.process_name
+                row['pid_label'].config(text=f"PID: {pid}" + (f" - {name}" if name else ""))
+                row['status_label'].config(text=f"Status: {info.status_text()}    Auto-execute AI: {'Yes' if info.auto_execute else 'No'}")
+                started = info.started.strftime('%Y-%m-%d %H:%M:%S') if info.started else 'Unknown'
+                ended = f"    Ended: {info.ended.strftime('%Y-%m-%d %H:%M:%S')}" if info.ended else ""
+                row['time_label'].config(text=f"Started: {started}{ended}")
+            
+            # PID, name and status of every entry, fetched in one query for the filter
+            summaries = self.process_library.summaries()
+            search_texts = {pid: f"{pid} {name} {status}" for pid, name, status in summaries}
+            
+            def search_text(pid):
+                return search_texts.get(pid, str(pid))
+            
+            # Only the rows in view are built, so opening cost does not grow with the library
+            process_list = virtual_list.VirtualList(library_window, row_height=120, create_row=create_row,
+                                                    bind_row=bind_row, search_text=search_text,
+                                                    empty_text="No processes in library")
+            process_list.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+            process_list.set_items([pid for pid, _, _ in summaries])
+            
+            def on_filter_changed(*_):
+                process_list.set_filter(filter_var.get())
+                update_subtitle()
+            filter_var.trace_add('write', on_filter_changed)
+            filter_entry.focus_set()
             
         except Exception as e:
             error_msg = f"Error opening library: {str(e)}"
             print(error_msg)
             messagebox.showerror("Error", error_msg)
 
-    def view_pid_report(self, pid):
-        """View the report for a specific PID"""
+    def view_pid_report(self, pid, focus_line=None, entry_id=None):
+        """View the report for a specific PID (its latest entry unless entry_id is given), optionally scrolled to a log line"""
         try:
-            if pid not in self.process_library:
+            info = self.process_library.get_entry(entry_id) if entry_id is not None else self.process_library.get(pid)
+            if info is None:
                 messagebox.showerror("Error", f"No data found for PID {pid}")
                 return
+            entry_id = info.id
             
-            info = self.process_library[pid]
-            
-            # Combine all logs for this process
-            log_content = "".join(info.get('logs', []))
-            
-            # Calculate duration
-            duration = "N/A"
-            if info['start_time']:
-                if info['end_time']:
-                    duration = str(info['end_time'] - info['start_time'])
-                elif info['status'] == 'Running':
-                    duration = str(datetime.now() - info['start_time'])
-            
-            # Get dashboard data
-            dashboard_data = info.get('dashboard_data', {
-                'cpu': '--%',
-                'memory': '-- MB',
-                'network': '--',
-                'power': '--'
-            })
-            
-            # Create report content with dashboard information
-            report_content = f"""Auto-Terminator Process Report
-==============================
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-PID: {pid}
-
-PROCESS INFORMATION
--------------------
-PID: {pid}
-Status: {info['status']}
-Started: {info['start_time'].strftime('%Y-%m-%d %H:%M:%S') if info['start_time'] else 'Unknown'}
-Ended: {info['end_time'].strftime('%Y-%m-%d %H:%M:%S') if info['end_time'] else 'N/A'}
-Duration: {duration}
-Auto-execute AI: {'Yes' if info['auto_execute'] else 'No'}
-Timeout: {info['timeout']} seconds
-
-DASHBOARD INFORMATION
----------------------
-CPU Usage: {dashboard_data['cpu']}
-Memory Usage: {dashboard_data['memory']}
-Network Connections: {dashboard_data['network']}
-Power Consumption: {dashboard_data['power']}
-
-LOG CONTENT
------------
-{log_content}
-"""
+            # The header is shown at once; the log is paged in below
+            history = self.metric_histories.get(pid)
+            report_header = "".join(report_writer.iter_report_header(pid, info, history=history))
             
             # Create report viewer window
             report_window = tk.Toplevel(self.master)
@@ -1005,21 +972,114 @@ LOG CONTENT
             report_window.geometry("800x600")
             report_window.configure(bg='#2b2b2b')
             
+            # CPU and memory history charts for this PID
+            if history is not None and len(history):
+                charts_frame = tk.Frame(report_window, bg='#2b2b2b')
+                charts_frame.pack(fill=tk.X, padx=20, pady=(20, 0))
+                for field, title, color in (('cpu_percent', "🔥 CPU", self.colors['warning']),
+                                            ('memory_mb', "💾 Memory", self.colors['info'])):
+                    chart_card = tk.Frame(charts_frame, bg='#4a4a4a')
+                    chart_card.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+                    tk.Label(chart_card, text=title, bg='#4a4a4a', fg=color,
+                            font=('Segoe UI', 9, 'bold')).pack(anchor=tk.W, padx=8, pady=(5, 0))
+                    chart = sparkline_view.SparklineView(chart_card, width=340, height=50, color=color)
+                    chart.pack(fill=tk.X, padx=8, pady=(0, 8))
+                    chart.set_series(*history.series(field))
+            
+            # Search this PID's log through the index
+            search_frame = tk.Frame(report_window, bg='#2b2b2b')
+            search_frame.pack(fill=tk.X, padx=20, pady=(20, 0))
+            tk.Label(search_frame, text="🔎 Search log:", bg='#2b2b2b', fg='white',
+                    font=('Segoe UI', 10)).pack(side=tk.LEFT)
+            search_var = tk.StringVar()
+            search_entry = tk.Entry(search_frame, textvariable=search_var, font=('Segoe UI', 10),
+                                  bg='#4a4a4a', fg='white', insertbackground='white',
+                                  relief='flat', bd=5)
+            search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 10))
+            search_status = tk.Label(search_frame, text="", bg='#2b2b2b', fg='#2196F3',
+                                   font=('Segoe UI', 9))
+            
             # Create text widget with scrollbar
             text_frame = tk.Frame(report_window, bg='#2b2b2b')
             text_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
             
             text_widget = tk.Text(text_frame, wrap=tk.WORD, bg='#1e1e1e', fg='#00ff00',
                                 font=('Consolas', 10), insertbackground='#00ff00')
-            text_widget.insert(tk.END, report_content)
+            text_widget.insert(tk.END, report_header)
             text_widget.config(state=tk.DISABLED)
+            text_widget.tag_configure('search_hit', background='#665c00', foreground='white')
+            header_lines = report_header.count("\n")
             
             scrollbar = tk.Scrollbar(text_frame, orient=tk.VERTICAL, command=text_widget.yview)
-            text_widget.config(yscrollcommand=scrollbar.set)
+            
+            # Page the log in from the log store as the user scrolls towards the end
+            next_line = [0]
+            page_pending = [False]
+            
+            def load_next_page():
+                page_pending[0] = False
+                lines = self.pid_logs.read_lines(entry_id, next_line[0], REPORT_PAGE_LINES)
+                if lines:
+                    next_line[0] += len(lines)
+                    text_widget.config(state=tk.NORMAL)
+                    text_widget.insert(tk.END, "".join(lines))
+                    text_widget.config(state=tk.DISABLED)
+            
+            def on_scroll(first, last):
+                scrollbar.set(first, last)
+                if float(last) > 0.9 and not page_pending[0] and next_line[0] < self.pid_logs.line_count(entry_id):
+                    page_pending[0] = True
+                    text_widget.after_idle(load_next_page)
+            
+            def show_line(line):
+                """Page the log in up to a line, then scroll to and highlight it"""
+                if line >= next_line[0]:
+                    lines = self.pid_logs.read_lines(entry_id, next_line[0], line - next_line[0] + REPORT_PAGE_LINES)
+                    if lines:
+                        next_line[0] += len(lines)
+                        text_widget.config(state=tk.NORMAL)
+                        text_widget.insert(tk.END, "".join(lines))
+                        text_widget.config(state=tk.DISABLED)
+                text_index = f"{header_lines + line + 1}.0"
+                text_widget.tag_remove('search_hit', '1.0', tk.END)
+                text_widget.tag_add('search_hit', text_index, f"{text_index} lineend")
+                text_widget.see(text_index)
+            
+            search_hits = []
+            current_hit = [0]
+            
+            def run_search(*_):
+                search_hits[:] = [line for _, line in self.log_index.search(search_var.get(), entry_id=entry_id)]
+                current_hit[0] = 0
+                if search_hits:
+                    search_status.config(text=f"1 of {len(search_hits)}")
+                    show_line(search_hits[0])
+                else:
+                    search_status.config(text="No matches" if search_var.get().strip() else "")
+                    text_widget.tag_remove('search_hit', '1.0', tk.END)
+            
+            def step_hit(step):
+                if search_hits:
+                    current_hit[0] = (current_hit[0] + step) % len(search_hits)
+                    search_status.config(text=f"{current_hit[0] + 1} of {len(search_hits)}")
+                    show_line(search_hits[current_hit[0]])
+            
+            search_entry.bind('<Return>', run_search)
+            for text, step in (("▲", -1), ("▼", 1)):
+                tk.Button(search_frame, text=text, command=lambda step=step: step_hit(step),
+                         bg='#4a4a4a', fg='white', font=('Segoe UI', 9),
+                         relief='flat', bd=0, padx=8, pady=2, cursor='hand2').pack(side=tk.LEFT, padx=(0, 5))
+            search_status.pack(side=tk.LEFT, padx=(5, 0))
+            
+            text_widget.config(yscrollcommand=on_scroll)
+            load_next_page()
             
             text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             
+            if focus_line is not None:
+                show_line(focus_line)
+            
         except Exception as e:
             error_msg = f"Error viewing report for PID {pid}: {str(e)}"
             print(error_msg)
@@ -1032,66 +1092,17 @@ LOG CONTENT
                 messagebox.showerror("Error", f"No data found for PID {pid}")
                 return
             
-            info = self.process_library[pid]
-            
-            # Combine all logs for this process
-            log_content = "".join(info.get('logs', []))
-            
-            # Calculate duration
-            duration = "N/A"
-            if info['start_time']:
-                if info['end_time']:
-                    duration = str(info['end_time'] - info['start_time'])
-                elif info['status'] == 'Running':
-                    duration = str(datetime.now() - info['start_time'])
-            
-            # Get dashboard data
-            dashboard_data = info.get('dashboard_data', {
-                'cpu': '--%',
-                'memory': '-- MB',
-                'network': '--',
-                'power': '--'
-            })
-            
-            # Create report content with dashboard information
-            report_content = f"""Auto-Terminator Process Report
-==============================
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-PID: {pid}
-
-PROCESS INFORMATION
--------------------
-PID: {pid}
-Status: {info['status']}
-Started: {info['start_time'].strftime('%Y-%m-%d %H:%M:%S') if info['start_time'] else 'Unknown'}
-Ended: {info['end_time'].strftime('%Y-%m-%d %H:%M:%S') if info['end_time'] else 'N/A'}
-Duration: {duration}
-Auto-execute AI: {'Yes' if info['auto_execute'] else 'No'}
-Timeout: {info['timeout']} seconds
-
-DASHBOARD INFORMATION
----------------------
-CPU Usage: {dashboard_data['cpu']}
-Memory Usage: {dashboard_data['memory']}
-Network Connections: {dashboard_data['network']}
-Power Consumption: {dashboard_data['power']}
-
-LOG CONTENT
------------
-{log_content}
-"""
-            
             # Ask user where to save the report
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
                 filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
                 title=f"Save Report for PID {pid}",
-                initialfile=f"auto_terminator_report_pid_{pid}.txt"
+                initialfile=report_writer.report_file_name(pid)
             )
             
             if file_path:
                 with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(report_content)
+                    self.service.write_report(pid, f)
                 messagebox.showinfo("Report Downloaded", f"Report for PID {pid} saved successfully to:\n{file_path}")
             else:
                 print(f"Report download for PID {pid} cancelled by user")
@@ -1101,7 +1112,7 @@ LOG CONTENT
             print(error_msg)
             messagebox.showerror("Error", error_msg)
 
-    def delete_pid_report(self, pid, card_frame, library_window):
+    def delete_pid_report(self, pid, library_window, on_deleted=None):
         """Delete a PID report from the library"""
         try:
             # Confirm deletion
@@ -1110,11 +1121,11 @@ LOG CONTENT
             if not result:
                 return
             
-            # Remove from process library
-            if pid in self.process_library:
-                del self.process_library[pid]
-                # Destroy the card frame
-                card_frame.destroy()
+            # Remove from process library, with its log, history and index postings
+            if self.service.delete_entry(pid):
+                # Drop the row from the library list
+                if on_deleted:
+                    on_deleted(pid)
                 print(f"Deleted report for PID {pid}")
                 
                 # Update the library window title
@@ -1128,95 +1139,158 @@ LOG CONTENT
             messagebox.showerror("Error", error_msg)
 
     def download_all_pid_reports(self, parent_window=None):
-        """Download reports for all PIDs in the library"""
+        """Download reports for all PIDs in the library, on a worker pool with a progress window"""
         try:
             if not self.process_library:
                 messagebox.showinfo("No Processes", "No processes found in the library.")
                 return
             
-            # Ask user where to save the reports
-            directory = filedialog.askdirectory(title="Select Directory to Save Reports")
-            if not directory:
+            # One compressed archive or one file per PID
+            as_archive = messagebox.askyesnocancel(
+                "Download All Reports",
+                "Save all reports as a single compressed archive?\n\n"
+                "Yes: one .zip file\nNo: one .txt file per process",
+                parent=parent_window)
+            if as_archive is None:
                 print("Report download cancelled by user")
                 return
+            if as_archive:
+                archive_path = filedialog.asksaveasfilename(
+                    defaultextension=".zip",
+                    filetypes=[("Zip archives", "*.zip"), ("All files", "*.*")],
+                    title="Save All Reports As",
+                    initialfile=f"auto_terminator_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+                )
+                if not archive_path:
+                    print("Report download cancelled by user")
+                    return
+                export = self.service.export_reports(archive_path=archive_path)
+                destination = archive_path
+            else:
+                # Ask user where to save the reports
+                directory = filedialog.askdirectory(title="Select Directory to Save Reports")
+                if not directory:
+                    print("Report download cancelled by user")
+                    return
+                export = self.service.export_reports(directory=directory)
+                destination = directory
             
-            reports_generated = 0
-            for pid, info in self.process_library.items():
-                try:
-                    # Combine all logs for this process
-                    log_content = "".join(info.get('logs', []))
-                    
-                    # Calculate duration
-                    duration = "N/A"
-                    if info['start_time']:
-                        if info['end_time']:
-                            duration = str(info['end_time'] - info['start_time'])
-                        elif info['status'] == 'Running':
-                            duration = str(datetime.now() - info['start_time'])
-                    
-                    # Get dashboard data
-                    dashboard_data = info.get('dashboard_data', {
-                        'cpu': '--%',
-                        'memory': '-- MB',
-                        'network': '--',
-                        'power': '--'
-                    })
-                    
-                    # Create report content with dashboard information
-                    report_content = f"""Auto-Terminator Process Report
-==============================
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-PID: {pid}
-
-PROCESS INFORMATION
--------------------
-PID: {pid}
-Status: {info['status']}
-Started: {info['start_time'].strftime('%Y-%m-%d %H:%M:%S') if info['start_time'] else 'Unknown'}
-Ended: {info['end_time'].strftime('%Y-%m-%d %H:%M:%S') if info['end_time'] else 'N/A'}
-Duration: {duration}
-Auto-execute AI: {'Yes' if info['auto_execute'] else 'No'}
-Timeout: {info['timeout']} seconds
-
-DASHBOARD INFORMATION
----------------------
-CPU Usage: {dashboard_data['cpu']}
-Memory Usage: {dashboard_data['memory']}
-Network Connections: {dashboard_data['network']}
-Power Consumption: {dashboard_data['power']}
-
-LOG CONTENT
------------
-{log_content}
-"""
-                    
-                    # Save report
-                    file_path = os.path.join(directory, f"auto_terminator_report_pid_{pid}.txt")
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(report_content)
-                    reports_generated += 1
-                    
-                except Exception as e:
-                    print(f"Error generating report for PID {pid}: {str(e)}")
-                    continue
+            # Progress window, polled from the Tk thread while the workers run
+            progress_window = tk.Toplevel(parent_window or self.master)
+            progress_window.title("📥 Generating Reports")
+            progress_window.geometry("400x140")
+            progress_window.configure(bg='#2b2b2b')
+            progress_label = tk.Label(progress_window, text=f"0 of {export.total} reports",
+                                    bg='#2b2b2b', fg='white', font=('Segoe UI', 10))
+            progress_label.pack(pady=(20, 10))
+            progress_bar = ttk.Progressbar(progress_window, maximum=max(export.total, 1), length=340)
+            progress_bar.pack()
+            tk.Button(progress_window, text="Cancel", command=export.cancel,
+                     bg='#666666', fg='white', font=('Segoe UI', 9),
+                     relief='flat', bd=0, padx=15, pady=3, cursor='hand2').pack(pady=10)
             
-            messagebox.showinfo("Reports Generated", f"Successfully generated {reports_generated} reports in:\n{directory}")
+            def poll_export():
+                progress_bar['value'] = export.completed
+                progress_label.config(text=f"{export.completed} of {export.total} reports")
+                if not export.finished.is_set():
+                    progress_window.after(100, poll_export)
+                    return
+                progress_window.destroy()
+                for pid, error in export.failed:
+                    print(f"Error generating report for PID {pid}: {error}")
+                if export.error:
+                    messagebox.showerror("Error", f"Error downloading all PID reports: {export.error}")
+                    return
+                cancelled = " (cancelled)" if export.cancelled else ""
+                messagebox.showinfo("Reports Generated",
+                                    f"Successfully generated {export.written} reports{cancelled} in:\n{destination}")
+                
+                # Close the library window if it was open
+                if parent_window and parent_window.winfo_exists():
+                    parent_window.destroy()
             
-            # Close the library window if it was open
-            if parent_window:
-                parent_window.destroy()
+            poll_export()
                 
         except Exception as e:
             error_msg = f"Error downloading all PID reports: {str(e)}"
             print(error_msg)
             messagebox.showerror("Error", error_msg)
 
+    def export_library_data(self, parent_window=None):
+        """Export the library and its metric history as machine-readable data, off the UI thread"""
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".jsonl",
+                filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv"), ("Columnar", "*.ipmcol")],
+                title="Export Library Data As",
+                initialfile=f"auto_terminator_library_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+                parent=parent_window
+            )
+            if not file_path:
+                print("Library export cancelled by user")
+                return
+            import library_export
+            library_export.format_for_path(file_path)  # Reject unknown extensions before starting
+            
+            outcome = {}
+            
+            def run_export():
+                try:
+                    outcome['result'] = self.service.export_library(file_path)
+                except Exception as e:
+                    outcome['error'] = str(e)
+            
+            export_thread = threading.Thread(target=run_export, daemon=True)
+            export_thread.start()
+            
+            def poll_export():
+                if export_thread.is_alive():
+                    self.master.after(100, poll_export)
+                    return
+                if 'error' in outcome:
+                    messagebox.showerror("Error", f"Error exporting library data: {outcome['error']}")
+                    return
+                result = outcome['result']
+                messagebox.showinfo("Library Exported",
+                                    f"Exported {result['entries']} entries and {result['samples']} metric samples "
+                                    f"in {result['elapsed_seconds']:.1f}s to:\n" + "\n".join(result['paths']))
+            
+            poll_export()
+            
+        except Exception as e:
+            error_msg = f"Error exporting library data: {str(e)}"
+            print(error_msg)
+            messagebox.showerror("Error", error_msg)
+
     def on_closing(self):
-        self.stop_terminal()
+        self.cancel_resource_updates()
+        self.cancel_process_table_updates()
+        self.service.remove_listener(self._on_service_event)
+        if self.api_server:
+            self.api_server.stop()
+        # Stops every running session
+        self.service.close()
         self.master.destroy()
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Auto-Terminator Dashboard")
+    parser.add_argument("--api-port", type=int, default=None,
+                        help="Also serve the service's JSON API on 127.0.0.1 at this port")
+    parser.add_argument("--monitor-process", action="store_true",
+                        help="Run the monitor and dashboard sampling in a separate process, off the GUI's interpreter")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = AutoTerminatorManager(root)
+    service = auto_terminator_service.AutoTerminatorService(monitor_process=args.monitor_process)
+    app = AutoTerminatorManager(root, service)
+    if args.api_port is not None:
+        # Imported only when serving, so the plain GUI never loads http.server
+        import service_api
+        app.api_server = service_api.ServiceAPIServer(app.service, port=args.api_port,
+                                                      token=os.environ.get('AUTO_TERMINATOR_API_TOKEN'))
+        app.api_server.start()
+        print(f"Service API listening on {app.api_server.url}")
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
\ No newline at end of file
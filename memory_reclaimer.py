@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Memory Reclaimer
+Reclaims memory when the host runs short by ending the largest idle monitored
+processes first, without shortening the normal inactivity timeout. Processes are
+terminated rather than suspended: a suspended process keeps its RSS, so it would
+not bring availability back toward the watermark.
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Action applied to reclaimed processes, as reported in events
+ACTION_TERMINATE = 'terminate'
+
+
+class MemoryReclaimer:
+    def __init__(self, low_watermark_percent: float = 10.0, high_watermark_percent: float = 15.0,
+                 max_per_check: int = 1, check_interval_seconds: float = 1.0):
+        """
+        Initialize the memory reclaimer.
+
+        Args:
+            low_watermark_percent: Start reclaiming when available memory drops below this percentage
+            high_watermark_percent: Stop reclaiming once available memory is back above this percentage
+            max_per_check: Processes reclaimed per check, so memory can settle between steps
+            check_interval_seconds: Minimum time between memory checks
+        """
+        if high_watermark_percent < low_watermark_percent:
+            raise ValueError("High watermark must not be below the low watermark.")
+        self.low_watermark_percent = low_watermark_percent
+        self.high_watermark_percent = high_watermark_percent
+        self.max_per_check = max_per_check
+        self.check_interval_seconds = check_interval_seconds
+        self.reclaiming = False
+        self._last_check = None
+        # Metrics
+        self.available_percent = None
+        self.reclaimed_count = 0
+        self.reclaimed_bytes = 0
+        self.events = deque(maxlen=50)
+
+    def check(self, monitor) -> List[int]:
+        """
+        Check memory availability and reclaim idle processes if needed.
+
+        Args:
+            monitor: InactiveProcessMonitor whose processes may be reclaimed
+
+        Returns:
+            List of PIDs reclaimed during this check
+        """
+        now = monitor.clock.time()
+        if self._last_check is not None and now - self._last_check < self.check_interval_seconds:
+            return []
+        self._last_check = now
+
+        memory = monitor.process_source.virtual_memory()
+        self.available_percent = 100.0 * memory.available / memory.total if memory.total else 100.0
+
+        if not self.reclaiming and self.available_percent < self.low_watermark_percent:
+            self.reclaiming = True
+            logger.warning(f"Available memory {self.available_percent:.1f}% below low watermark "
+                           f"{self.low_watermark_percent}%, reclaiming idle processes")
+        elif self.reclaiming and self.available_percent >= self.high_watermark_percent:
+            self.reclaiming = False
+            logger.info(f"Available memory {self.available_percent:.1f}% back above high watermark "
+                        f"{self.high_watermark_percent}%, reclamation stopped")
+        if not self.reclaiming:
+            return []
+
+        reclaimed = []
+        for pid, rss in self._candidates(monitor)[:self.max_per_check]:
+            name = monitor.monitored_processes[pid]['name']
+            logger.info(f"Reclaiming {rss / (1024 * 1024):.1f} MB from idle process {pid} ({name}) "
+                        f"by {ACTION_TERMINATE}, available memory {self.available_percent:.1f}%")
+            monitor._terminate_process(pid)
+            monitor.remove_process(pid)
+            reclaimed.append(pid)
+            self.reclaimed_count += 1
+            self.reclaimed_bytes += rss
+            self.events.append({
+                'time': now,
+                'pid': pid,
+                'name': name,
+                'rss': rss,
+                'action': ACTION_TERMINATE,
+                'available_percent': round(self.available_percent, 1),
+            })
+        if self.reclaiming and not reclaimed:
+            logger.debug("Memory is low but no idle monitored process can be reclaimed")
+        return reclaimed
+
+    def _candidates(self, monitor) -> List:
+        """Idle, non-protected monitored processes as (pid, rss), largest first."""
+        candidates = []
+        for pid, process_info in list(monitor.monitored_processes.items()):
+            if monitor.is_terminal_pid(pid):
+                continue
+            if monitor.is_protected_process(process_info['name']):
+                continue
+            if not process_info.get('idle'):
+                continue
+            candidates.append((pid, process_info['last_rss']))
+        candidates.sort(key=lambda candidate: candidate[1], reverse=True)
+        return candidates
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return a snapshot of the reclaimer's metrics."""
+        return {
+            'available_percent': round(self.available_percent, 1) if self.available_percent is not None else None,
+            'reclaiming': self.reclaiming,
+            'low_watermark_percent': self.low_watermark_percent,
+            'high_watermark_percent': self.high_watermark_percent,
+            'reclaimed_count': self.reclaimed_count,
+            'reclaimed_mb': round(self.reclaimed_bytes / (1024 * 1024), 2),
+            'events': list(self.events),
+        }
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Metric History
+Fixed-size, in-memory metric history for the dashboard charts and PID reports.
+Each history keeps the most recent samples in a ring buffer plus a coarser
+rollup ring (per-bucket peaks) covering a much longer span, so memory stays
+flat however long a session runs. Rings grow to their capacity as samples
+arrive, and only the most recently used per-PID histories are kept. Series are downsampled with
+Largest-Triangle-Three-Buckets (LTTB) to a fixed number of points, so the cost
+of drawing a chart does not depend on how many samples were taken.
+"""
+
+import array
+import collections
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from process_library import METRIC_FIELDS
+
+# Points a chart or report series is downsampled to
+DEFAULT_POINTS = 120
+
+# Session (dashboard) history: one hour of 1s samples, then three days of one-minute peaks
+SESSION_RAW_CAPACITY = 3600
+SESSION_ROLLUP_CAPACITY = 3 * 24 * 60
+SESSION_ROLLUP_EVERY = 60
+# Per-PID history: ten minutes of samples, then six hours of 30-sample peaks
+PID_RAW_CAPACITY = 600
+PID_ROLLUP_CAPACITY = 720
+PID_ROLLUP_EVERY = 30
+# Per-PID histories kept; the least recently recorded or read are dropped beyond this
+MAX_PID_HISTORIES = 256
+
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+
+Series = Tuple[List[float], List[float]]
+
+
+def lttb(times: Sequence[float], values: Sequence[float], threshold: int) -> Series:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each of threshold - 2 buckets in
+    between, the point forming the largest triangle with the previously kept
+    point and the next bucket's average, which preserves peaks and troughs.
+
+    Args:
+        times: Sample times, ascending
+        values: Sample values
+        threshold: Number of points to keep
+
+    Returns:
+        (times, values) of the kept points
+    """
+    count = len(times)
+    if threshold >= count or threshold < 3:
+        return list(times), list(values)
+
+    out_times = [times[0]]
+    out_values = [values[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    kept = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            avg_time, avg_value = times[count - 1], values[count - 1]
+        else:
+            span = next_end - next_start
+            avg_time = sum(times[next_start:next_end]) / span
+            avg_value = sum(values[next_start:next_end]) / span
+
+        kept_time, kept_value = times[kept], values[kept]
+        best_area = -1.0
+        best = start
+        for index in range(start, end):
+            area = abs((kept_time - avg_time) * (values[index] - kept_value) -
+                       (kept_time - times[index]) * (avg_value - kept_value))
+            if area > best_area:
+                best_area = area
+                best = index
+        out_times.append(times[best])
+        out_values.append(values[best])
+        kept = best
+
+    out_times.append(times[count - 1])
+    out_values.append(values[count - 1])
+    return out_times, out_values
+
+
+class MetricRing:
+    """Fixed-capacity ring of timestamped samples, one float array per field (NaN when unknown)."""
+
+    def __init__(self, capacity: int, fields: Sequence[str] = METRIC_FIELDS):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        # Grown as samples arrive, so a short-lived process only pays for the samples it has
+        self._times = array.array('d')
+        self._values = {name: array.array('d') for name in self.fields}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, values: Mapping[str, Optional[float]]):
+        """Add a sample, overwriting the oldest once the ring is full."""
+        if len(self._times) < self.capacity:
+            self._times.append(timestamp)
+            for name in self.fields:
+                value = values.get(name)
+                self._values[name].append(math.nan if value is None else value)
+        else:
+            self._times[self._next] = timestamp
+            for name in self.fields:
+                value = values.get(name)
+                self._values[name][self._next] = math.nan if value is None else value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def first_time(self) -> Optional[float]:
+        if not self._count:
+            return None
+        return self._times[(self._next - self._count) % self.capacity]
+
+    def series(self, field: str) -> Series:
+        """Times and values of one field, oldest first."""
+        start = (self._next - self._count) % self.capacity
+        if start + self._count <= self.capacity:
+            times = self._times[start:start + self._count]
+            values = self._values[field][start:start + self._count]
+        else:
+            times = self._times[start:] + self._times[:self._next]
+            values = self._values[field][start:] + self._values[field][:self._next]
+        return times.tolist(), values.tolist()
+
+
+class MetricHistory:
+    def __init__(self, raw_capacity: int = PID_RAW_CAPACITY, rollup_capacity: int = PID_ROLLUP_CAPACITY,
+                 rollup_every: int = PID_ROLLUP_EVERY, fields: Sequence[str] = METRIC_FIELDS):
+        """
+        Initialize a metric history.
+
+        Args:
+            raw_capacity: Most recent samples kept as they were taken
+            rollup_capacity: Rollup points kept for the span before that
+            rollup_every: Samples folded into each rollup point (the peak of each field)
+            fields: Metric names
+        """
+        self.fields = tuple(fields)
+        self.rollup_every = rollup_every
+        self._raw = MetricRing(raw_capacity, self.fields)
+        self._rollup = MetricRing(rollup_capacity, self.fields)
+        self._bucket: Dict[str, float] = {}
+        self._bucket_count = 0
+        self._lock = threading.Lock()
+        self.samples = 0
+
+    def __len__(self) -> int:
+        return self.samples
+
+    def record(self, values: Mapping[str, Optional[float]], timestamp: Optional[float] = None):
+        """
+        Add a sample. Safe to call from any thread.
+
+        Args:
+            values: Metric name -> value (missing or None when unknown)
+            timestamp: Sample time (defaults to now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._raw.append(timestamp, values)
+            for name in self.fields:
+                value = values.get(name)
+                if value is not None:
+                    peak = self._bucket.get(name)
+                    self._bucket[name] = value if peak is None else max(peak, value)
+            self._bucket_count += 1
+            if self._bucket_count >= self.rollup_every:
+                self._rollup.append(timestamp, self._bucket)
+                self._bucket = {}
+                self._bucket_count = 0
+            self.samples += 1
+
+    def series(self, field: str, max_points: Optional[int] = DEFAULT_POINTS) -> Series:
+        """
+        One field's history, oldest first, without unknown values.
+
+        Rollup points cover the time before the oldest raw sample; the result is
+        downsampled with LTTB to max_points (None for every point).
+
+        Returns:
+            (times, values)
+        """
+        with self._lock:
+            raw_times, raw_values = self._raw.series(field)
+            raw_start = self._raw.first_time()
+            rollup_times, rollup_values = self._rollup.series(field)
+        times, values = [], []
+        for timestamp, value in zip(rollup_times, rollup_values):
+            if raw_start is not None and timestamp >= raw_start:
+                break
+            if not math.isnan(value):
+                times.append(timestamp)
+                values.append(value)
+        for timestamp, value in zip(raw_times, raw_values):
+            if not math.isnan(value):
+                times.append(timestamp)
+                values.append(value)
+        if max_points is None:
+            return times, values
+        return lttb(times, values, max_points)
+
+
+class MetricHistoryStore:
+    def __init__(self):
+        """Per-PID histories plus session-level histories for the dashboard."""
+        # History of the most recently started session
+        self.session = MetricHistory(SESSION_RAW_CAPACITY, SESSION_ROLLUP_CAPACITY, SESSION_ROLLUP_EVERY)
+        # Histories of the running sessions, by terminal PID
+        self._sessions: Dict[int, MetricHistory] = {}
+        # Per-PID histories, least recently used first
+        self._histories: Dict[int, MetricHistory] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, pid: int, values: Mapping[str, Optional[float]], timestamp: Optional[float] = None):
+        """Add a sample to a PID's history, creating it on first use and dropping the least recently used."""
+        with self._lock:
+            history = self._histories.get(pid)
+            if history is None:
+                history = self._histories[pid] = MetricHistory()
+                if len(self._histories) > MAX_PID_HISTORIES:
+                    self._histories.popitem(last=False)
+            else:
+                self._histories.move_to_end(pid)
+        history.record(values, timestamp)
+
+    def get(self, pid: int) -> Optional[MetricHistory]:
+        with self._lock:
+            history = self._histories.get(pid)
+            if history is not None:
+                self._histories.move_to_end(pid)
+            return history
+
+    def delete(self, pid: int):
+        with self._lock:
+            self._histories.pop(pid, None)
+
+    def reset_session(self, pid: Optional[int] = None) -> MetricHistory:
+        """
+        Start a new, empty session history.
+
+        Args:
+            pid: Terminal PID of the session, to find its history with session_history()
+
+        Returns:
+            The new history, which also becomes self.session
+        """
+        history = MetricHistory(SESSION_RAW_CAPACITY, SESSION_ROLLUP_CAPACITY, SESSION_ROLLUP_EVERY)
+        with self._lock:
+            if pid is not None:
+                self._sessions[pid] = history
+            self.session = history
+        return history
+
+    def session_history(self, pid: int) -> Optional[MetricHistory]:
+        """History of a running session, by terminal PID."""
+        with self._lock:
+            return self._sessions.get(pid)
+
+    def end_session(self, pid: int):
+        """Forget a stopped session's history (self.session keeps it if it was the latest)."""
+        with self._lock:
+            self._sessions.pop(pid, None)
+
+
+def sparkline(values: Sequence[float]) -> str:
+    """Render values as a line of block characters scaled between their min and max."""
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    if high == low:
+        return SPARK_CHARS[0] * len(values)
+    scale = (len(SPARK_CHARS) - 1) / (high - low)
+    return ''.join(SPARK_CHARS[int(round((value - low) * scale))] for value in values)
+
+
+def format_series(times: Sequence[float], values: Sequence[float], value_format: str = '{:.2f}') -> List[str]:
+    """Format a series as 'HH:MM:SS value' strings."""
+    return [f"{datetime.fromtimestamp(t).strftime('%H:%M:%S')} {value_format.format(v)}"
+            for t, v in zip(times, values)]
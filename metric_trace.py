@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Metric Trace Recording and Replay
+Records the metric stream sampled by InactiveProcessMonitor to a compact binary
+trace file, and replays traces through the activity and termination rules
+offline so thresholds can be tuned without waiting in real time.
+"""
+
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterator, Tuple, Optional, BinaryIO
+import sys
+
+from inactive_process_monitor import (
+    DEFAULT_CPU_THRESHOLD,
+    DEFAULT_MEMORY_THRESHOLD_BYTES,
+    evaluate_activity,
+    check_inactivity,
+)
+
+# File header: magic + format version
+TRACE_MAGIC = b'IPMTRACE'
+TRACE_VERSION = 1
+_HEADER = struct.Struct('<8sH')
+
+# Record types
+RECORD_ADD = 1
+RECORD_SAMPLE = 2
+RECORD_EXIT = 3
+
+# Record layouts (little endian, each prefixed by the record type byte)
+# ADD: timestamp, pid, rss, connections, name length (name bytes follow)
+_ADD = struct.Struct('<BdIQHH')
+# SAMPLE: timestamp, pid, cpu percent, rss, connections
+_SAMPLE = struct.Struct('<BdIfQH')
+# EXIT: timestamp, pid
+_EXIT = struct.Struct('<BdI')
+
+# read_trace() reads the file this much at a time
+TRACE_READ_CHUNK_BYTES = 1024 * 1024
+
+# Grace period applied by InactiveProcessMonitor.add_process
+DEFAULT_GRACE_PERIOD_SECONDS = 10
+
+
+class MetricTraceRecorder:
+    """Appends monitor samples to a binary trace file."""
+
+    def __init__(self, path: str):
+        """
+        Open a trace file for writing.
+
+        Args:
+            path: Path of the trace file to create (overwritten if it exists)
+        """
+        self.path = path
+        self._file: BinaryIO = open(path, 'wb')
+        self._file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+        # The monitor thread records while the caller may close from another thread
+        self._lock = threading.Lock()
+        self.records_written = 0
+
+    def record_add(self, timestamp: float, pid: int, name: str, rss: int, connections: int):
+        """Record that a process was added to monitoring with its initial metrics."""
+        name_bytes = name.encode('utf-8')[:0xFFFF]
+        self._write(_ADD.pack(RECORD_ADD, timestamp, pid, rss, min(connections, 0xFFFF), len(name_bytes)) + name_bytes)
+
+    def record_sample(self, timestamp: float, pid: int, cpu_percent: float, rss: int, connections: int):
+        """Record one activity sample for a monitored process."""
+        self._write(_SAMPLE.pack(RECORD_SAMPLE, timestamp, pid, cpu_percent, rss, min(connections, 0xFFFF)))
+
+    def record_exit(self, timestamp: float, pid: int):
+        """Record that a monitored process is no longer running."""
+        self._write(_EXIT.pack(RECORD_EXIT, timestamp, pid))
+
+    def _write(self, data: bytes):
+        with self._lock:
+            if self._file:
+                self._file.write(data)
+                self.records_written += 1
+
+    def close(self):
+        """Flush and close the trace file."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def read_trace(path: str) -> Iterator[Tuple]:
+    """
+    Iterate over the records of a trace file.
+
+    Args:
+        path: Path of the trace file
+
+    Yields:
+        (RECORD_ADD, timestamp, pid, name, rss, connections),
+        (RECORD_SAMPLE, timestamp, pid, cpu_percent, rss, connections) or
+        (RECORD_EXIT, timestamp, pid)
+    """
+    with open(path, 'rb') as f:
+        data = f.read(max(_HEADER.size, TRACE_READ_CHUNK_BYTES))
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not a metric trace file")
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a metric trace file")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {version} in {path}")
+
+        # The file is read a chunk at a time; a record split across chunks waits for the next one
+        offset = _HEADER.size
+        base = 0  # File offset of data[0]
+        sample_unpack = _SAMPLE.unpack_from
+        while True:
+            end = len(data)
+            while offset < end:
+                record_type = data[offset]
+                if record_type == RECORD_SAMPLE:
+                    if offset + _SAMPLE.size > end:
+                        break
+                    yield sample_unpack(data, offset)
+                    offset += _SAMPLE.size
+                elif record_type == RECORD_ADD:
+                    if offset + _ADD.size > end:
+                        break
+                    _, timestamp, pid, rss, connections, name_length = _ADD.unpack_from(data, offset)
+                    if offset + _ADD.size + name_length > end:
+                        break
+                    name_start = offset + _ADD.size
+                    name = data[name_start:name_start + name_length].decode('utf-8', errors='replace')
+                    offset = name_start + name_length
+                    yield (RECORD_ADD, timestamp, pid, name, rss, connections)
+                elif record_type == RECORD_EXIT:
+                    if offset + _EXIT.size > end:
+                        break
+                    yield _EXIT.unpack_from(data, offset)
+                    offset += _EXIT.size
+                else:
+                    raise ValueError(f"Corrupt trace record type {record_type} at offset {base + offset}")
+            chunk = f.read(TRACE_READ_CHUNK_BYTES)
+            if not chunk:
+                return  # Anything left is a truncated trailing record from an interrupted recording
+            data = data[offset:] + chunk
+            base += offset
+            offset = 0
+
+
+class ReplayResult:
+    """Outcome of replaying a trace."""
+
+    def __init__(self):
+        # PID -> {'name', 'terminated_at', 'offset_seconds', 'inactive_seconds'}
+        self.terminations: Dict[int, Dict[str, Any]] = {}
+        # PID -> name for processes that exited on their own
+        self.exited: Dict[int, str] = {}
+        self.samples = 0
+        self.trace_seconds = 0.0
+        self.elapsed_seconds = 0.0
+
+    @property
+    def speedup(self) -> float:
+        """How many times faster than real time the replay ran."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.trace_seconds / self.elapsed_seconds
+
+
+def replay_trace(path: str, timeout_seconds: float = 30,
+                 cpu_threshold: float = DEFAULT_CPU_THRESHOLD,
+                 memory_threshold_bytes: int = DEFAULT_MEMORY_THRESHOLD_BYTES,
+                 grace_period_seconds: float = DEFAULT_GRACE_PERIOD_SECONDS) -> ReplayResult:
+    """
+    Feed a recorded trace through the monitor's activity and termination rules.
+
+    Args:
+        path: Path of the trace file
+        timeout_seconds: Inactivity timeout to evaluate
+        cpu_threshold: CPU percentage above which a process is active
+        memory_threshold_bytes: RSS change above which a process is active
+        grace_period_seconds: Grace period for newly added processes
+
+    Returns:
+        ReplayResult describing when each PID would have been terminated
+    """
+    result = ReplayResult()
+    processes: Dict[int, Dict[str, Any]] = {}
+    first_timestamp: Optional[float] = None
+    last_timestamp = 0.0
+    started = time.perf_counter()
+
+    for record in read_trace(path):
+        record_type, timestamp, pid = record[0], record[1], record[2]
+        if first_timestamp is None:
+            first_timestamp = timestamp
+        last_timestamp = timestamp
+
+        if record_type == RECORD_SAMPLE:
+            process_info = processes.get(pid)
+            if process_info is None:
+                continue  # Unknown, terminated or exited PID
+            result.samples += 1
+            now = datetime.fromtimestamp(timestamp)
+            is_active = evaluate_activity(process_info, record[3], record[4], record[5], now,
+                                          cpu_threshold, memory_threshold_bytes)[0]
+            if not is_active:
+                timed_out, inactive_seconds, _ = check_inactivity(process_info, now, timeout_seconds)
+                if timed_out:
+                    result.terminations[pid] = {
+                        'name': process_info['name'],
+                        'terminated_at': now,
+                        'offset_seconds': timestamp - first_timestamp,
+                        'inactive_seconds': inactive_seconds,
+                    }
+                    del processes[pid]
+        elif record_type == RECORD_ADD:
+            now = datetime.fromtimestamp(timestamp)
+            processes[pid] = {
+                'name': record[3],
+                'last_activity_time': now,
+                'start_time': now,
+                'last_rss': record[4],
+                'last_connections': record[5],
+                'grace_period_seconds': grace_period_seconds,
+                'checks_count': 0,
+            }
+        elif record_type == RECORD_EXIT:
+            process_info = processes.pop(pid, None)
+            if process_info is not None:
+                result.exited[pid] = process_info['name']
+
+    result.elapsed_seconds = time.perf_counter() - started
+    if first_timestamp is not None:
+        result.trace_seconds = last_timestamp - first_timestamp
+    return result
+
+
+def main():
+    """Replay a trace file from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a metric trace through the inactivity rules")
+    parser.add_argument("trace", help="Trace file recorded with --record-trace")
+    parser.add_argument("--timeout", type=float, default=30, help="Inactivity timeout in seconds (default: 30)")
+    parser.add_argument("--cpu-threshold", type=float, default=DEFAULT_CPU_THRESHOLD,
+                        help=f"CPU percentage counted as activity (default: {DEFAULT_CPU_THRESHOLD})")
+    parser.add_argument("--memory-threshold-kb", type=float, default=DEFAULT_MEMORY_THRESHOLD_BYTES / 1024,
+                        help=f"RSS change in KB counted as activity (default: {DEFAULT_MEMORY_THRESHOLD_BYTES // 1024})")
+    parser.add_argument("--grace-period", type=float, default=DEFAULT_GRACE_PERIOD_SECONDS,
+                        help=f"Grace period for new processes in seconds (default: {DEFAULT_GRACE_PERIOD_SECONDS})")
+
+    args = parser.parse_args()
+
+    try:
+        result = replay_trace(args.trace, args.timeout, args.cpu_threshold,
+                              int(args.memory_threshold_kb * 1024), args.grace_period)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error replaying trace: {e}")
+
+    for pid, termination in sorted(result.terminations.items(), key=lambda item: item[1]['offset_seconds']):
+        print(f"PID {pid} ({termination['name']}): terminated at +{termination['offset_seconds']:.1f}s "
+              f"({termination['terminated_at'].strftime('%H:%M:%S')}), inactive for {termination['inactive_seconds']:.1f}s")
+    for pid, name in sorted(result.exited.items()):
+        print(f"PID {pid} ({name}): exited on its own")
+    print(f"Replayed {result.samples} samples covering {result.trace_seconds:.1f}s in "
+          f"{result.elapsed_seconds:.3f}s ({result.speedup:.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Metrics Sampler
+Measures each process at most once per tick and shares the result. The
+inactive process monitor and the dashboard sampler both read their CPU, memory
+and connection figures from one MetricsSampler, so a process watched by both is
+measured once instead of twice, and the monitor no longer blocks on
+cpu_percent(interval=0.1) for every process it checks.
+"""
+
+import logging
+import threading
+from collections import namedtuple
+from typing import Dict, Iterable, Optional
+
+import psutil
+
+from monitor_sources import PsutilProcessSource, SystemClock
+
+logger = logging.getLogger(__name__)
+
+# A sample younger than this is reused instead of measuring the process again
+DEFAULT_MAX_AGE_SECONDS = 0.5
+# Handles of processes nobody has asked about for this long are dropped
+HANDLE_IDLE_SECONDS = 30.0
+
+# One measurement of a process; connections is None when it was not sampled
+ProcessSample = namedtuple('ProcessSample', ['timestamp', 'cpu_percent', 'rss', 'connections'])
+
+
+class MetricsSampler:
+    def __init__(self, process_source=None, clock=None, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        """
+        Initialize the sampler.
+
+        Args:
+            process_source: Process provider (defaults to monitor_sources.PsutilProcessSource)
+            clock: Time source for sample ages (defaults to monitor_sources.SystemClock)
+            max_age_seconds: How long a sample is reused before the process is measured again
+        """
+        self.process_source = process_source or PsutilProcessSource()
+        self.clock = clock or SystemClock()
+        self.max_age_seconds = max_age_seconds
+        # Handles kept between samples so cpu_percent() measures since the previous sample without blocking
+        self._processes: Dict[int, psutil.Process] = {}
+        self._samples: Dict[int, ProcessSample] = {}
+        # Held while measuring, so a second reader waits and reuses the result
+        self._lock = threading.Lock()
+        # Metrics
+        self.samples_taken = 0
+        self.samples_reused = 0
+        self.connection_queries = 0
+
+    def sample(self, pids: Iterable[int], with_connections: bool = True) -> Dict[int, ProcessSample]:
+        """
+        Get current metrics for several processes, measuring only those without a fresh sample.
+
+        Args:
+            pids: Process IDs to sample
+            with_connections: Also count inet connections; when False, connections is None
+                for processes measured by this call
+
+        Returns:
+            Dict of PID -> ProcessSample; PIDs that are gone or inaccessible are omitted
+        """
+        wanted = set(pids)
+        with self._lock:
+            now = self.clock.time()
+            results = {}
+            stale = []
+            for pid in wanted:
+                cached = self._samples.get(pid)
+                if (cached is not None and now - cached.timestamp < self.max_age_seconds and
+                        (cached.connections is not None or not with_connections)):
+                    results[pid] = cached
+                    self.samples_reused += 1
+                else:
+                    stale.append(pid)
+            if stale:
+                results.update(self._measure(stale, with_connections, now))
+            self._prune(now)
+            return results
+
+    def latest(self, pid: int) -> Optional[ProcessSample]:
+        """Most recent sample of a process, however old, without measuring it."""
+        with self._lock:
+            return self._samples.get(pid)
+
+    def _measure(self, pids, with_connections: bool, now: float) -> Dict[int, ProcessSample]:
+        """Measure processes in one pass; called with the lock held."""
+        connection_counts = None
+        if with_connections:
+            try:
+                connection_counts = self.process_source.connection_counts(set(pids))
+                self.connection_queries += 1
+            except Exception as e:
+                logger.error(f"Error counting connections: {e}")
+        measured = {}
+        for pid in pids:
+            try:
+                process = self._process(pid)
+                with process.oneshot():
+                    if not process.is_running():
+                        self._forget(pid)
+                        continue
+                    cpu_percent = process.cpu_percent(interval=None)
+                    rss = process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self._forget(pid)
+                continue
+            connections = None
+            if with_connections:
+                if connection_counts is None:
+                    try:
+                        connections = len(process.connections(kind='inet'))
+                    except psutil.NoSuchProcess:
+                        self._forget(pid)
+                        continue
+                    except psutil.AccessDenied:
+                        # Keep the handle so its CPU baseline survives; count no connections
+                        connections = 0
+                else:
+                    connections = connection_counts.get(pid, 0)
+            sample = ProcessSample(now, cpu_percent, rss, connections)
+            self._samples[pid] = sample
+            measured[pid] = sample
+            self.samples_taken += 1
+        return measured
+
+    def _process(self, pid: int) -> psutil.Process:
+        process = self._processes.get(pid)
+        if process is None:
+            process = self._processes[pid] = self.process_source.process(pid)
+            # The first call only sets the baseline for the next sample
+            process.cpu_percent(interval=None)
+        return process
+
+    def _forget(self, pid: int):
+        self._processes.pop(pid, None)
+        self._samples.pop(pid, None)
+
+    def _prune(self, now: float):
+        """Drop handles of processes that no reader has asked about recently."""
+        idle = [pid for pid, sample in self._samples.items() if now - sample.timestamp >= HANDLE_IDLE_SECONDS]
+        for pid in idle:
+            self._forget(pid)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return sampling counters and the number of tracked processes."""
+        with self._lock:
+            return {
+                'tracked_processes': len(self._processes),
+                'samples_taken': self.samples_taken,
+                'samples_reused': self.samples_reused,
+                'connection_queries': self.connection_queries,
+            }
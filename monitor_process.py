@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Monitor Process
+Runs the inactive process monitor and the dashboard sampling in a separate
+process, so their psutil work never competes with the Tk main loop, the log
+tailers and the service threads for one interpreter.
+
+The monitor process writes dashboard snapshots into a MetricsRing, a ring of
+fixed-size float64 records in multiprocessing.shared_memory that the service
+reads in place. Commands (add or remove a terminal, add or resume PIDs, read
+metrics) and the monitor's status, suspension and termination callbacks travel
+over a multiprocessing Pipe.
+"""
+
+import itertools
+import logging
+import math
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Snapshot records kept in the ring; at one snapshot per session per second this
+# covers 64 sessions for 16s, far more than the reader ever falls behind
+DEFAULT_RING_CAPACITY = 1024
+# Fields of a ring record, stored as float64; 'seq' is the record's sequence number
+RECORD_FIELDS = ('seq', 'pid', 'timestamp', 'running', 'cpu', 'memory_mb', 'network', 'power_w')
+RECORD_SIZE = len(RECORD_FIELDS)
+# Bytes before the first record: the number of records written so far (uint64)
+HEADER_BYTES = 8
+# How long the monitor process waits for a command before publishing snapshots again
+COMMAND_POLL_SECONDS = 0.1
+# How long a command waits for the monitor process to answer
+REPLY_TIMEOUT_SECONDS = 10.0
+
+# Events sent by the monitor process, dispatched to the matching callback
+_EVENT_STATUS = 'status'
+_EVENT_SUSPENSION = 'suspension'
+_EVENT_TERMINATED = 'terminated'
+
+
+def _encode(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _decode(value: float):
+    return None if math.isnan(value) else value
+
+
+class MetricsRing:
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int, owner: bool):
+        """
+        Wrap a shared memory block as a snapshot ring; use create() or attach().
+
+        Args:
+            shm: Block of HEADER_BYTES + capacity * RECORD_SIZE * 8 bytes
+            capacity: Number of records
+            owner: Whether this side created the block and unlinks it
+        """
+        self.shm = shm
+        self.capacity = capacity
+        self.owner = owner
+        # Views straight onto the shared block; nothing is copied until a record is decoded
+        self._head = shm.buf[:HEADER_BYTES].cast('Q')
+        self._records = shm.buf[HEADER_BYTES:HEADER_BYTES + capacity * RECORD_SIZE * 8].cast('d')
+        # Reader metrics
+        self.records_dropped = 0
+        self.torn_reads = 0
+
+    @classmethod
+    def create(cls, capacity: int = DEFAULT_RING_CAPACITY) -> 'MetricsRing':
+        """Allocate a new, empty ring."""
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + capacity * RECORD_SIZE * 8)
+        ring = cls(shm, capacity, owner=True)
+        ring._head[0] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> 'MetricsRing':
+        """Open a ring created by another process."""
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching registers the block again with the resource tracker;
+            # a spawned child shares its parent's tracker, so the creator's unlink still clears it
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def records_written(self) -> int:
+        return self._head[0]
+
+    def write(self, snapshot: Dict[str, Any]):
+        """
+        Append a dashboard snapshot, overwriting the oldest record when full. Single writer only.
+
+        Args:
+            snapshot: Dict with 'pid', 'timestamp', 'running', 'cpu', 'memory_mb', 'network', 'power_w'
+        """
+        seq = self._head[0] + 1
+        base = ((seq - 1) % self.capacity) * RECORD_SIZE
+        records = self._records
+        # Marked invalid while the fields change, so a reader never takes a half-written record
+        records[base] = 0.0
+        records[base + 1] = snapshot['pid']
+        records[base + 2] = snapshot['timestamp']
+        records[base + 3] = 1.0 if snapshot['running'] else 0.0
+        records[base + 4] = _encode(snapshot['cpu'])
+        records[base + 5] = _encode(snapshot['memory_mb'])
+        records[base + 6] = _encode(snapshot['network'])
+        records[base + 7] = _encode(snapshot['power_w'])
+        records[base] = float(seq)
+        self._head[0] = seq
+
+    def read_since(self, seq: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Snapshots written after a sequence number, oldest first.
+
+        Records the writer overwrote before they were read are skipped and counted
+        in records_dropped (or torn_reads when overwritten during the read).
+
+        Args:
+            seq: Sequence number of the last record already read (0 for none)
+
+        Returns:
+            (sequence number of the newest record, snapshots)
+        """
+        head = self._head[0]
+        first = max(seq + 1, head - self.capacity + 1)
+        self.records_dropped += first - (seq + 1)
+        snapshots = []
+        for n in range(first, head + 1):
+            base = ((n - 1) % self.capacity) * RECORD_SIZE
+            values = self._records[base:base + RECORD_SIZE].tolist()
+            if values[0] != n or self._records[base] != n:
+                self.torn_reads += 1
+                continue
+            snapshots.append({
+                'pid': int(values[1]),
+                'timestamp': values[2],
+                'running': values[3] == 1.0,
+                'cpu': _decode(values[4]),
+                'memory_mb': _decode(values[5]),
+                'network': None if math.isnan(values[6]) else int(values[6]),
+                'power_w': _decode(values[7]),
+            })
+        return head, snapshots
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            'capacity': self.capacity,
+            'records_written': self.records_written,
+            'records_dropped': self.records_dropped,
+            'torn_reads': self.torn_reads,
+        }
+
+    def close(self):
+        """Release the views and the block; the owner also unlinks it."""
+        self._head.release()
+        self._records.release()
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class MonitorProcess:
+    def __init__(self, ring_capacity: int = DEFAULT_RING_CAPACITY, interval_seconds: float = 1.0):
+        """
+        Service-side handle of the monitor process. Nothing is spawned until start().
+
+        Args:
+            ring_capacity: Snapshot records in the shared ring
+            interval_seconds: Time between dashboard snapshots of each terminal
+        """
+        self.ring_capacity = ring_capacity
+        self.interval_seconds = interval_seconds
+        self.ring: Optional[MetricsRing] = None
+        self.process = None
+        self._conn = None
+        self._reader: Optional[threading.Thread] = None
+        self._send_lock = threading.Lock()
+        # Replies by request id, filled in by the reader thread
+        self._replies: Dict[int, Tuple[bool, Any]] = {}
+        self._replies_ready = threading.Condition()
+        self._request_ids = itertools.count(1)
+        # Sequence number of the last ring record read
+        self._seq = 0
+        # Terminals sent to the monitor process, and those whose children it monitors
+        self.terminals: Set[int] = set()
+        self.monitored_terminals: Set[int] = set()
+        # Callbacks, with the same signatures as the InactiveProcessMonitor ones; run on the reader thread
+        self.process_status_callback: Optional[Callable[[int, bool, Dict[str, Any]], None]] = None
+        self.process_suspension_callback: Optional[Callable[[int, bool], None]] = None
+        self.process_termination_callback: Optional[Callable[[int], None]] = None
+
+    def set_process_status_callback(self, callback: Callable[[int, bool, Dict[str, Any]], None]):
+        self.process_status_callback = callback
+
+    def set_process_suspension_callback(self, callback: Callable[[int, bool], None]):
+        self.process_suspension_callback = callback
+
+    def set_process_termination_callback(self, callback: Callable[[int], None]):
+        self.process_termination_callback = callback
+
+    def start(self):
+        """Create the ring and spawn the monitor process."""
+        # Spawned rather than forked: the service already runs threads
+        context = multiprocessing.get_context('spawn')
+        self.ring = MetricsRing.create(self.ring_capacity)
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=run_monitor_process, name='auto-terminator-monitor', daemon=True,
+                                       args=(child_conn, self.ring.name, self.ring.capacity, self.interval_seconds))
+        self.process.start()
+        child_conn.close()
+        self._reader = threading.Thread(target=self._read_messages, daemon=True)
+        self._reader.start()
+        logger.info(f"Monitor process started (PID: {self.process.pid})")
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def add_terminal(self, pid: int, settings: Dict[str, Any]):
+        """
+        Sample a terminal's dashboard metrics, and monitor its children if the settings ask for it.
+
+        Args:
+            pid: Terminal PID
+            settings: The session's settings (see AutoTerminatorService.start_session)
+
+        Raises:
+            RuntimeError: The monitor process is not running or did not answer
+            Exception: Whatever the monitor process raised while taking the terminal
+        """
+        self._call('add_terminal', pid, dict(settings))
+        self.terminals.add(pid)
+        if settings.get('monitor_inactive'):
+            self.monitored_terminals.add(pid)
+
+    def remove_terminal(self, pid: int):
+        """Stop sampling and monitoring a terminal; waits until the monitor process has let go of it."""
+        self.terminals.discard(pid)
+        self.monitored_terminals.discard(pid)
+        self._call('remove_terminal', pid)
+
+    def add_processes(self, pids: Iterable[int]) -> Dict[int, str]:
+        """Add PIDs to the remote monitor; returns PID -> outcome (see InactiveProcessMonitor.add_processes)."""
+        return self._call('add_pids', list(pids))
+
+    def resume_processes(self, pids: Iterable[int]) -> Tuple[List[int], List[int]]:
+        """Resume suspended processes (all of them when pids is empty); returns (resumed, not suspended)."""
+        return self._call('resume', list(pids))
+
+    def read_snapshots(self) -> List[Dict[str, Any]]:
+        """Dashboard snapshots written since the last call, oldest first."""
+        self._seq, snapshots = self.ring.read_since(self._seq)
+        return snapshots
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Metrics of the monitor process and the ring.
+
+        Returns:
+            Dict with 'pid', 'alive', 'ring', and the remote 'monitor', 'metrics_sampler' and
+            'process_tree' metrics (None when the process does not answer)
+        """
+        metrics = {'pid': self.process.pid if self.process else None, 'alive': self.is_alive(),
+                   'ring': self.ring.get_metrics() if self.ring else None,
+                   'monitor': None, 'metrics_sampler': None, 'process_tree': None}
+        try:
+            metrics.update(self._call('metrics'))
+        except RuntimeError as e:
+            logger.error(f"Error reading monitor process metrics: {e}")
+        return metrics
+
+    def stop(self):
+        """Stop the monitor process (it resumes anything it suspended) and free the ring."""
+        if self.process is None:
+            return
+        try:
+            self._send(('stop', 0))
+        except RuntimeError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            logger.warning(f"Monitor process {self.process.pid} did not stop, terminating it")
+            self.process.terminate()
+            self.process.join(timeout=2)
+        self._conn.close()
+        if self._reader:
+            self._reader.join(timeout=2)
+        self.ring.close()
+        self.process = None
+        self.terminals.clear()
+        self.monitored_terminals.clear()
+        logger.info("Monitor process stopped")
+
+    def _send(self, message: Tuple):
+        with self._send_lock:
+            try:
+                self._conn.send(message)
+            except (OSError, ValueError) as e:
+                raise RuntimeError(f"Monitor process is not running: {e}")
+
+    def _call(self, command: str, *args):
+        """Send a command and wait for its reply; the monitor process's exceptions are re-raised here."""
+        request_id = next(self._request_ids)
+        self._send((command, request_id) + args)
+        with self._replies_ready:
+            if not self._replies_ready.wait_for(lambda: request_id in self._replies or not self._reader_alive(),
+                                                timeout=REPLY_TIMEOUT_SECONDS):
+                raise RuntimeError(f"Monitor process did not answer '{command}'")
+            if request_id not in self._replies:
+                raise RuntimeError("Monitor process is not running")
+            ok, result = self._replies.pop(request_id)
+        if not ok:
+            raise result
+        return result
+
+    def _reader_alive(self) -> bool:
+        return self._reader is not None and self._reader.is_alive()
+
+    def _read_messages(self):
+        """Dispatch events and replies from the monitor process until it goes away"""
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == 'reply':
+                _, request_id, ok, result = message
+                with self._replies_ready:
+                    self._replies[request_id] = (ok, result)
+                    self._replies_ready.notify_all()
+                continue
+            _, event, args = message
+            callback = {
+                _EVENT_STATUS: self.process_status_callback,
+                _EVENT_SUSPENSION: self.process_suspension_callback,
+                _EVENT_TERMINATED: self.process_termination_callback,
+            }.get(event)
+            if callback:
+                try:
+                    callback(*args)
+                except Exception as e:
+                    logger.error(f"Error in monitor process {event} callback: {e}")
+        # Wake any caller still waiting for a reply
+        with self._replies_ready:
+            self._replies_ready.notify_all()
+
+
+class _MonitorHost:
+    def __init__(self, conn, ring: MetricsRing, interval_seconds: float):
+        """The monitor process's side: one tree, sampler, dashboard sampler and monitor for every terminal."""
+        import dashboard_sampler
+        import metrics_sampler
+        import process_tree
+
+        self.conn = conn
+        self.ring = ring
+        self._send_lock = threading.Lock()
+        self.process_tree = process_tree.ProcessTree()
+        self.metrics_sampler = metrics_sampler.MetricsSampler()
+        self.dashboard_sampler = dashboard_sampler.DashboardSampler(interval_seconds)
+        self.dashboard_sampler.set_process_tree(self.process_tree)
+        self.dashboard_sampler.set_metrics_sampler(self.metrics_sampler)
+        # Started with the first terminal that monitors its children, stopped with the last
+        self.monitor = None
+        self._handlers = {
+            'add_terminal': self.add_terminal,
+            'remove_terminal': self.remove_terminal,
+            'add_pids': self.add_pids,
+            'resume': self.resume,
+            'metrics': self.get_metrics,
+        }
+
+    def serve(self):
+        """Run commands and publish snapshots until told to stop or the service goes away."""
+        while True:
+            try:
+                message = self.conn.recv() if self.conn.poll(COMMAND_POLL_SECONDS) else None
+            except (EOFError, OSError):
+                return
+            if message is not None:
+                command, request_id, *args = message
+                if command == 'stop':
+                    return
+                try:
+                    reply = ('reply', request_id, True, self._handlers[command](*args))
+                except Exception as e:
+                    logger.error(f"Monitor process command {command} failed: {e}")
+                    reply = ('reply', request_id, False, e)
+                if request_id:
+                    self._send(reply)
+            self._publish_snapshots()
+
+    def _publish_snapshots(self):
+        while True:
+            try:
+                self.ring.write(self.dashboard_sampler.snapshots.get_nowait())
+            except queue.Empty:
+                return
+
+    def _send(self, message: Tuple):
+        with self._send_lock:
+            try:
+                self.conn.send(message)
+            except (OSError, ValueError):
+                pass  # The service is gone; serve() notices on its next poll
+
+    def _event(self, event: str, *args):
+        self._send(('event', event, args))
+
+    def add_terminal(self, pid: int, settings: Dict[str, Any]):
+        self.process_tree.refresh(force=True)
+        self.dashboard_sampler.add_terminal(pid)
+        if settings.get('monitor_inactive'):
+            try:
+                self._monitor_terminal(pid, settings)
+            except Exception:
+                # The service drops the session, so let go of it here too
+                self.remove_terminal(pid)
+                raise
+
+    def _monitor_terminal(self, pid: int, settings: Dict[str, Any]):
+        import inactive_process_monitor
+        import load_governor
+        import memory_reclaimer
+        import runaway_detector
+
+        monitor = self.monitor
+        if monitor is None:
+            # Defaults for PIDs added by hand that belong to no session
+            monitor = inactive_process_monitor.InactiveProcessMonitor(settings['inactive_timeout'])
+            monitor.set_load_governor(load_governor.LoadGovernor(tick_budget_seconds=monitor.tick_interval))
+            monitor.set_process_status_callback(lambda *args: self._event(_EVENT_STATUS, *args))
+            monitor.set_process_suspension_callback(lambda *args: self._event(_EVENT_SUSPENSION, *args))
+            monitor.set_process_termination_callback(lambda *args: self._event(_EVENT_TERMINATED, *args))
+            monitor.set_process_tree(self.process_tree)
+            monitor.set_metrics_sampler(self.metrics_sampler)
+            monitor.start_monitoring()
+            self.monitor = monitor
+        # Reclamation and runaway throttling are host-wide; the first session asking for them turns them on
+        if settings.get('reclaim_memory') and not monitor.memory_reclaimer:
+            monitor.set_memory_reclaimer(memory_reclaimer.MemoryReclaimer())
+        if settings.get('throttle_runaways') and not monitor.runaway_detector:
+            monitor.set_runaway_detector(runaway_detector.RunawayDetector())
+        idle_action = (inactive_process_monitor.IDLE_ACTION_SUSPEND if settings.get('suspend_idle')
+                       else inactive_process_monitor.IDLE_ACTION_TERMINATE)
+        monitor.add_terminal_pid(pid, timeout_seconds=settings['inactive_timeout'], idle_action=idle_action)
+        children = self.process_tree.descendants(pid)
+        if children:
+            monitor.add_processes(children)
+
+    def remove_terminal(self, pid: int):
+        self.dashboard_sampler.remove_terminal(pid)
+        if self.monitor and self.monitor.is_terminal_pid(pid):
+            self.monitor.remove_terminal_pid(pid)
+            if not self.monitor.terminals:
+                self.monitor.stop_monitoring()
+                self.monitor = None
+
+    def add_pids(self, pids: List[int]) -> Dict[int, str]:
+        if self.monitor is None:
+            raise RuntimeError("No session monitors inactive processes.")
+        return self.monitor.add_processes(pids)
+
+    def resume(self, pids: List[int]) -> Tuple[List[int], List[int]]:
+        if self.monitor is None:
+            return [], pids
+        pids = pids or list(self.monitor.suspended_processes.keys())
+        resumed = [pid for pid in pids if self.monitor.resume_process(pid)]
+        return resumed, [pid for pid in pids if pid not in resumed]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'monitor': self.monitor.get_metrics() if self.monitor else None,
+            'metrics_sampler': self.metrics_sampler.get_metrics(),
+            'process_tree': self.process_tree.get_metrics(),
+        }
+
+    def close(self):
+        self.dashboard_sampler.stop()
+        if self.monitor:
+            # Resumes anything still suspended
+            self.monitor.stop_monitoring()
+            self.monitor = None
+
+
+def run_monitor_process(conn, ring_name: str, ring_capacity: int, interval_seconds: float):
+    """
+    Entry point of the monitor process.
+
+    Args:
+        conn: Pipe end for commands, replies and events
+        ring_name: Shared memory block of the snapshot ring (created by the service)
+        ring_capacity: Records in the ring
+        interval_seconds: Time between dashboard snapshots of each terminal
+    """
+    ring = MetricsRing.attach(ring_name, ring_capacity)
+    host = _MonitorHost(conn, ring, interval_seconds)
+    try:
+        host.serve()
+    finally:
+        host.close()
+        ring.close()
+        conn.close()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Monitor Sources
+Clock and process-source providers for InactiveProcessMonitor. The system
+implementations wrap the wall clock and psutil; the fake implementations are
+deterministic and in-memory so long monitoring runs can execute in virtual time.
+"""
+
+import psutil
+import time
+import os
+import threading
+from collections import namedtuple
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Matches the fields of psutil's memory_info() that the monitor reads
+FakeMemoryInfo = namedtuple('FakeMemoryInfo', ['rss', 'vms'])
+
+# Initial metrics for one process, as returned by snapshot()
+ProcessSnapshot = namedtuple('ProcessSnapshot', ['process', 'name', 'rss', 'connections'])
+
+# Host memory figures, as read from psutil's virtual_memory()
+FakeVirtualMemory = namedtuple('FakeVirtualMemory', ['total', 'available', 'percent'])
+
+# Metric profile for a fake process: virtual time -> (cpu_percent, rss, connections)
+MetricProfile = Callable[[float], Tuple[float, int, int]]
+
+
+class SystemClock:
+    """Wall-clock time source."""
+
+    def now(self) -> datetime:
+        """Current local time."""
+        return datetime.now()
+
+    def time(self) -> float:
+        """Current time as seconds since the epoch."""
+        return time.time()
+
+    def sleep(self, seconds: float):
+        """Block the calling thread for the given number of seconds."""
+        time.sleep(seconds)
+
+
+class FakeClock:
+    """Deterministic virtual clock; sleeping advances time instantly."""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        """
+        Initialize the fake clock.
+
+        Args:
+            start: Initial virtual time as seconds since the epoch
+        """
+        self._time = start
+        self._lock = threading.Lock()
+
+    def now(self) -> datetime:
+        """Current virtual local time."""
+        return datetime.fromtimestamp(self._time)
+
+    def time(self) -> float:
+        """Current virtual time as seconds since the epoch."""
+        return self._time
+
+    def sleep(self, seconds: float):
+        """Advance virtual time without blocking."""
+        self.advance(seconds)
+
+    def advance(self, seconds: float):
+        """
+        Move virtual time forward.
+
+        Args:
+            seconds: Number of seconds to advance
+        """
+        with self._lock:
+            self._time += seconds
+
+
+class PsutilProcessSource:
+    """Process provider backed by psutil."""
+
+    def process(self, pid: int) -> psutil.Process:
+        """
+        Get a handle to a running process.
+
+        Args:
+            pid: Process ID
+
+        Returns:
+            psutil.Process for the PID
+
+        Raises:
+            psutil.NoSuchProcess: If the process does not exist
+        """
+        return psutil.Process(pid)
+
+    def snapshot(self, pids: Iterable[int]) -> Dict[int, ProcessSnapshot]:
+        """
+        Fetch name and initial metrics for several processes in one pass.
+
+        Connection counts come from a single system-wide net_connections() call
+        rather than one connections() call per process.
+
+        Args:
+            pids: Process IDs to snapshot
+
+        Returns:
+            Dict of PID -> ProcessSnapshot; PIDs that are gone or inaccessible are omitted
+        """
+        wanted = set(pids)
+        connection_counts = self.connection_counts(wanted)
+        snapshots = {}
+        for pid in wanted:
+            try:
+                process = psutil.Process(pid)
+                with process.oneshot():
+                    if not process.is_running():
+                        continue
+                    name = process.name()
+                    rss = process.memory_info().rss
+                if connection_counts is None:
+                    connections = len(process.connections(kind='inet'))
+                else:
+                    connections = connection_counts.get(pid, 0)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            snapshots[pid] = ProcessSnapshot(process, name, rss, connections)
+        return snapshots
+
+    def virtual_memory(self):
+        """Host memory statistics."""
+        return psutil.virtual_memory()
+
+    def ppid_map(self) -> Dict[int, int]:
+        """
+        Parent PID of every process, read in one pass over the process table.
+
+        Returns:
+            Dict of PID -> parent PID; processes whose parent cannot be read are left out
+        """
+        parents = {}
+        for process in psutil.process_iter(['pid', 'ppid']):
+            ppid = process.info['ppid']
+            if ppid is not None:
+                parents[process.info['pid']] = ppid
+        return parents
+
+    def connection_counts(self, pids: set) -> Optional[Dict[int, int]]:
+        """Count inet connections per PID from one system-wide query, or None if not permitted."""
+        try:
+            counts: Dict[int, int] = {}
+            for connection in psutil.net_connections(kind='inet'):
+                if connection.pid in pids:
+                    counts[connection.pid] = counts.get(connection.pid, 0) + 1
+            return counts
+        except psutil.AccessDenied:
+            return None
+
+
+class FakeProcess:
+    """In-memory stand-in for psutil.Process with scripted metrics."""
+
+    def __init__(self, source: 'FakeProcessSource', pid: int, name: str, cpu_percent: float,
+                 rss: int, connections: int, profile: Optional[MetricProfile], parent_pid: int = 0):
+        self._source = source
+        self.pid = pid
+        self.parent_pid = parent_pid
+        self._name = name
+        self._cpu_percent = cpu_percent
+        self._rss = rss
+        self._connections = connections
+        self._profile = profile
+        self.running = True
+        self.suspended = False
+        self._nice = 0
+        self._affinity = list(range(4))
+
+    def _metrics(self) -> Tuple[float, int, int]:
+        if self._profile:
+            return self._profile(self._source.clock.time())
+        return self._cpu_percent, self._rss, self._connections
+
+    def _check_running(self):
+        if not self.running:
+            raise psutil.NoSuchProcess(self.pid, self._name)
+
+    def name(self) -> str:
+        self._check_running()
+        return self._name
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def oneshot(self):
+        # Nothing to cache; present so samplers can treat fake and real processes alike
+        return nullcontext()
+
+    def cpu_percent(self, interval: Optional[float] = None) -> float:
+        # The sampling interval is ignored so syscall cost stays out of virtual-time runs
+        self._check_running()
+        return self._metrics()[0]
+
+    def memory_info(self) -> FakeMemoryInfo:
+        self._check_running()
+        rss = self._metrics()[1]
+        return FakeMemoryInfo(rss, rss)
+
+    def connections(self, kind: str = 'inet') -> List[int]:
+        self._check_running()
+        return [0] * self._metrics()[2]
+
+    def terminate(self):
+        self._check_running()
+        self._source.exit(self.pid)
+
+    def kill(self):
+        self._check_running()
+        self._source.exit(self.pid)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        return 0
+
+    def suspend(self):
+        self._check_running()
+        self.suspended = True
+
+    def nice(self, value: Optional[int] = None) -> Optional[int]:
+        self._check_running()
+        if value is None:
+            return self._nice
+        self._nice = value
+
+    def cpu_affinity(self, cpus: Optional[List[int]] = None) -> Optional[List[int]]:
+        self._check_running()
+        if cpus is None:
+            return list(self._affinity)
+        self._affinity = list(cpus)
+
+    def resume(self):
+        self._check_running()
+        self.suspended = False
+
+
+class FakeProcessSource:
+    """Deterministic in-memory process table for virtual-time runs."""
+
+    def __init__(self, clock: Optional[FakeClock] = None):
+        """
+        Initialize the fake process table.
+
+        Args:
+            clock: Clock used to evaluate metric profiles (defaults to a new FakeClock)
+        """
+        self.clock = clock or FakeClock()
+        self.processes: Dict[int, FakeProcess] = {}
+        # PIDs terminated or exited, in order
+        self.exited: List[int] = []
+        self._next_pid = 1000
+        # Host memory; exiting processes return their RSS to available memory
+        self.memory_total = 16 * 1024 ** 3
+        self.memory_available = 8 * 1024 ** 3
+
+    def spawn(self, name: str = 'fake.exe', cpu_percent: float = 0.0, rss: int = 10 * 1024 * 1024,
+              connections: int = 0, profile: Optional[MetricProfile] = None, parent_pid: int = 0) -> int:
+        """
+        Create a fake running process.
+
+        Args:
+            name: Process name
+            cpu_percent: Constant CPU usage reported when no profile is given
+            rss: Constant resident set size in bytes when no profile is given
+            connections: Constant inet connection count when no profile is given
+            profile: Optional function of virtual time returning (cpu_percent, rss, connections)
+            parent_pid: PID reported as the parent by ppid_map()
+
+        Returns:
+            PID of the new process
+        """
+        pid = self._next_pid
+        self._next_pid += 1
+        self.processes[pid] = FakeProcess(self, pid, name, cpu_percent, rss, connections, profile, parent_pid)
+        return pid
+
+    def set_metrics(self, pid: int, cpu_percent: Optional[float] = None, rss: Optional[int] = None,
+                    connections: Optional[int] = None):
+        """Change the constant metrics of a fake process."""
+        process = self.processes[pid]
+        if cpu_percent is not None:
+            process._cpu_percent = cpu_percent
+        if rss is not None:
+            process._rss = rss
+        if connections is not None:
+            process._connections = connections
+
+    def exit(self, pid: int):
+        """Mark a fake process as exited."""
+        process = self.processes.get(pid)
+        if process and process.running:
+            process.running = False
+            self.exited.append(pid)
+            self.memory_available = min(self.memory_total, self.memory_available + process._rss)
+
+    def virtual_memory(self) -> FakeVirtualMemory:
+        """Simulated host memory statistics."""
+        percent = 100.0 * (self.memory_total - self.memory_available) / self.memory_total
+        return FakeVirtualMemory(self.memory_total, self.memory_available, percent)
+
+    def connection_counts(self, pids: set) -> Dict[int, int]:
+        """Inet connection counts of the given running fake processes."""
+        counts = {}
+        for pid in pids:
+            process = self.processes.get(pid)
+            if process is not None and process.running:
+                counts[pid] = process._metrics()[2]
+        return counts
+
+    def ppid_map(self) -> Dict[int, int]:
+        """Parent PID of every running fake process."""
+        return {pid: process.parent_pid for pid, process in self.processes.items() if process.running}
+
+    def process(self, pid: int) -> FakeProcess:
+        """
+        Get a handle to a running fake process.
+
+        Raises:
+            psutil.NoSuchProcess: If the process does not exist or has exited
+        """
+        process = self.processes.get(pid)
+        if process is None or not process.running:
+            raise psutil.NoSuchProcess(pid)
+        return process
+
+    def snapshot(self, pids: Iterable[int]) -> Dict[int, ProcessSnapshot]:
+        """Fetch name and initial metrics for several fake processes."""
+        snapshots = {}
+        for pid in set(pids):
+            process = self.processes.get(pid)
+            if process is None or not process.running:
+                continue
+            _, rss, connections = process._metrics()
+            snapshots[pid] = ProcessSnapshot(process, process._name, rss, connections)
+        return snapshots
+
+
+def main():
+    """Simulate a monitoring run in virtual time."""
+    import argparse
+    import logging
+
+    from inactive_process_monitor import InactiveProcessMonitor
+
+    parser = argparse.ArgumentParser(description="Simulate inactivity monitoring in virtual time")
+    parser.add_argument("--processes", type=int, default=10000, help="Number of simulated processes (default: 10000)")
+    parser.add_argument("--busy-ratio", type=float, default=0.1, help="Fraction of processes that stay busy (default: 0.1)")
+    parser.add_argument("--duration", type=float, default=3600, help="Virtual seconds to simulate (default: 3600)")
+    parser.add_argument("--timeout", type=int, default=30, help="Inactivity timeout in seconds (default: 30)")
+    parser.add_argument("--profile", action="store_true", help="Profile the run with cProfile")
+
+    args = parser.parse_args()
+
+    # Per-check logging would dominate a large simulation
+    logging.getLogger('inactive_process_monitor').setLevel(logging.WARNING)
+
+    clock = FakeClock()
+    source = FakeProcessSource(clock)
+    monitor = InactiveProcessMonitor(timeout_seconds=args.timeout, clock=clock, process_source=source)
+    monitor.monitored_children_file = os.devnull
+    busy_count = int(args.processes * args.busy_ratio)
+    for index in range(args.processes):
+        monitor.add_process(source.spawn(f"sim_{index}.exe", cpu_percent=50.0 if index < busy_count else 0.0))
+
+    started = time.perf_counter()
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.runcall(monitor.run_for, args.duration)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+    else:
+        monitor.run_for(args.duration)
+    elapsed = time.perf_counter() - started
+
+    print(f"Simulated {args.duration:.0f}s over {args.processes} processes in {elapsed:.2f}s "
+          f"({args.duration / elapsed:.0f}x real time); terminated {len(source.exited)}, "
+          f"still monitored {len(monitor.monitored_processes)}")
+
+
+if __name__ == "__main__":
+    main()
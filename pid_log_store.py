@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+PID Log Store
+Append-only, disk-backed log storage for the process library. Each library
+entry's log is a series of bounded segment files under a directory named after
+the entry id, so logs survive restarts and a reused PID never shares a log. A
+small in-memory offset index (first line of every segment plus a byte offset
+every INDEX_INTERVAL_LINES lines) lets readers page through a log without
+loading it, so memory use stays flat however long or chatty the session is.
+Logs left by an earlier run are indexed the first time they are touched.
+"""
+
+import bisect
+import codecs
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_SEGMENT_BYTES = 1024 * 1024
+# A byte offset is indexed every this many lines within a segment
+INDEX_INTERVAL_LINES = 256
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class _Segment:
+    """One segment file and its line offset index."""
+
+    __slots__ = ('path', 'first_line', 'line_count', 'size', 'checkpoints', 'ends_with_newline')
+
+    def __init__(self, path: str, first_line: int):
+        self.path = path
+        self.first_line = first_line
+        self.line_count = 0  # Complete lines
+        self.size = 0
+        self.checkpoints = [0]  # Byte offset of line 0, INDEX_INTERVAL_LINES, 2 * INDEX_INTERVAL_LINES, ...
+        self.ends_with_newline = True
+
+
+class PidLogStore:
+    def __init__(self, root_dir: Optional[str] = None, segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        """
+        Initialize the store.
+
+        Args:
+            root_dir: Directory for segment files, kept across runs; a temporary directory
+                (removed by close()) is created if omitted
+            segment_bytes: Size after which an entry's log rolls over to a new segment
+        """
+        self._owns_root = root_dir is None
+        self.root_dir = root_dir or tempfile.mkdtemp(prefix='auto_terminator_logs_')
+        os.makedirs(self.root_dir, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        # Entry id -> segments in order
+        self._segments: Dict[int, List[_Segment]] = {}
+        self._lock = threading.Lock()
+
+    def append(self, entry_id: int, text: str) -> int:
+        """
+        Append text to an entry's log. Safe to call from any thread.
+
+        Args:
+            entry_id: Library entry id
+            text: Text to append; lines are counted by their newlines
+
+        Returns:
+            Line number the text starts on (a line left unterminated by the previous append continues)
+        """
+        if not text:
+            return self.line_count(entry_id)
+        data = text.encode('utf-8')
+        with self._lock:
+            segments = self._load(entry_id)
+            if segments is None:
+                os.makedirs(os.path.join(self.root_dir, str(entry_id)), exist_ok=True)
+                segments = self._segments[entry_id] = []
+            segment = segments[-1] if segments else None
+            # Roll over only on a line boundary so a line never spans segments
+            if segment is None or (segment.size >= self.segment_bytes and segment.ends_with_newline):
+                first_line = segment.first_line + segment.line_count if segment else 0
+                path = os.path.join(self.root_dir, str(entry_id), f"{len(segments):08d}.log")
+                segment = _Segment(path, first_line)
+                segments.append(segment)
+            first_line = segment.first_line + segment.line_count
+
+            with open(segment.path, 'ab') as f:
+                f.write(data)
+            _index_data(segment, data)
+        return first_line
+
+    def entry_ids(self) -> List[int]:
+        """Ids of every entry with a log on disk, including those written by earlier runs."""
+        with self._lock:
+            ids = set(self._segments)
+        try:
+            names = os.listdir(self.root_dir)
+        except OSError:
+            names = []
+        ids.update(int(name) for name in names if name.isdigit())
+        return sorted(ids)
+
+    def line_count(self, entry_id: int) -> int:
+        """Number of lines in an entry's log, counting a trailing unterminated line."""
+        with self._lock:
+            segments = self._load(entry_id)
+            if not segments:
+                return 0
+            last = segments[-1]
+            return last.first_line + last.line_count + (0 if last.ends_with_newline else 1)
+
+    def size_bytes(self, entry_id: int) -> int:
+        """Total size of an entry's log in bytes."""
+        with self._lock:
+            return sum(segment.size for segment in self._load(entry_id) or [])
+
+    def read_lines(self, entry_id: int, start: int, count: int) -> List[str]:
+        """
+        Read a page of lines from an entry's log.
+
+        Args:
+            entry_id: Library entry id
+            start: Index of the first line to read
+            count: Maximum number of lines to read
+
+        Returns:
+            Lines with their newlines; fewer than count at the end of the log
+        """
+        with self._lock:
+            segments = list(self._load(entry_id) or [])
+            positions = [(s.path, s.first_line, s.checkpoints[:], s.size) for s in segments]
+        if not positions or count <= 0:
+            return []
+
+        lines: List[str] = []
+        index = max(0, bisect.bisect_right([first for _, first, _, _ in positions], start) - 1)
+        for path, first_line, checkpoints, size in positions[index:]:
+            # Jump to the nearest indexed line at or before the start line
+            local_start = max(0, start + len(lines) - first_line)
+            checkpoint = min(local_start // INDEX_INTERVAL_LINES, len(checkpoints) - 1)
+            skip = local_start - checkpoint * INDEX_INTERVAL_LINES
+            with open(path, 'rb') as f:
+                f.seek(checkpoints[checkpoint])
+                remaining = size - checkpoints[checkpoint]
+                while remaining > 0 and len(lines) < count:
+                    line = f.readline(remaining)
+                    if not line:
+                        break
+                    remaining -= len(line)
+                    if skip:
+                        skip -= 1
+                        continue
+                    lines.append(line.decode('utf-8', errors='replace'))
+            if len(lines) >= count:
+                break
+        return lines
+
+    def iter_text(self, entry_id: int, chunk_bytes: int = STREAM_CHUNK_BYTES) -> Iterator[str]:
+        """
+        Stream an entry's whole log in chunks.
+
+        Args:
+            entry_id: Library entry id
+            chunk_bytes: Approximate size of each chunk
+
+        Yields:
+            Text chunks in order
+        """
+        with self._lock:
+            positions = [(s.path, s.size) for s in self._load(entry_id) or []]
+        # Incremental decoding keeps multi-byte characters split across chunks intact
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        for path, size in positions:
+            with open(path, 'rb') as f:
+                remaining = size
+                while remaining > 0:
+                    data = f.read(min(chunk_bytes, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    text = decoder.decode(data)
+                    if text:
+                        yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def delete(self, entry_id: int):
+        """Remove an entry's log from memory and disk."""
+        with self._lock:
+            self._segments.pop(entry_id, None)
+            shutil.rmtree(os.path.join(self.root_dir, str(entry_id)), ignore_errors=True)
+
+    def close(self):
+        """Forget all logs, removing the store directory if the store created it."""
+        with self._lock:
+            self._segments = {}
+        if self._owns_root:
+            shutil.rmtree(self.root_dir, ignore_errors=True)
+
+    def _load(self, entry_id: int) -> Optional[List[_Segment]]:
+        """An entry's segments, indexing them from disk if an earlier run wrote them; called with the lock held."""
+        segments = self._segments.get(entry_id)
+        if segments is not None:
+            return segments
+        directory = os.path.join(self.root_dir, str(entry_id))
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith('.log'))
+        except OSError:
+            return None
+        segments = []
+        first_line = 0
+        for name in names:
+            segment = _Segment(os.path.join(directory, name), first_line)
+            with open(segment.path, 'rb') as f:
+                while True:
+                    data = f.read(STREAM_CHUNK_BYTES)
+                    if not data:
+                        break
+                    _index_data(segment, data)
+            segments.append(segment)
+            first_line = segment.first_line + segment.line_count
+        self._segments[entry_id] = segments
+        return segments
+
+
+def _index_data(segment: _Segment, data: bytes):
+    """Count the lines of data appended to a segment, indexing the start of every INDEX_INTERVAL_LINES-th line."""
+    offset = 0
+    while True:
+        newline = data.find(b'\n', offset)
+        if newline < 0:
+            break
+        offset = newline + 1
+        segment.line_count += 1
+        if segment.line_count % INDEX_INTERVAL_LINES == 0:
+            segment.checkpoints.append(segment.size + offset)
+    segment.size += len(data)
+    segment.ends_with_newline = data.endswith(b'\n')
@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+Process Library
+Persistent store for the GUI's process library: one row per tracked process in
+a SQLite database (WAL mode), indexed by pid, status, start time and parent pid.
+Frequent status updates are buffered and written in batched transactions, and
+query() answers questions such as "children terminated for inactivity this
+week" from the indexes. Entries are compact ProcessRecords holding numbers and a
+ProcessStatus; display strings are only built when a view or report renders
+them. A sampled metric history is kept per entry for export.
+"""
+
+import enum
+import logging
+import os
+import pathlib
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'),
+                               'AutoTerminator', 'process_library.db')
+# Buffered updates are written at least this often
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+# ...or as soon as this many processes have pending updates
+MAX_PENDING_UPDATES = 500
+# Minimum time between recorded metric history samples of one entry
+DEFAULT_HISTORY_INTERVAL_SECONDS = 5.0
+
+class ProcessStatus(enum.Enum):
+    """Library entry status; the value is the text stored in the database and shown to users."""
+    RUNNING = 'Running'
+    TERMINATED = 'Terminated'
+    CHILD_RUNNING = 'Running (Child Process)'
+    CHILD_INACTIVE = 'Inactive (Child Process)'
+    CHILD_SUSPENDED = 'Suspended (Child Process)'
+    CHILD_RUNAWAY = 'Runaway (Child Process)'
+    CHILD_TERMINATED_INACTIVITY = 'Terminated (Child Process - Inactivity)'
+    CHILD_TERMINATED_RUNAWAY = 'Terminated (Child Process - Runaway)'
+    CHILD_TERMINATED_NATURAL = 'Terminated (Child Process - Natural)'
+    # Given to entries a previous run left open (the app exited without ending them)
+    INTERRUPTED = 'Interrupted (Previous Run)'
+    UNKNOWN = 'Unknown'
+
+    @classmethod
+    def parse(cls, text: Optional[str]) -> 'ProcessStatus':
+        """Parse stored status text, including older rows written with an inactivity suffix ('... - 12.5s')."""
+        try:
+            return cls(text)
+        except ValueError:
+            pass
+        if text and ' - ' in text:
+            try:
+                return cls(text.rsplit(' - ', 1)[0])
+            except ValueError:
+                pass
+        return cls.UNKNOWN
+
+
+# Numeric metrics; updates that set them also record a history sample
+METRIC_FIELDS = ('cpu_percent', 'memory_mb', 'network_connections', 'power_w')
+
+
+class ProcessRecord:
+    """
+    One library entry. Times are Unix timestamps and metrics plain numbers
+    (None when unknown); display text is only built by the render helpers.
+    """
+
+    __slots__ = ('id', 'pid', 'parent_pid', 'process_name', 'status', 'start_time', 'end_time',
+                 'auto_execute', 'timeout', 'inactive_seconds') + METRIC_FIELDS + ('session_pid',)
+
+    def __init__(self, id: Optional[int] = None, pid: int = 0, parent_pid: Optional[int] = None,
+                 process_name: Optional[str] = None, status: ProcessStatus = ProcessStatus.UNKNOWN,
+                 start_time: Optional[float] = None, end_time: Optional[float] = None,
+                 auto_execute: bool = False, timeout: Optional[int] = None,
+                 inactive_seconds: Optional[float] = None, cpu_percent: Optional[float] = None,
+                 memory_mb: Optional[float] = None, network_connections: Optional[int] = None,
+                 power_w: Optional[float] = None, session_pid: Optional[int] = None):
+        self.id = id
+        self.pid = pid
+        self.parent_pid = parent_pid
+        self.process_name = process_name
+        self.status = status
+        self.start_time = start_time
+        self.end_time = end_time
+        self.auto_execute = auto_execute
+        self.timeout = timeout
+        self.inactive_seconds = inactive_seconds
+        self.cpu_percent = cpu_percent
+        self.memory_mb = memory_mb
+        self.network_connections = network_connections
+        self.power_w = power_w
+        # Terminal PID of the session the process ran in (its own PID for terminals)
+        self.session_pid = session_pid
+
+    @property
+    def started(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.start_time) if self.start_time is not None else None
+
+    @property
+    def ended(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.end_time) if self.end_time is not None else None
+
+    def status_text(self) -> str:
+        """Status as shown to users, with the inactivity time for inactive children."""
+        return format_status(self.status, self.inactive_seconds)
+
+    def dashboard_text(self) -> Dict[str, str]:
+        """Metrics formatted the way the dashboard cards show them."""
+        return {
+            'cpu': f"{self.cpu_percent:.1f}%" if self.cpu_percent is not None else '--%',
+            'memory': f"{self.memory_mb:.2f} MB" if self.memory_mb is not None else '-- MB',
+            'network': str(self.network_connections) if self.network_connections is not None else '--',
+            'power': f"{self.power_w:.2f}W" if self.power_w is not None else '--',
+        }
+
+
+def format_status(status: ProcessStatus, inactive_seconds: Optional[float] = None) -> str:
+    """Render a status for display."""
+    if status is ProcessStatus.CHILD_INACTIVE and inactive_seconds is not None:
+        return f"{status.value} - {inactive_seconds:.1f}s"
+    return status.value
+
+
+_FIELDS = ProcessRecord.__slots__
+_WRITABLE_FIELDS = frozenset(_FIELDS) - {'id', 'pid'}
+_SELECT = "SELECT " + ", ".join(_FIELDS) + " FROM processes"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pid INTEGER NOT NULL,
+    parent_pid INTEGER,
+    process_name TEXT,
+    status TEXT NOT NULL,
+    start_time REAL,
+    end_time REAL,
+    auto_execute INTEGER NOT NULL DEFAULT 0,
+    timeout INTEGER,
+    inactive_seconds REAL,
+    cpu_percent REAL,
+    memory_mb REAL,
+    network_connections INTEGER,
+    power_w REAL,
+    session_pid INTEGER
+);
+CREATE TABLE IF NOT EXISTS metric_samples (
+    entry_id INTEGER NOT NULL REFERENCES processes (id) ON DELETE CASCADE,
+    time REAL NOT NULL,
+    cpu_percent REAL,
+    memory_mb REAL,
+    network_connections INTEGER,
+    power_w REAL
+);
+CREATE INDEX IF NOT EXISTS idx_metric_samples_entry ON metric_samples (entry_id, time);
+CREATE INDEX IF NOT EXISTS idx_processes_pid ON processes (pid);
+CREATE INDEX IF NOT EXISTS idx_processes_status ON processes (status, start_time);
+CREATE INDEX IF NOT EXISTS idx_processes_start_time ON processes (start_time);
+CREATE INDEX IF NOT EXISTS idx_processes_parent_pid ON processes (parent_pid);
+CREATE INDEX IF NOT EXISTS idx_processes_session_pid ON processes (session_pid, start_time);
+"""
+
+# Columns added after the first release
+_ADDED_COLUMNS = {
+    'cpu_percent': 'REAL',
+    'memory_mb': 'REAL',
+    'network_connections': 'INTEGER',
+    'power_w': 'REAL',
+    'inactive_seconds': 'REAL',
+    'session_pid': 'INTEGER',
+}
+
+
+def _column_value(value: Any) -> Any:
+    """Database value of a record field (statuses are stored as their text)."""
+    return value.value if isinstance(value, ProcessStatus) else value
+
+
+class ProcessLibrary:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH,
+                 flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+                 history_interval_seconds: float = DEFAULT_HISTORY_INTERVAL_SECONDS, read_only: bool = False):
+        """
+        Open (or create) the library database.
+
+        Opening does not touch entries left open by a previous run; the owner of the
+        library calls mark_interrupted() once at startup.
+
+        Args:
+            db_path: SQLite database file, or ':memory:'
+            flush_interval_seconds: Maximum time buffered updates wait before being written
+            history_interval_seconds: Minimum time between metric history samples of one entry
+            read_only: Open an existing database for queries only, e.g. next to a running GUI
+        """
+        self.db_path = db_path
+        self.read_only = read_only
+        self.flush_interval_seconds = flush_interval_seconds
+        self.history_interval_seconds = history_interval_seconds
+        # Shared by the Tk thread and monitor callbacks, serialised by the lock
+        if read_only:
+            self._conn = sqlite3.connect(pathlib.Path(os.path.abspath(db_path)).as_uri() + "?mode=ro",
+                                         uri=True, check_same_thread=False)
+        else:
+            if db_path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._migrate()
+            self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        # Entry id -> column values waiting for the next flush, and metric samples to insert
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._pending_samples: List[Tuple] = []
+        # Entry id -> time of its last history sample
+        self._last_sample: Dict[int, float] = {}
+        self._last_flush = time.monotonic()
+        # PID -> entry id for processes added during this run
+        self._run_entries: Dict[int, int] = {}
+        # Metrics
+        self.flush_count = 0
+        self.rows_flushed = 0
+        self.samples_recorded = 0
+
+    def mark_interrupted(self, is_running: Optional[Callable[[int, Optional[float]], bool]] = None) -> int:
+        """
+        Mark entries left open by a previous run as interrupted.
+
+        Only the process that owns the library calls this, once at startup. Entries of
+        processes that are still running, such as another client's session, are kept.
+
+        Args:
+            is_running: is_running(pid, start_time) tells whether an open entry's process is still
+                        alive; without it every open entry is marked
+
+        Returns:
+            Number of entries marked
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, pid, start_time FROM processes WHERE end_time IS NULL AND status != ?",
+                (ProcessStatus.INTERRUPTED.value,)).fetchall()
+            stale = [(ProcessStatus.INTERRUPTED.value, entry_id) for entry_id, pid, start_time in rows
+                     if is_running is None or not is_running(pid, start_time)]
+            if stale:
+                with self._conn:
+                    self._conn.executemany("UPDATE processes SET status = ? WHERE id = ?", stale)
+        if stale:
+            logger.info(f"Marked {len(stale)} library entries left open by a previous run as interrupted")
+        return len(stale)
+
+    def _migrate(self):
+        """Add columns introduced after a database was created."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(processes)")}
+        if not columns:
+            return  # New database; the schema creates everything
+        for name, column_type in _ADDED_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE processes ADD COLUMN {name} {column_type}")
+        if 'inactive_seconds' not in columns:
+            # Older rows kept the inactivity time in the status text
+            prefix = ProcessStatus.CHILD_INACTIVE.value + ' - '
+            rows = self._conn.execute("SELECT id, status FROM processes WHERE substr(status, 1, ?) = ?",
+                                      (len(prefix), prefix)).fetchall()
+            with self._conn:
+                for entry_id, status in rows:
+                    try:
+                        seconds = float(status[len(prefix):].rstrip('s'))
+                    except ValueError:
+                        seconds = None
+                    self._conn.execute("UPDATE processes SET status = ?, inactive_seconds = ? WHERE id = ?",
+                                       (ProcessStatus.CHILD_INACTIVE.value, seconds, entry_id))
+
+    # Writing
+
+    def add(self, pid: int, **fields) -> int:
+        """
+        Add a new entry for a process, written immediately.
+
+        Args:
+            pid: Process ID
+            **fields: ProcessRecord fields: status (a ProcessStatus), start_time and
+                      end_time (Unix timestamps), auto_execute, timeout, process_name,
+                      parent_pid, session_pid, inactive_seconds and the METRIC_FIELDS numbers
+
+        Returns:
+            The new entry's id
+        """
+        self._check_fields(fields)
+        names = ['pid'] + list(fields)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO processes ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                [pid] + [_column_value(value) for value in fields.values()])
+            self._run_entries[pid] = cursor.lastrowid
+            return cursor.lastrowid
+
+    def update(self, pid: int, **fields):
+        """
+        Update the latest entry for a PID. Writes are buffered and flushed in batches.
+
+        Updates that set metrics also add a metric history sample, at most one
+        per history_interval_seconds.
+
+        Args:
+            pid: Process ID
+            **fields: ProcessRecord fields to change (same names as add())
+        """
+        self._check_fields(fields)
+        with self._lock:
+            entry_id = self.entry_id(pid)
+            if entry_id is None:
+                return
+            pending = self._pending.get(entry_id)
+            if pending is None:
+                self._pending[entry_id] = fields
+            else:
+                pending.update(fields)
+            if 'cpu_percent' in fields or 'memory_mb' in fields:
+                now = time.time()
+                last = self._last_sample.get(entry_id)
+                if last is None or now - last >= self.history_interval_seconds:
+                    self._last_sample[entry_id] = now
+                    self._pending_samples.append(
+                        (entry_id, now) + tuple(fields.get(name) for name in METRIC_FIELDS))
+            if (len(self._pending) >= MAX_PENDING_UPDATES or
+                    time.monotonic() - self._last_flush >= self.flush_interval_seconds):
+                self.flush()
+
+    def flush(self):
+        """Write all buffered updates in one transaction."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending and not self._pending_samples:
+                return
+            pending, self._pending = self._pending, {}
+            samples, self._pending_samples = self._pending_samples, []
+            # Group rows by the set of fields they change so each group is one executemany
+            groups: Dict[Tuple[str, ...], List[List[Any]]] = {}
+            for entry_id, fields in pending.items():
+                names = tuple(sorted(fields))
+                groups.setdefault(names, []).append([_column_value(fields[name]) for name in names] + [entry_id])
+            with self._conn:
+                for names, rows in groups.items():
+                    assignments = ", ".join(f"{name} = ?" for name in names)
+                    self._conn.executemany(f"UPDATE processes SET {assignments} WHERE id = ?", rows)
+                if samples:
+                    self._conn.executemany(
+                        f"INSERT INTO metric_samples (entry_id, time, {', '.join(METRIC_FIELDS)}) "
+                        f"VALUES ({', '.join('?' * (len(METRIC_FIELDS) + 2))})", samples)
+            self.flush_count += 1
+            self.rows_flushed += len(pending)
+            self.samples_recorded += len(samples)
+
+    def delete(self, pid: int) -> List[int]:
+        """
+        Delete every entry for a PID.
+
+        Returns:
+            Ids of the deleted entries
+        """
+        with self._lock, self._conn:
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM processes WHERE pid = ?", (pid,))]
+            for entry_id in ids:
+                self._pending.pop(entry_id, None)
+                self._last_sample.pop(entry_id, None)
+            self._pending_samples = [sample for sample in self._pending_samples if sample[0] not in ids]
+            self._conn.execute("DELETE FROM processes WHERE pid = ?", (pid,))
+            self._run_entries.pop(pid, None)
+        return ids
+
+    def close(self):
+        """Flush buffered updates and close the database."""
+        with self._lock:
+            if not self.read_only:
+                self.flush()
+            self._conn.close()
+
+    # Reading
+
+    def is_tracking(self, pid: int) -> bool:
+        """
+        Check whether a PID has an open entry created during this run.
+
+        A PID with only finished or older entries belongs to a different process
+        (PIDs are reused), so it should get a new entry.
+        """
+        with self._lock:
+            entry_id = self._run_entries.get(pid)
+            if entry_id is None:
+                return False
+            record = self._get_record(entry_id)
+            return record is not None and record.end_time is None
+
+    def get(self, pid: int, default=None) -> Optional[ProcessRecord]:
+        """
+        Get the latest entry for a PID.
+
+        Returns:
+            The entry's ProcessRecord, or default
+        """
+        with self._lock:
+            entry_id = self.entry_id(pid)
+            record = self._get_record(entry_id) if entry_id is not None else None
+        return record if record is not None else default
+
+    def get_entry(self, entry_id: int) -> Optional[ProcessRecord]:
+        """Get an entry by id, whichever run created it."""
+        with self._lock:
+            return self._get_record(entry_id)
+
+    def entry_id(self, pid: int, current_run: bool = False) -> Optional[int]:
+        """
+        Id of a PID's entry from this run, else its latest entry.
+
+        Args:
+            pid: Process ID
+            current_run: Only return an entry created during this run
+
+        Returns:
+            The entry id, or None if there is none
+        """
+        with self._lock:
+            entry_id = self._run_entries.get(pid)
+            if entry_id is not None or current_run:
+                return entry_id
+            row = self._conn.execute("SELECT MAX(id) FROM processes WHERE pid = ?", (pid,)).fetchone()
+            return row[0]
+
+    def entry_ids(self) -> Set[int]:
+        """Ids of every entry."""
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT id FROM processes")}
+
+    def __getitem__(self, pid: int) -> ProcessRecord:
+        record = self.get(pid)
+        if record is None:
+            raise KeyError(pid)
+        return record
+
+    def __contains__(self, pid: int) -> bool:
+        return self.entry_id(pid) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT pid) FROM processes").fetchone()[0]
+
+    def summaries(self) -> List[Tuple[int, str, str]]:
+        """
+        List the latest entry of every PID, oldest first, in one query.
+
+        Returns:
+            (pid, process_name, status text) tuples
+        """
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT pid, COALESCE(process_name, ''), status, inactive_seconds FROM processes "
+                "WHERE id IN (SELECT MAX(id) FROM processes GROUP BY pid) ORDER BY id").fetchall()
+        return [(pid, name, format_status(ProcessStatus.parse(status), inactive_seconds))
+                for pid, name, status, inactive_seconds in rows]
+
+    def items(self) -> Iterator[Tuple[int, ProcessRecord]]:
+        """Iterate (pid, record) over the latest entry of every PID, oldest first."""
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                _SELECT + " WHERE id IN (SELECT MAX(id) FROM processes GROUP BY pid) ORDER BY id").fetchall()
+        for row in rows:
+            record = self._row_to_record(row)
+            yield record.pid, record
+
+    def query(self, status: Optional[ProcessStatus] = None, parent_pid: Optional[int] = None,
+              children_only: bool = False, since: Optional[datetime] = None, until: Optional[datetime] = None,
+              limit: Optional[int] = None, session_pid: Optional[int] = None) -> List[ProcessRecord]:
+        """
+        Find entries (all of them, not only each PID's latest) using the indexes.
+
+        For example, children terminated for inactivity this week:
+            query(status=ProcessStatus.CHILD_TERMINATED_INACTIVITY, children_only=True,
+                  since=datetime.now() - timedelta(days=7))
+
+        Args:
+            status: Status to match
+            parent_pid: Only children of this PID
+            children_only: Only entries that have a parent PID
+            since: Only entries started at or after this time
+            until: Only entries started before this time
+            limit: Maximum number of entries
+            session_pid: Only entries of the session with this terminal PID (the terminal included)
+
+        Returns:
+            Matching records, most recently started first
+        """
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status.value)
+        if parent_pid is not None:
+            conditions.append("parent_pid = ?")
+            params.append(parent_pid)
+        elif children_only:
+            conditions.append("parent_pid IS NOT NULL")
+        if session_pid is not None:
+            conditions.append("session_pid = ?")
+            params.append(session_pid)
+        if since is not None:
+            conditions.append("start_time >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            conditions.append("start_time < ?")
+            params.append(until.timestamp())
+        sql = _SELECT
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY start_time DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_record(row) for row in rows]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return a snapshot of the library's write metrics."""
+        with self._lock:
+            return {
+                'pending_updates': len(self._pending),
+                'pending_samples': len(self._pending_samples),
+                'flush_count': self.flush_count,
+                'rows_flushed': self.rows_flushed,
+                'samples_recorded': self.samples_recorded,
+            }
+
+    # Helpers
+
+    def _get_record(self, entry_id: int) -> Optional[ProcessRecord]:
+        row = self._conn.execute(_SELECT + " WHERE id = ?", (entry_id,)).fetchone()
+        if row is None:
+            return None
+        record = self._row_to_record(row)
+        # Buffered updates are not in the database yet
+        for name, value in self._pending.get(entry_id, {}).items():
+            setattr(record, name, value)
+        return record
+
+    @staticmethod
+    def _check_fields(fields: Dict[str, Any]):
+        unknown = set(fields) - _WRITABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown process library fields: {', '.join(sorted(unknown))}")
+
+    @staticmethod
+    def _row_to_record(row: Tuple) -> ProcessRecord:
+        record = ProcessRecord(*row)
+        record.status = ProcessStatus.parse(record.status)
+        record.auto_execute = bool(record.auto_execute)
+        return record
+
+
+def main():
+    """Query the process library from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the persistent process library")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"Library database (default: {DEFAULT_DB_PATH})")
+    parser.add_argument("--status", choices=[status.name.lower() for status in ProcessStatus],
+                        help="Status to match, e.g. child_terminated_inactivity")
+    parser.add_argument("--parent-pid", type=int, help="Only children of this PID")
+    parser.add_argument("--children", action="store_true", help="Only child processes")
+    parser.add_argument("--session-pid", type=int, help="Only processes of the session with this terminal PID")
+    parser.add_argument("--days", type=float, help="Only entries started in the last N days")
+    parser.add_argument("--limit", type=int, help="Maximum number of entries")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"No process library at {args.db}")
+    # Read-only, so querying next to a running GUI or service leaves its entries alone
+    library = ProcessLibrary(args.db, read_only=True)
+    try:
+        started = time.perf_counter()
+        records = library.query(status=ProcessStatus[args.status.upper()] if args.status else None,
+                                parent_pid=args.parent_pid, children_only=args.children,
+                                since=datetime.now() - timedelta(days=args.days) if args.days else None,
+                                limit=args.limit, session_pid=args.session_pid)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        library.close()
+
+    for record in records:
+        started_text = record.started.strftime('%Y-%m-%d %H:%M:%S') if record.started else 'Unknown'
+        print(f"PID {record.pid} ({record.process_name or 'Unknown'}): {record.status_text()}, started {started_text}")
+    print(f"{len(records)} entries in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
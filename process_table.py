@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Process Table
+ttk.Treeview wrapper for the active/inactive process panes. Rows are updated
+incrementally from per-row diffs on the Tk thread, and columns can be sorted
+by clicking their headings.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List, Tuple, Callable
+
+
+class ProcessTable:
+    def __init__(self, parent, columns: List[Tuple[str, str, int]], sort_keys: Dict[str, Callable],
+                 default_sort: str, style: str = 'Process.Treeview', height: int = 8):
+        """
+        Create the table.
+
+        Args:
+            parent: Parent widget
+            columns: (column id, heading text, width) for each column; the first column is the PID
+            sort_keys: Column id -> function mapping a row's values tuple to a sort key
+            default_sort: Column id to sort by initially (descending)
+            style: ttk style name for the Treeview
+            height: Visible rows
+        """
+        self.frame = tk.Frame(parent, bg=parent.cget('bg'))
+        column_ids = [column[0] for column in columns]
+        self.tree = ttk.Treeview(self.frame, columns=column_ids, show='headings', height=height,
+                                 style=style, selectmode='browse')
+        self._headings = {}
+        for column_id, heading, width in columns:
+            self._headings[column_id] = heading
+            anchor = tk.W if column_id == 'name' else tk.E
+            self.tree.column(column_id, width=width, anchor=anchor, stretch=column_id == 'name')
+            if column_id in sort_keys:
+                self.tree.heading(column_id, text=heading, command=lambda c=column_id: self.sort_by(c))
+            else:
+                self.tree.heading(column_id, text=heading)
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.sort_keys = sort_keys
+        self.sort_column = default_sort
+        self.sort_descending = True
+        # PID -> values currently shown, and the current row order
+        self._rows: Dict[int, Tuple] = {}
+        self._order: List[int] = []
+        self._update_heading_arrows()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def sort_by(self, column_id: str):
+        """Sort by a column, toggling direction when it is already the sort column."""
+        if column_id == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column_id
+            self.sort_descending = True
+        self._update_heading_arrows()
+        self._reorder()
+
+    def _update_heading_arrows(self):
+        for column_id, heading in self._headings.items():
+            if column_id == self.sort_column:
+                heading = f"{heading} {'▼' if self.sort_descending else '▲'}"
+            self.tree.heading(column_id, text=heading)
+
+    def update_rows(self, rows: Dict[int, Tuple]) -> int:
+        """
+        Apply new table contents, touching only rows that changed.
+
+        Args:
+            rows: PID -> values tuple (one value per column, PID first)
+
+        Returns:
+            Number of rows inserted, updated or deleted
+        """
+        changes = 0
+        for pid in [pid for pid in self._rows if pid not in rows]:
+            self.tree.delete(pid)
+            del self._rows[pid]
+            changes += 1
+        for pid, values in rows.items():
+            current = self._rows.get(pid)
+            if current is None:
+                self.tree.insert('', tk.END, iid=pid, values=values)
+                changes += 1
+            elif current != values:
+                self.tree.item(pid, values=values)
+                changes += 1
+            else:
+                continue
+            self._rows[pid] = values
+        if changes:
+            self._reorder()
+        return changes
+
+    def _reorder(self):
+        """Move rows into sort order, skipping the work when the order is unchanged."""
+        key = self.sort_keys[self.sort_column]
+        order = sorted(self._rows, key=lambda pid: key(self._rows[pid]), reverse=self.sort_descending)
+        if order == self._order:
+            return
+        for index, pid in enumerate(order):
+            self.tree.move(pid, '', index)
+        self._order = order
+
+    def clear(self):
+        """Remove all rows."""
+        self.update_rows({})
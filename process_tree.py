@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Process Tree
+Shared, incrementally maintained parent -> children index of the host's
+processes. The whole table of parent links is read in one snapshot at most once
+per refresh interval, however many consumers ask, and only PIDs that appeared,
+exited or changed parent touch the index. The dashboard sampler, the inactive
+process monitor and the service's library bookkeeping all query this one tree
+instead of walking the session with psutil's children(recursive=True).
+"""
+
+import logging
+import threading
+from typing import Container, Dict, List, Optional, Set
+
+from monitor_sources import PsutilProcessSource, SystemClock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL_SECONDS = 1.0
+# How far up the tree owning_terminal() traces a process
+MAX_ANCESTRY_DEPTH = 32
+
+
+class ProcessTree:
+    def __init__(self, refresh_interval_seconds: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+                 process_source=None, clock=None):
+        """
+        Initialize an empty tree; the first query takes the first snapshot.
+
+        Args:
+            refresh_interval_seconds: Minimum time between snapshots; queries in between reuse the last one
+            process_source: Provides ppid_map() (defaults to PsutilProcessSource)
+            clock: Provides time() (defaults to SystemClock)
+        """
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.process_source = process_source or PsutilProcessSource()
+        self.clock = clock or SystemClock()
+        # PID -> parent PID, as of the last snapshot
+        self._parents: Dict[int, int] = {}
+        # Parent PID -> child PIDs
+        self._children: Dict[int, Set[int]] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # Serialises snapshots so concurrent callers share one instead of each taking their own
+        self._refresh_lock = threading.Lock()
+        # Metrics
+        self.generation = 0
+        self.snapshots = 0
+        self.pids_added = 0
+        self.pids_removed = 0
+        self.pids_reparented = 0
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Take a new snapshot if the current one is older than the refresh interval.
+
+        Args:
+            force: Snapshot even if the current one is fresh
+
+        Returns:
+            Whether a snapshot was taken
+        """
+        with self._refresh_lock:
+            if not force and not self._stale():
+                return False
+            try:
+                parents = self.process_source.ppid_map()
+            except Exception as e:
+                logger.error(f"Error reading the process table: {e}")
+                return False
+            self._apply(parents)
+            return True
+
+    def _stale(self) -> bool:
+        return (self._refreshed_at is None or
+                self.clock.time() - self._refreshed_at >= self.refresh_interval_seconds)
+
+    def _apply(self, parents: Dict[int, int]):
+        """Diff a snapshot against the index and update only what changed."""
+        with self._lock:
+            old = self._parents
+            children = self._children
+            removed = [pid for pid in old if pid not in parents]
+            for pid in removed:
+                self._unlink(pid, old[pid])
+            for pid, ppid in parents.items():
+                previous = old.get(pid)
+                if previous == ppid:
+                    continue
+                if previous is None:
+                    self.pids_added += 1
+                else:
+                    # Same PID, new parent: reparented or reused
+                    self._unlink(pid, previous)
+                    self.pids_reparented += 1
+                siblings = children.get(ppid)
+                if siblings is None:
+                    children[ppid] = {pid}
+                else:
+                    siblings.add(pid)
+            self.pids_removed += len(removed)
+            self._parents = parents
+            self._refreshed_at = self.clock.time()
+            self.generation += 1
+            self.snapshots += 1
+
+    def _unlink(self, pid: int, ppid: int):
+        siblings = self._children.get(ppid)
+        if siblings is not None:
+            siblings.discard(pid)
+            if not siblings:
+                del self._children[ppid]
+
+    def __contains__(self, pid: int) -> bool:
+        self.refresh()
+        with self._lock:
+            return pid in self._parents
+
+    def parent(self, pid: int) -> Optional[int]:
+        """Parent PID of a process, or None if it is not in the snapshot."""
+        self.refresh()
+        with self._lock:
+            return self._parents.get(pid)
+
+    def children(self, pid: int) -> List[int]:
+        """Direct children of a process."""
+        self.refresh()
+        with self._lock:
+            return sorted(self._children.get(pid, ()))
+
+    def owning_terminal(self, pid: int, terminals: Container[int]) -> Optional[int]:
+        """
+        Find the nearest ancestor of a process that is one of the given terminals.
+
+        Args:
+            pid: Process to trace (not itself considered)
+            terminals: Terminal PIDs
+
+        Returns:
+            The terminal PID, or None if none is found within MAX_ANCESTRY_DEPTH levels
+        """
+        self.refresh()
+        with self._lock:
+            ancestor = pid
+            for _ in range(MAX_ANCESTRY_DEPTH):
+                ancestor = self._parents.get(ancestor)
+                if not ancestor:
+                    return None
+                if ancestor in terminals:
+                    return ancestor
+            return None
+
+    def descendants(self, pid: int) -> List[int]:
+        """
+        All descendants of a process, parents before their children.
+
+        Args:
+            pid: Root of the subtree (not included)
+
+        Returns:
+            Descendant PIDs in breadth-first order
+        """
+        self.refresh()
+        with self._lock:
+            result = []
+            # Guard against cycles left by PID reuse between snapshots
+            seen = {pid}
+            frontier = [pid]
+            while frontier:
+                next_frontier = []
+                for parent in frontier:
+                    for child in self._children.get(parent, ()):
+                        if child not in seen:
+                            seen.add(child)
+                            result.append(child)
+                            next_frontier.append(child)
+                frontier = next_frontier
+            return result
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return snapshot counters and the index size."""
+        with self._lock:
+            return {
+                'processes': len(self._parents),
+                'generation': self.generation,
+                'snapshots': self.snapshots,
+                'pids_added': self.pids_added,
+                'pids_removed': self.pids_removed,
+                'pids_reparented': self.pids_reparented,
+            }
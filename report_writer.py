@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Report Writer
+Single engine for PID reports. Reports are produced section by section by a
+generator and streamed to a file object, with the log pulled chunk by chunk
+from the log store, so no report is ever held in memory whole. Bulk exports run
+on a worker pool off the UI thread, optionally into one compressed archive.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import metric_history
+from process_library import ProcessRecord, ProcessStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_WORKERS = 4
+# Points per metric in a report's metric history section
+REPORT_HISTORY_POINTS = 60
+
+# (metric, label, value format) for the metric history section
+_HISTORY_METRICS = (
+    ('cpu_percent', 'CPU Usage (%)', '{:.1f}'),
+    ('memory_mb', 'Memory Usage (MB)', '{:.2f}'),
+    ('network_connections', 'Network Connections', '{:.0f}'),
+    ('power_w', 'Power Consumption (W)', '{:.2f}'),
+)
+
+
+def report_file_name(pid: int) -> str:
+    """File name used for a PID's report."""
+    return f"auto_terminator_report_pid_{pid}.txt"
+
+
+def iter_report_header(pid: int, info: ProcessRecord, now: Optional[datetime] = None,
+                       history: Optional[metric_history.MetricHistory] = None) -> Iterator[str]:
+    """
+    Yield the sections of a PID report up to and including the LOG CONTENT heading.
+
+    Args:
+        pid: Process ID
+        info: Library entry for the process
+        now: Report generation time (defaults to the current time)
+        history: The process's metric history, embedded downsampled when given
+
+    Yields:
+        Report text, one section at a time
+    """
+    now = now or datetime.now()
+
+    started, ended = info.started, info.ended
+
+    # Calculate duration
+    duration = "N/A"
+    if started:
+        if ended:
+            duration = str(ended - started)
+        elif info.status is ProcessStatus.RUNNING:
+            duration = str(now - started)
+
+    dashboard_data = info.dashboard_text()
+
+    yield f"""Auto-Terminator Process Report
+==============================
+Generated on: {now.strftime('%Y-%m-%d %H:%M:%S')}
+PID: {pid}
+
+"""
+    yield f"""PROCESS INFORMATION
+-------------------
+PID: {pid}
+Status: {info.status_text()}
+Started: {started.strftime('%Y-%m-%d %H:%M:%S') if started else 'Unknown'}
+Ended: {ended.strftime('%Y-%m-%d %H:%M:%S') if ended else 'N/A'}
+Duration: {duration}
+Auto-execute AI: {'Yes' if info.auto_execute else 'No'}
+Timeout: {info.timeout} seconds
+
+"""
+    yield f"""DASHBOARD INFORMATION
+---------------------
+CPU Usage: {dashboard_data['cpu']}
+Memory Usage: {dashboard_data['memory']}
+Network Connections: {dashboard_data['network']}
+Power Consumption: {dashboard_data['power']}
+
+"""
+    if history is not None and len(history):
+        yield _history_section(history)
+    yield """LOG CONTENT
+-----------
+"""
+
+
+def _history_section(history: metric_history.MetricHistory) -> str:
+    """The METRIC HISTORY section: a sparkline and the LTTB-downsampled points of each metric."""
+    lines = ["METRIC HISTORY", "--------------"]
+    for field, label, value_format in _HISTORY_METRICS:
+        times, values = history.series(field, REPORT_HISTORY_POINTS)
+        if not times:
+            continue
+        lines.append(f"{label}: {metric_history.sparkline(values)}  "
+                     f"(min {value_format.format(min(values))}, max {value_format.format(max(values))})")
+        points = metric_history.format_series(times, values, value_format)
+        for start in range(0, len(points), 6):
+            lines.append("  " + ", ".join(points[start:start + 6]))
+    return "\n".join(lines) + "\n\n"
+
+
+def iter_report(pid: int, info: ProcessRecord, log_store, now: Optional[datetime] = None,
+                history: Optional[metric_history.MetricHistory] = None) -> Iterator[str]:
+    """
+    Yield a complete PID report: the header sections followed by the log, chunk by chunk.
+
+    Args:
+        pid: Process ID
+        info: Library entry for the process
+        log_store: PidLogStore holding the entry's log
+        now: Report generation time (defaults to the current time)
+        history: The process's metric history, if any
+
+    Yields:
+        Report text in order
+    """
+    yield from iter_report_header(pid, info, now, history)
+    yield from log_store.iter_text(info.id)
+
+
+def write_report(f: TextIO, pid: int, info: ProcessRecord, log_store,
+                 history: Optional[metric_history.MetricHistory] = None) -> int:
+    """
+    Stream a PID report to a text file object.
+
+    Returns:
+        Number of characters written
+    """
+    written = 0
+    for chunk in iter_report(pid, info, log_store, history=history):
+        f.write(chunk)
+        written += len(chunk)
+    return written
+
+
+class ReportExport:
+    def __init__(self, entries: Iterable[Tuple[int, ProcessRecord]], log_store, directory: Optional[str] = None,
+                 archive_path: Optional[str] = None, workers: int = DEFAULT_EXPORT_WORKERS,
+                 histories: Optional[metric_history.MetricHistoryStore] = None):
+        """
+        Prepare a bulk export of PID reports.
+
+        Exactly one of directory and archive_path is given: reports are written as
+        one file per PID into the directory, or compressed into a single zip archive.
+
+        Args:
+            entries: (pid, library entry) pairs to export
+            log_store: PidLogStore holding the logs
+            directory: Output directory for per-PID report files
+            archive_path: Output .zip file
+            workers: Reports generated in parallel
+            histories: Metric histories embedded in the reports
+        """
+        if (directory is None) == (archive_path is None):
+            raise ValueError("Give either an output directory or an archive path.")
+        self.entries: List[Tuple[int, ProcessRecord]] = list(entries)
+        self.log_store = log_store
+        self.directory = directory
+        self.archive_path = archive_path
+        self.workers = workers
+        self.histories = histories
+        # Progress, read by the UI thread while the export runs
+        self.total = len(self.entries)
+        self.completed = 0  # Reports processed, whether written or failed
+        self.written = 0
+        self.failed: List[Tuple[int, str]] = []
+        self.error: Optional[str] = None
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Run the export on a background thread."""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop after the reports already being written."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(self):
+        """Run the export on the calling thread."""
+        try:
+            if self.archive_path:
+                self._export_archive()
+            else:
+                self._export_directory(self.directory, on_written=None)
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Report export failed: {e}")
+        finally:
+            self.finished.set()
+
+    def _export_directory(self, directory: str, on_written):
+        """Write every report into directory on the worker pool, calling on_written(pid, path) as each completes."""
+        # Bulk-export only; not imported with the module so viewing a single report stays cheap
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._write_one, directory, pid, info): pid for pid, info in self.entries}
+            for future in as_completed(futures):
+                pid = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    path = future.result()
+                except Exception as e:
+                    self.failed.append((pid, str(e)))
+                    logger.warning(f"Error generating report for PID {pid}: {e}")
+                else:
+                    if path is None:
+                        continue  # Skipped after cancellation
+                    if on_written:
+                        on_written(pid, path)
+                    self.written += 1
+                self.completed += 1
+                if self._cancel.is_set():
+                    for pending in futures:
+                        pending.cancel()
+
+    def _write_one(self, directory: str, pid: int, info: ProcessRecord) -> Optional[str]:
+        if self._cancel.is_set():
+            return None
+        path = os.path.join(directory, report_file_name(pid))
+        with open(path, "w", encoding="utf-8") as f:
+            history = self.histories.get(pid) if self.histories else None
+            write_report(f, pid, info, self.log_store, history)
+        return path
+
+    def _export_archive(self):
+        """Generate reports in parallel into a scratch directory and compress each into the archive as it lands."""
+        import zipfile
+
+        scratch = tempfile.mkdtemp(prefix='auto_terminator_reports_')
+        try:
+            with zipfile.ZipFile(self.archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                def add_to_archive(pid, path):
+                    archive.write(path, arcname=os.path.basename(path))
+                    os.remove(path)
+                self._export_directory(scratch, on_written=add_to_archive)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Runaway Detector
+Flags monitored processes that do too much rather than too little: sustained
+high CPU or fast RSS growth. Offending processes are throttled with escalating
+actions (renice, CPU-affinity restriction, termination) and restored once they
+calm down.
+"""
+
+import logging
+import sys
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Escalating actions, in order
+ACTION_RENICE = 'renice'
+ACTION_RESTRICT_AFFINITY = 'restrict_affinity'
+ACTION_TERMINATE = 'terminate'
+ESCALATION = [ACTION_RENICE, ACTION_RESTRICT_AFFINITY, ACTION_TERMINATE]
+
+# Priority applied by ACTION_RENICE
+RENICE_PRIORITY = psutil.BELOW_NORMAL_PRIORITY_CLASS if sys.platform == "win32" else 10
+
+
+class RunawayDetector:
+    def __init__(self, cpu_threshold: float = 95.0, sustained_seconds: float = 120.0,
+                 rss_growth_mb_per_minute: float = 200.0, growth_window_seconds: float = 60.0,
+                 escalation_interval_seconds: float = 60.0, calm_seconds: float = 60.0):
+        """
+        Initialize the runaway detector.
+
+        Args:
+            cpu_threshold: CPU percentage counted as runaway when sustained
+            sustained_seconds: How long CPU must stay above the threshold
+            rss_growth_mb_per_minute: RSS growth rate counted as runaway
+            growth_window_seconds: Window over which RSS growth is measured
+            escalation_interval_seconds: Time a process may keep misbehaving before the next action
+            calm_seconds: Time a throttled process must behave before it is restored
+        """
+        self.cpu_threshold = cpu_threshold
+        self.sustained_seconds = sustained_seconds
+        self.rss_growth_bytes_per_second = rss_growth_mb_per_minute * 1024 * 1024 / 60
+        self.growth_window_seconds = growth_window_seconds
+        self.escalation_interval_seconds = escalation_interval_seconds
+        self.calm_seconds = calm_seconds
+        # PID -> detection state
+        self._states: Dict[int, Dict[str, Any]] = {}
+        # Metrics
+        self.action_counts = {action: 0 for action in ESCALATION}
+        self.events = deque(maxlen=50)
+
+    def observe(self, pid: int, process_info: Dict[str, Any], cpu_percent: float, rss: int,
+                now: datetime) -> Optional[str]:
+        """
+        Apply the runaway rules to one metric sample.
+
+        Renice and affinity actions are applied here; ACTION_TERMINATE is returned
+        for the monitor to carry out.
+
+        Args:
+            pid: Process ID
+            process_info: Monitored process state
+            cpu_percent: Current CPU usage percentage
+            rss: Current resident set size in bytes
+            now: Time of the sample
+
+        Returns:
+            The action taken on this sample, or None
+        """
+        state = self._states.get(pid)
+        if state is None:
+            state = self._states[pid] = {
+                'cpu_high_since': None,
+                'rss_samples': deque(),
+                'level': 0,
+                'last_action': None,
+                'last_action_time': None,
+                'calm_since': None,
+                'original_nice': None,
+                'original_affinity': None,
+            }
+
+        # Sustained CPU rule
+        if cpu_percent >= self.cpu_threshold:
+            if state['cpu_high_since'] is None:
+                state['cpu_high_since'] = now
+            cpu_runaway = (now - state['cpu_high_since']).total_seconds() >= self.sustained_seconds
+        else:
+            state['cpu_high_since'] = None
+            cpu_runaway = False
+
+        # RSS growth-rate rule, over a sliding window
+        rss_samples = state['rss_samples']
+        rss_samples.append((now, rss))
+        while len(rss_samples) > 2 and (now - rss_samples[1][0]).total_seconds() >= self.growth_window_seconds:
+            rss_samples.popleft()
+        window_seconds = (now - rss_samples[0][0]).total_seconds()
+        rss_runaway = (window_seconds >= self.growth_window_seconds and
+                       (rss - rss_samples[0][1]) / window_seconds >= self.rss_growth_bytes_per_second)
+
+        if not (cpu_runaway or rss_runaway):
+            if state['last_action']:
+                if state['calm_since'] is None:
+                    state['calm_since'] = now
+                elif (now - state['calm_since']).total_seconds() >= self.calm_seconds:
+                    self._restore(pid, process_info, state)
+            return None
+        state['calm_since'] = None
+
+        if state['last_action_time'] is not None and \
+                (now - state['last_action_time']).total_seconds() < self.escalation_interval_seconds:
+            return None
+
+        reason = (f"CPU >= {self.cpu_threshold}% for {self.sustained_seconds:.0f}s" if cpu_runaway else
+                  f"RSS growing >= {self.rss_growth_bytes_per_second * 60 / (1024 * 1024):.0f} MB/min")
+        action = self._escalate(pid, process_info, state, reason)
+        state['last_action_time'] = now
+        if action:
+            self.action_counts[action] += 1
+            self.events.append({
+                'time': now.timestamp(),
+                'pid': pid,
+                'name': process_info['name'],
+                'action': action,
+                'reason': reason,
+            })
+            if action == ACTION_TERMINATE:
+                del self._states[pid]
+        return action
+
+    def _escalate(self, pid: int, process_info: Dict[str, Any], state: Dict[str, Any], reason: str) -> Optional[str]:
+        """Apply the next action for a runaway process, skipping actions the platform does not support."""
+        process = process_info['process']
+        while state['level'] < len(ESCALATION):
+            action = ESCALATION[state['level']]
+            state['level'] += 1
+            try:
+                if action == ACTION_RENICE:
+                    state['original_nice'] = process.nice()
+                    process.nice(RENICE_PRIORITY)
+                elif action == ACTION_RESTRICT_AFFINITY:
+                    if not hasattr(process, 'cpu_affinity'):
+                        continue  # Not supported on this platform (e.g. macOS)
+                    affinity = process.cpu_affinity()
+                    if len(affinity) <= 1:
+                        continue
+                    state['original_affinity'] = affinity
+                    process.cpu_affinity(affinity[:1])
+                logger.warning(f"Runaway process {pid} ({process_info['name']}): {reason}, action: {action}")
+                state['last_action'] = action
+                return action
+            except psutil.NoSuchProcess:
+                return None
+            except (psutil.AccessDenied, OSError, ValueError) as e:
+                logger.warning(f"Could not {action} runaway process {pid}: {e}")
+        return None
+
+    def _restore(self, pid: int, process_info: Dict[str, Any], state: Dict[str, Any]):
+        """Undo throttling once a process has behaved for calm_seconds."""
+        process = process_info['process']
+        try:
+            if state['original_affinity'] is not None:
+                process.cpu_affinity(state['original_affinity'])
+            if state['original_nice'] is not None:
+                process.nice(state['original_nice'])
+            logger.info(f"Process {pid} ({process_info['name']}) calmed down, throttling removed")
+        except psutil.NoSuchProcess:
+            pass
+        except (psutil.AccessDenied, OSError, ValueError) as e:
+            logger.warning(f"Could not restore throttled process {pid}: {e}")
+        del self._states[pid]
+
+    def throttle_level(self, pid: int) -> Optional[str]:
+        """
+        Get the most recent action applied to a process.
+
+        Args:
+            pid: Process ID
+
+        Returns:
+            Action name, or None if the process is not throttled
+        """
+        state = self._states.get(pid)
+        return state['last_action'] if state else None
+
+    def forget(self, pid: int):
+        """Drop detection state for a process that is no longer monitored."""
+        self._states.pop(pid, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return a snapshot of the detector's metrics."""
+        return {
+            'throttled_processes': {pid: state['last_action']
+                                    for pid, state in self._states.items() if state['last_action']},
+            'action_counts': dict(self.action_counts),
+            'events': list(self.events),
+        }
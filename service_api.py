@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Service API
+Local HTTP/JSON API over an AutoTerminatorService. Kept apart from the service
+so that clients which do not serve the API never import http.server.
+"""
+
+import inspect
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import log_index
+import metric_history
+import report_writer
+from auto_terminator_service import AutoTerminatorService
+from process_library import DEFAULT_DB_PATH, ProcessRecord, ProcessStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_HOST = '127.0.0.1'
+DEFAULT_API_PORT = 8765
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+# Library exports go here unless the server is given another directory
+DEFAULT_EXPORT_DIR = os.path.join(os.path.dirname(DEFAULT_DB_PATH), 'exports')
+
+
+def record_to_dict(record: ProcessRecord) -> Dict[str, Any]:
+    """JSON-ready view of a library entry."""
+    data = {name: getattr(record, name) for name in ProcessRecord.__slots__}
+    data['status'] = record.status.name.lower()
+    data['status_text'] = record.status_text()
+    return data
+
+
+# Keyword arguments POST /api/session passes on to start_session()
+_SESSION_SETTINGS = frozenset(inspect.signature(AutoTerminatorService.start_session).parameters) - {'self'}
+
+
+class _APIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _APIHandler(BaseHTTPRequestHandler):
+    """Routes /api/... requests to the server's service."""
+
+    server_version = "AutoTerminatorService/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s" % (self.address_string(), format % args))
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+        try:
+            self._check_host()
+            self._check_auth()
+            if not parts or parts[0] != 'api':
+                raise _APIError(404, f"Unknown path: {url.path}")
+            if method != 'GET':
+                self._check_json_request()
+            result = self._route(method, parts[1:], query)
+            if result is not None:
+                self._send_json(200, result)
+        except _APIError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {'error': str(e)})
+        except RuntimeError as e:
+            self._send_json(409, {'error': str(e)})
+        except Exception as e:
+            logger.error(f"API request {method} {url.path} failed: {e}")
+            self._send_json(500, {'error': str(e)})
+
+    def _check_host(self):
+        # A DNS-rebound page reaches the port under its own host name; only the names the server answers to pass
+        if self.headers.get('Host', '').lower() not in self.server.allowed_hosts:
+            raise _APIError(421, "Unexpected Host header")
+
+    def _check_auth(self):
+        token = self.server.token
+        if token and self.headers.get('Authorization') != f"Bearer {token}":
+            raise _APIError(401, "Missing or invalid token")
+
+    def _check_json_request(self):
+        # Browsers cannot send a cross-site application/json request without a preflight
+        if self.headers.get('Content-Type', '').split(';')[0].strip() != 'application/json':
+            raise _APIError(415, "Requests that change state must be application/json")
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise _APIError(400, "Request body must be a JSON object")
+        return body
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, str]):
+        service: AutoTerminatorService = self.server.service
+        route = (method, parts[0] if parts else '')
+
+        if route == ('GET', 'status'):
+            return service.status()
+        if route == ('GET', 'processes'):
+            return service.processes(int(query['session']) if 'session' in query else None)
+        if route == ('POST', 'session'):
+            settings = self._body()
+            unknown = sorted(set(settings) - _SESSION_SETTINGS)
+            if unknown:
+                raise _APIError(400, f"Unknown session settings: {', '.join(unknown)}")
+            return {'pid': service.start_session(**settings)}
+        if route == ('DELETE', 'session'):
+            return {'pid': service.stop_session()}
+        if route == ('GET', 'sessions'):
+            return [session.describe() for session in list(service.sessions.values())]
+        if route == ('DELETE', 'sessions') and len(parts) == 2:
+            pid = int(parts[1])
+            if pid not in service.sessions:
+                raise _APIError(404, f"No session with terminal PID {pid}")
+            return {'pid': service.stop_session(pid)}
+        if route == ('POST', 'monitor') and parts[1:] == ['pids']:
+            outcomes = service.add_pids(int(pid) for pid in self._body().get('pids', []))
+            return {str(pid): outcome for pid, outcome in outcomes.items()}
+        if route == ('POST', 'monitor') and parts[1:] == ['resume']:
+            resumed, not_suspended = service.resume_pids(int(pid) for pid in self._body().get('pids', []))
+            return {'resumed': resumed, 'not_suspended': not_suspended}
+        if route == ('GET', 'history'):
+            history = service.metric_histories.session
+            if 'session' in query:
+                history = service.metric_histories.session_history(int(query['session']))
+                if history is None:
+                    raise _APIError(404, f"No session with terminal PID {query['session']}")
+            times, values = history.series(
+                query.get('field', 'cpu_percent'), int(query.get('points', metric_history.DEFAULT_POINTS)))
+            return {'times': times, 'values': values}
+        if route == ('GET', 'search'):
+            pid = int(query['pid']) if 'pid' in query else None
+            hits = service.search_logs(query.get('q', ''), pid=pid,
+                                       limit=int(query.get('limit', log_index.DEFAULT_SEARCH_LIMIT)))
+            return [{'pid': hit_pid, 'line': line, 'text': text} for hit_pid, line, text in hits]
+        if route == ('GET', 'events'):
+            seq, events = service.events_since(int(query.get('since', 0)))
+            return {'seq': seq, 'events': events}
+        if route == ('POST', 'export'):
+            body = self._body()
+            if 'path' not in body:
+                raise _APIError(400, "Give the output file 'path', relative to the export directory")
+            return service.export_library(self._export_path(body['path']),
+                                          include_history=body.get('include_history', True))
+        if route[1] == 'library':
+            return self._route_library(method, parts[1:], query)
+        raise _APIError(404, f"Unknown endpoint: {method} /api/{'/'.join(parts)}")
+
+    def _export_path(self, path: str) -> str:
+        """Resolve a client's export path inside the export directory; anything escaping it is refused."""
+        export_dir = os.path.realpath(self.server.export_dir)
+        target = os.path.realpath(os.path.join(export_dir, str(path)))
+        if os.path.commonpath([export_dir, target]) != export_dir or target == export_dir:
+            raise _APIError(400, f"Export path must be a file inside {export_dir}")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        return target
+
+    def _route_library(self, method: str, parts: List[str], query: Dict[str, str]):
+        service: AutoTerminatorService = self.server.service
+        if not parts:
+            if method != 'GET':
+                raise _APIError(405, "Method not allowed")
+            days = float(query['days']) if 'days' in query else None
+            records = service.process_library.query(
+                status=ProcessStatus[query['status'].upper()] if 'status' in query else None,
+                parent_pid=int(query['parent_pid']) if 'parent_pid' in query else None,
+                session_pid=int(query['session']) if 'session' in query else None,
+                children_only=query.get('children') in ('1', 'true'),
+                since=datetime.now() - timedelta(days=days) if days else None,
+                limit=int(query.get('limit', 1000)))
+            return [record_to_dict(record) for record in records]
+
+        pid = int(parts[0])
+        action = parts[1] if len(parts) > 1 else ''
+        if pid not in service.process_library:
+            raise _APIError(404, f"No data found for PID {pid}")
+        if method == 'DELETE' and not action:
+            return {'deleted': service.delete_entry(pid)}
+        if method != 'GET':
+            raise _APIError(405, "Method not allowed")
+        if not action:
+            return record_to_dict(service.process_library[pid])
+        if action == 'log':
+            entry_id = service.process_library.entry_id(pid)
+            start = int(query.get('start', 0))
+            lines = service.pid_logs.read_lines(entry_id, start, min(int(query.get('count', 1000)), 10000))
+            return {'start': start, 'lines': lines, 'total': service.pid_logs.line_count(entry_id)}
+        if action == 'history':
+            history = service.metric_histories.get(pid)
+            if history is None:
+                return {'times': [], 'values': []}
+            times, values = history.series(query.get('field', 'cpu_percent'),
+                                           int(query.get('points', metric_history.DEFAULT_POINTS)))
+            return {'times': times, 'values': values}
+        if action == 'report':
+            # Streamed chunk by chunk, like report downloads
+            chunks = service.iter_report(pid)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Content-Disposition', f'attachment; filename="{report_writer.report_file_name(pid)}"')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                if data:
+                    self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return None
+        raise _APIError(404, f"Unknown endpoint: GET /api/library/{pid}/{action}")
+
+    def _send_json(self, status: int, payload: Any):
+        data = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ServiceAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, service: AutoTerminatorService, host: str = DEFAULT_API_HOST,
+                 port: int = DEFAULT_API_PORT, token: Optional[str] = None,
+                 export_dir: str = DEFAULT_EXPORT_DIR):
+        """
+        Local HTTP/JSON API for a service.
+
+        Args:
+            service: Service to expose
+            host: Address to bind; keep it on loopback unless a token is set
+            port: Port to bind (0 picks a free port)
+            token: Bearer token required on every request, if given
+            export_dir: Directory POST /api/export writes into; client paths are relative to it
+        """
+        if ':' in host:
+            # IPv6 literal such as ::1
+            self.address_family = socket.AF_INET6
+        super().__init__((host, port), _APIHandler)
+        self.service = service
+        self.token = token
+        self.export_dir = export_dir
+        # Host headers accepted: the loopback names, plus the bound address when it is not loopback
+        bound_port = self.server_address[1]
+        names = set(LOOPBACK_HOSTS) | ({host} if host not in LOOPBACK_HOSTS else set())
+        self.allowed_hosts = {f"[{name}]:{bound_port}" if ':' in name else f"{name}:{bound_port}"
+                              for name in (name.lower() for name in names)}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        if ':' in host:
+            host = f"[{host}]"
+        return f"http://{host}:{port}/api"
+
+    def start(self):
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
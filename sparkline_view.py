@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Sparkline View
+Small Tk canvas chart for a metric series. The series is already downsampled
+(see metric_history), so each redraw moves a single polyline item to a fixed
+number of points instead of creating canvas items per sample.
+"""
+
+import tkinter as tk
+from typing import Sequence
+
+
+class SparklineView:
+    def __init__(self, parent, width: int = 140, height: int = 30, color: str = 'white',
+                 bg: str = '#4a4a4a', line_width: int = 1):
+        """
+        Create the chart.
+
+        Args:
+            parent: Parent widget
+            width: Canvas width in pixels
+            height: Canvas height in pixels
+            color: Line colour
+            bg: Background colour
+            line_width: Line width in pixels
+        """
+        self.width = width
+        self.height = height
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=bg, highlightthickness=0, bd=0)
+        self._line = self.canvas.create_line(0, 0, 0, 0, fill=color, width=line_width, state=tk.HIDDEN)
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def set_series(self, times: Sequence[float], values: Sequence[float]):
+        """Draw a series scaled to fill the canvas (hidden when there are fewer than two points)."""
+        if len(times) < 2:
+            self.clear()
+            return
+        t0, t1 = times[0], times[-1]
+        low, high = min(values), max(values)
+        x_scale = (self.width - 2) / ((t1 - t0) or 1)
+        y_scale = (self.height - 4) / ((high - low) or 1)
+        coords = []
+        for t, value in zip(times, values):
+            coords.append(1 + (t - t0) * x_scale)
+            coords.append(self.height - 2 - (value - low) * y_scale)
+        self.canvas.coords(self._line, *coords)
+        self.canvas.itemconfigure(self._line, state=tk.NORMAL)
+
+    def clear(self):
+        self.canvas.itemconfigure(self._line, state=tk.HIDDEN)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Virtual List
+Scrollable list that only creates widgets for the rows in the viewport and
+rebinds them to different items while scrolling, so its cost does not grow
+with the number of items. Includes an incremental text filter.
+"""
+
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional
+
+
+class VirtualList:
+    def __init__(self, parent, row_height: int, create_row: Callable[[tk.Widget], Any],
+                 bind_row: Callable[[Any, Any], None], search_text: Callable[[Any], str],
+                 bg: str = '#3c3c3c', empty_text: str = "No items"):
+        """
+        Create the list.
+
+        Args:
+            parent: Parent widget
+            row_height: Height of every row in pixels
+            create_row: Builds one reusable row inside the given frame and returns a row object
+            bind_row: Shows an item in a row object; called with item None to blank the row
+            search_text: Returns the text an item is matched against by the filter
+            bg: Background colour
+            empty_text: Text shown when there are no matching items
+        """
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.search_text = search_text
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.body = tk.Frame(self.frame, bg=bg)
+        self.body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.empty_label = tk.Label(self.body, text=empty_text, bg=bg, fg='white', font=('Segoe UI', 12))
+
+        self._bg = bg
+        self._items: List[Any] = []  # All items
+        self._visible: List[Any] = []  # Items matching the filter
+        self._query = ''
+        self._search_cache: Dict[Any, str] = {}
+        self._first = 0  # Index of the item in the first row
+        self._rows: List[Any] = []  # Pooled row objects
+        self._row_frames: List[tk.Frame] = []
+
+        self.body.bind('<Configure>', self._on_resize)
+        self._bind_wheel(self.frame)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_items(self, items: List[Any]):
+        """
+        Replace the list contents, keeping the current filter.
+
+        Args:
+            items: Items in display order
+        """
+        self._items = list(items)
+        self._search_cache = {}
+        self._visible = self._filter(self._items, self._query)
+        self._render()
+
+    def refresh(self):
+        """Rebind the visible rows, e.g. after item data changed."""
+        self._search_cache = {}
+        self._render()
+
+    def remove_item(self, item: Any):
+        """Remove one item without re-filtering the whole list."""
+        if item in self._items:
+            self._items.remove(item)
+        if item in self._visible:
+            self._visible.remove(item)
+        self._search_cache.pop(item, None)
+        self._render()
+
+    def set_filter(self, query: str):
+        """
+        Filter items by a case-insensitive substring.
+
+        Narrowing an existing query only searches the current matches.
+
+        Args:
+            query: Text to match against each item's search text
+        """
+        query = query.strip().lower()
+        if query == self._query:
+            return
+        source = self._visible if self._query and query.startswith(self._query) else self._items
+        self._query = query
+        self._visible = self._filter(source, query)
+        self._first = 0
+        self._render()
+
+    @property
+    def match_count(self) -> int:
+        """Number of items matching the current filter."""
+        return len(self._visible)
+
+    def _filter(self, items: List[Any], query: str) -> List[Any]:
+        if not query:
+            return list(items)
+        cache = self._search_cache
+        matches = []
+        for item in items:
+            text = cache.get(item)
+            if text is None:
+                text = cache[item] = self.search_text(item).lower()
+            if query in text:
+                matches.append(item)
+        return matches
+
+    def _row_capacity(self) -> int:
+        height = max(self.body.winfo_height(), self.row_height)
+        return height // self.row_height + 1
+
+    def _ensure_rows(self, count: int):
+        """Grow the row pool to the number of rows that fit in the viewport."""
+        while len(self._rows) < count:
+            row_frame = tk.Frame(self.body, bg=self._bg, height=self.row_height)
+            row_frame.pack_propagate(False)
+            self._row_frames.append(row_frame)
+            self._rows.append(self.create_row(row_frame))
+            self._bind_wheel(row_frame)
+
+    def _bind_wheel(self, widget: tk.Widget):
+        """Scroll on mouse wheel over a widget and all its descendants (Tk events do not bubble)."""
+        widget.bind('<MouseWheel>', self._on_mousewheel)
+        widget.bind('<Button-4>', lambda e: self.scroll_rows(-3))
+        widget.bind('<Button-5>', lambda e: self.scroll_rows(3))
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _render(self):
+        capacity = self._row_capacity()
+        self._ensure_rows(capacity)
+        max_first = max(0, len(self._visible) - capacity + 1)
+        self._first = min(max(0, self._first), max_first)
+
+        if self._visible:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, rely=0.3, anchor=tk.N)
+
+        for index, (row, row_frame) in enumerate(zip(self._rows, self._row_frames)):
+            item_index = self._first + index
+            if index < capacity and item_index < len(self._visible):
+                self.bind_row(row, self._visible[item_index])
+                row_frame.place(x=0, y=index * self.row_height, relwidth=1.0, height=self.row_height)
+            else:
+                row_frame.place_forget()
+
+        total = len(self._visible)
+        if total:
+            self.scrollbar.set(self._first / total, min(1.0, (self._first + capacity - 1) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_rows(self, delta: int):
+        """Scroll by a number of rows."""
+        self._first += delta
+        self._render()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        if action == tk.MOVETO:
+            self._first = int(float(amount) * len(self._visible))
+            self._render()
+        elif action == tk.SCROLL:
+            step = int(amount)
+            if unit == tk.PAGES:
+                step *= max(1, self._row_capacity() - 1)
+            self.scroll_rows(step)
+
+    def _on_mousewheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        self._render()